@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+backfill_geocells.py — Populate geohash_5/6/7 for places already in the table.
+
+New rows get their cells from the seeders at mapping time; this fills in rows
+seeded before migration 017, manual/admin rows, and any row whose lat/lng
+was edited since. Only rows whose cells actually change are written.
+
+Usage:
+    python scripts/backfill_geocells.py --dry-run
+    python scripts/backfill_geocells.py
+"""
+
+import argparse
+import logging
+
+from supabase import create_client  # pyre-ignore[21]
+
+from geocell import GEOHASH_PRECISIONS, cell_columns
+from seed_common import PLACE_KEY_COLUMNS, iter_places, load_env, setup_logging, update_places
+
+logger = logging.getLogger("backfill_geocells")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Back-fill geohash cell columns on places.")
+    parser.add_argument("--dry-run", action="store_true", help="Count changes; do not write.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+
+    cell_cols = [f"geohash_{p}" for p in GEOHASH_PRECISIONS]
+    columns = ", ".join(PLACE_KEY_COLUMNS + tuple(cell_cols))
+
+    scanned = 0
+    changed: list[dict] = []
+    for row in iter_places(sb, columns):
+        scanned += 1
+        if row.get("lat") is None or row.get("lng") is None:
+            continue
+        cells = cell_columns(float(row["lat"]), float(row["lng"]))
+        if all(row.get(c) == v for c, v in cells.items()):
+            continue
+        changed.append({**{k: row[k] for k in PLACE_KEY_COLUMNS}, **cells})
+
+    logger.info(f"Scanned {scanned} places; {len(changed)} need cell IDs.")
+    if args.dry_run or not changed:
+        return
+
+    written = update_places(sb, changed)
+    logger.info(f"Updated {written} places.")
+
+
+if __name__ == "__main__":
+    main()
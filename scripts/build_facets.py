@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+build_facets.py — Precompute filter-bar facet counts per category and anchor.
+
+The category pages' FilterSortBar shows counts per sub_type, cuisine, veg /
+non-veg, price band, rating and amenity. Instead of grouping over `places`
+per request, this job aggregates them once into `place_facets` (migration
+029), one row per (category, anchor):
+
+    {"sub_type": {"cafe": 41, …}, "type": {…}, "cuisine": {"south_indian": 12, …},
+     "veg": {"veg": 30, "nonveg": 55, "unknown": 8},
+     "price_band": {"0-300": 20, …},        # the frontend's filter values
+     "amenities": {"wifi": 14, …},
+     "rating_histogram": {"4.5": 9, "4.0": 31, …, "unrated": 4},
+     "price_histogram": {"200": 17, …}}     # bin lower bound → count
+
+Anchor 'all' is the whole category; each --anchor name=lat,lng,radius adds
+one circle (default: campus, 1000 m). Every anchor is filled in the same
+pass over a category's live rows.
+
+Incremental: a light (category, updated_at) scan fingerprints every category
+(as export_snapshots.py does); only categories whose fingerprint or anchor
+set differs from the stored one are re-aggregated. Use --full to rebuild all.
+
+Usage:
+    python scripts/build_facets.py --dry-run --verbose
+    python scripts/build_facets.py
+    python scripts/build_facets.py --anchor campus=12.9345,77.6069,1000 --anchor koramangala=12.9352,77.6245,1500
+"""
+
+import argparse
+import logging
+import math
+from collections import Counter
+from datetime import datetime, timezone
+
+from supabase import create_client  # pyre-ignore[21]
+
+from export_snapshots import fingerprints
+from geocell import distance_m
+from seed_common import CAMPUS_LAT, CAMPUS_LNG, iter_places, iter_rows, load_env, parse_anchor, setup_logging, upsert_rows
+
+logger = logging.getLogger("build_facets")
+
+ALL_ANCHOR = "all"
+DEFAULT_ANCHORS = [("campus", CAMPUS_LAT, CAMPUS_LNG, 1000)]
+
+FACET_COLUMNS = (
+    "id, category, type, sub_type, lat, lng, is_on_campus, rating, price_inr, price_range_min, "
+    "is_veg, cuisine_tags, amenities, has_wifi, archived_at"
+)
+
+# (column, band edges, band labels) per category — the labels are the price
+# filter values of src/pages/*Details.tsx, and each edge is (value, whether a
+# price equal to it falls in the band below) to match those filters
+PRICE_BANDS = {
+    "food": ("price_range_min", ((300, False), (600, False), (1200, False)),
+             ("0-300", "300-600", "600-1200", "1200+")),
+    "accommodation": ("price_inr", ((8000, False), (12000, True), (20000, True)),
+                      ("under-8k", "8k-12k", "12k-20k", "20k+")),
+}
+PRICE_BIN = {"accommodation": 2000}        # price_histogram bin width, ₹
+DEFAULT_PRICE_BIN = 100
+RATING_BIN = 0.5
+
+
+class Facets:
+    """Counters for one (category, anchor)."""
+
+    __slots__ = ("count", "counters")
+
+    NAMES = ("sub_type", "type", "cuisine", "veg", "price_band", "amenities",
+             "rating_histogram", "price_histogram")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.counters = {name: Counter() for name in self.NAMES}
+
+    def add(self, row: dict, category: str) -> None:
+        c = self.counters
+        self.count += 1
+        for column in ("sub_type", "type"):
+            if row.get(column):
+                c[column][row[column]] += 1
+        for tag in row.get("cuisine_tags") or ():
+            c["cuisine"][tag] += 1
+        c["veg"]["unknown" if row.get("is_veg") is None else "veg" if row["is_veg"] else "nonveg"] += 1
+
+        amenities = {a.strip().lower() for a in row.get("amenities") or () if a}
+        if row.get("has_wifi"):
+            amenities.add("wifi")
+        for a in amenities:
+            c["amenities"][a] += 1
+
+        rating = row.get("rating")
+        c["rating_histogram"][
+            f"{math.floor(float(rating) / RATING_BIN) * RATING_BIN:.1f}" if rating is not None else "unrated"
+        ] += 1
+
+        band = PRICE_BANDS.get(category)
+        if band:
+            column, edges, labels = band
+            price = row.get(column)
+            if price is not None:
+                c["price_band"][labels[sum(price > e if below else price >= e for e, below in edges)]] += 1
+        price = row.get("price_inr")
+        if price is not None:
+            width = PRICE_BIN.get(category, DEFAULT_PRICE_BIN)
+            c["price_histogram"][str(int(price) // width * width)] += 1
+
+    def to_json(self) -> dict:
+        """Counters as plain dicts, most common first (histograms by bin)."""
+        out = {}
+        for name, counter in self.counters.items():
+            if name.endswith("_histogram"):
+                out[name] = dict(sorted(counter.items(), key=_bin_order))
+            else:
+                out[name] = dict(sorted(counter.items(), key=lambda kv: (-kv[1], kv[0])))
+        return out
+
+
+def _bin_order(item: tuple[str, int]) -> tuple[bool, float]:
+    """Highest bin first, 'unrated' last."""
+    return (item[0] == "unrated", 0.0 if item[0] == "unrated" else -float(item[0]))
+
+
+def aggregate(sb, category: str, anchors: list[tuple[str, float, float, int]]) -> dict[str, Facets]:
+    """One pass over a category's live rows, filling every anchor."""
+    facets = {ALL_ANCHOR: Facets(), **{name: Facets() for name, *_ in anchors}}
+    for row in iter_places(sb, FACET_COLUMNS, category=category):
+        if row.get("archived_at"):
+            continue
+        facets[ALL_ANCHOR].add(row, category)
+        if row.get("is_on_campus"):
+            lat, lng = CAMPUS_LAT, CAMPUS_LNG      # their pins may be unset (0,0)
+        elif row.get("lat") is not None and row.get("lng") is not None:
+            lat, lng = float(row["lat"]), float(row["lng"])
+        else:
+            continue
+        for name, alat, alng, radius in anchors:
+            if distance_m(alat, alng, lat, lng) <= radius:
+                facets[name].add(row, category)
+    return facets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute facet counts per category and anchor.")
+    parser.add_argument("--anchor", action="append", default=[],
+                        help="name=lat,lng,radius_m (repeatable). Default: campus=…,1000.")
+    parser.add_argument("--full", action="store_true", help="Recompute every category.")
+    parser.add_argument("--dry-run", action="store_true", help="Compute but do not write.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    try:
+        anchors = [parse_anchor(a) for a in args.anchor] or DEFAULT_ANCHORS
+    except ValueError:
+        parser.error("--anchor must be name=lat,lng,radius_m")
+    if any(name == ALL_ANCHOR for name, *_ in anchors):
+        parser.error(f"anchor name '{ALL_ANCHOR}' is reserved for the whole category")
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+
+    anchor_spec = [list(a) for a in anchors]
+    current = {c: {**fp, "anchors": anchor_spec} for c, fp in fingerprints(sb).items()}
+    stored: dict[str, dict] = {}
+    for row in iter_rows(sb, "place_facets", "category, anchor, fingerprint", order=("category", "anchor")):
+        if row["anchor"] == ALL_ANCHOR:
+            stored[row["category"]] = row.get("fingerprint") or {}
+
+    changed = [c for c in sorted(current) if args.full or stored.get(c) != current[c]]
+    logger.info(f"{len(current)} categories; {len(changed)} changed since the last build.")
+
+    now = datetime.now(timezone.utc).isoformat()
+    rows: list[dict] = []
+    for category in changed:
+        facets = aggregate(sb, category, anchors)
+        for name, f in facets.items():
+            center = next(((lat, lng, r) for n, lat, lng, r in anchors if n == name), (None, None, None))
+            rows.append({
+                "category": category, "anchor": name,
+                "center_lat": center[0], "center_lng": center[1], "radius_m": center[2],
+                "place_count": f.count, "facets": f.to_json(),
+                "fingerprint": current[category] if name == ALL_ANCHOR else None,
+                "computed_at": now,
+            })
+        logger.info(f"{category}: {facets[ALL_ANCHOR].count} places; "
+                    + ", ".join(f"{n}={f.count}" for n, f in facets.items() if n != ALL_ANCHOR))
+
+    gone = sorted(set(stored) - set(current))
+    if args.dry_run:
+        for row in rows[:3]:
+            logger.debug(f"  {row['category']}/{row['anchor']}: {row['facets']}")
+        logger.info(f"DRY RUN — {len(rows)} facet rows computed, {len(gone)} categories to drop; nothing written.")
+        return
+
+    written = upsert_rows(sb, "place_facets", rows, on_conflict="category,anchor")
+    # Anchors no longer configured, and categories with no rows left
+    names = [ALL_ANCHOR] + [name for name, *_ in anchors]
+    for category in changed:
+        sb.table("place_facets").delete().eq("category", category).not_.in_("anchor", names).execute()
+    for category in gone:
+        sb.table("place_facets").delete().eq("category", category).execute()
+    logger.info(f"Wrote {written} facet rows; dropped {len(gone)} empty categories.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+build_map_clusters.py — Precomputed map marker clusters per zoom level.
+
+ExploreMap / FoodMap / AccommodationMap draw one marker per place from a
+full list fetch. This job clusters every live place once, per layer ('all'
+plus one per category) and per zoom level, and writes small per-tile files
+so a map loads only the tiles its viewport covers:
+
+    public/data/clusters/
+      manifest.json                  # zooms, cell/tile size, columns, layers
+      food/15/5852/3769.json         # layer / zoom / tile x / tile y
+      all/12/731/471.json
+
+A tile is TILE_PX (1024) Web Mercator pixels square at its zoom — four
+standard 256 px map tiles each way — so tile x = floor(world_px_x / 1024).
+Each file is columnar:
+
+    {"z": 15, "x": 5852, "y": 3769, "columns": COLUMNS, "rows": [[...], ...]}
+
+Clustering is a grid of CELL_PX (64 px) cells. Cells at zoom z are exactly
+four cells of zoom z+1, so the hierarchy is built bottom-up from the
+deepest zoom by merging children. A cluster row carries its member count,
+mean position, dominant category and `expand`: the zoom at which it first
+splits (NULL if its places stay together down to the deepest zoom). A
+single place carries its id, name and rating instead.
+
+Tiles are rewritten only when their content changes; tiles that no longer
+exist are removed, as are layers the previous manifest listed that have no
+places left (nothing else under --out-dir is touched).
+
+Usage:
+    python scripts/build_map_clusters.py --verbose
+    python scripts/build_map_clusters.py --min-zoom 12 --max-zoom 17
+"""
+
+import argparse
+import json
+import logging
+import math
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from supabase import create_client  # pyre-ignore[21]
+
+from seed_common import CAMPUS_LAT, CAMPUS_LNG, iter_places, load_env, setup_logging
+
+logger = logging.getLogger("build_map_clusters")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUT_DIR = PROJECT_ROOT / "public" / "data" / "clusters"
+
+MIN_ZOOM = 10
+MAX_ZOOM = 18
+TILE_SIZE = 256          # Web Mercator pixels per standard map tile at zoom 0
+CELL_PX = 64             # cluster grid cell; a power of two so cells nest
+TILE_PX = 1024           # one output file; a multiple of CELL_PX
+ALL_LAYER = "all"
+
+COLUMNS = ["lat", "lng", "count", "category", "expand", "id", "name", "rating"]
+SOURCE_COLUMNS = "id, name, category, lat, lng, is_on_campus, rating, archived_at"
+
+
+def world_px(lat: float, lng: float, zoom: int) -> tuple[float, float]:
+    """Web Mercator pixel coordinates at `zoom`."""
+    scale = TILE_SIZE * (1 << zoom)
+    siny = min(max(math.sin(math.radians(lat)), -0.9999), 0.9999)
+    x = (lng + 180.0) / 360.0 * scale
+    y = (0.5 - math.log((1 + siny) / (1 - siny)) / (4 * math.pi)) * scale
+    return x, y
+
+
+class Cluster:
+    __slots__ = ("count", "sum_lat", "sum_lng", "categories", "place", "expand", "children")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum_lat = 0.0
+        self.sum_lng = 0.0
+        self.categories: Counter = Counter()
+        self.place: dict | None = None      # the only member, while count == 1
+        self.expand: int | None = None
+        self.children = 0
+
+    def add_place(self, place: dict) -> None:
+        self.count += 1
+        self.sum_lat += place["lat"]
+        self.sum_lng += place["lng"]
+        self.categories[place["category"]] += 1
+        self.place = place if self.count == 1 else None
+
+    def merge(self, child: "Cluster", child_zoom: int) -> None:
+        self.children += 1
+        self.count += child.count
+        self.sum_lat += child.sum_lat
+        self.sum_lng += child.sum_lng
+        self.categories.update(child.categories)
+        # Two non-empty children: this cluster splits at the child zoom
+        self.expand = child_zoom if self.children > 1 else child.expand
+        self.place = child.place if self.count == child.count else None
+
+    def row(self) -> list:
+        lat, lng = self.sum_lat / self.count, self.sum_lng / self.count
+        if self.place is not None:
+            p = self.place
+            return [round(p["lat"], 6), round(p["lng"], 6), 1, p["category"], None,
+                    p["id"], p["name"], p.get("rating")]
+        category = min(self.categories.items(), key=lambda kv: (-kv[1], kv[0]))[0]
+        return [round(lat, 6), round(lng, 6), self.count, category, self.expand, None, None, None]
+
+
+def cluster_levels(places: list[dict], min_zoom: int, max_zoom: int) -> dict[int, list[Cluster]]:
+    """Clusters per zoom, deepest level from the places, the rest by merging."""
+    cells: dict[tuple[int, int], Cluster] = defaultdict(Cluster)
+    for p in places:
+        x, y = world_px(p["lat"], p["lng"], max_zoom)
+        cells[(int(x // CELL_PX), int(y // CELL_PX))].add_place(p)
+    levels = {max_zoom: list(cells.values())}
+
+    for zoom in range(max_zoom - 1, min_zoom - 1, -1):
+        parents: dict[tuple[int, int], Cluster] = defaultdict(Cluster)
+        for (cx, cy), child in cells.items():
+            parents[(cx >> 1, cy >> 1)].merge(child, zoom + 1)
+        cells = parents
+        levels[zoom] = list(cells.values())
+    return levels
+
+
+def tiles_for_level(clusters: list[Cluster], zoom: int) -> dict[tuple[int, int], list[list]]:
+    """Cluster rows grouped by the tile their (mean) position falls in."""
+    tiles: dict[tuple[int, int], list[list]] = defaultdict(list)
+    for c in clusters:
+        row = c.row()
+        x, y = world_px(row[0], row[1], zoom)
+        tiles[(int(x // TILE_PX), int(y // TILE_PX))].append(row)
+    for rows in tiles.values():
+        rows.sort(key=lambda r: (-r[2], r[0], r[1]))   # biggest clusters first
+    return tiles
+
+
+def load_places(sb) -> list[dict]:
+    """Live places with a usable pin; on-campus rows without one sit on campus."""
+    places = []
+    for r in iter_places(sb, SOURCE_COLUMNS):
+        if r.get("archived_at"):
+            continue
+        lat, lng = r.get("lat"), r.get("lng")
+        if lat is None or lng is None or (float(lat) == 0 and float(lng) == 0):
+            if not r.get("is_on_campus"):
+                continue
+            lat, lng = CAMPUS_LAT, CAMPUS_LNG
+        places.append({
+            "id": r["id"], "name": r["name"], "category": r["category"],
+            "lat": float(lat), "lng": float(lng), "rating": r.get("rating"),
+        })
+    return places
+
+
+def write_layer(out_dir: Path, layer: str, places: list[dict], min_zoom: int, max_zoom: int) -> dict:
+    """Write one layer's tiles; returns counts of tiles total / written / removed."""
+    stats = {"places": len(places), "tiles": 0, "written": 0, "removed": 0}
+    keep: set[Path] = set()
+    for zoom, clusters in cluster_levels(places, min_zoom, max_zoom).items():
+        for (x, y), rows in tiles_for_level(clusters, zoom).items():
+            path = out_dir / layer / str(zoom) / str(x) / f"{y}.json"
+            body = json.dumps(
+                {"z": zoom, "x": x, "y": y, "columns": COLUMNS, "rows": rows},
+                ensure_ascii=False, separators=(",", ":"),
+            ).encode()
+            keep.add(path)
+            stats["tiles"] += 1
+            if path.exists() and path.read_bytes() == body:
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+            stats["written"] += 1
+
+    layer_dir = out_dir / layer
+    for path in layer_dir.rglob("*.json") if layer_dir.exists() else ():
+        if path not in keep:
+            path.unlink()
+            stats["removed"] += 1
+    for d in sorted((p for p in layer_dir.rglob("*") if p.is_dir()), reverse=True) if layer_dir.exists() else ():
+        if not any(d.iterdir()):
+            d.rmdir()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build per-zoom, per-tile map marker clusters.")
+    parser.add_argument("--out-dir", type=Path, default=DEFAULT_OUT_DIR,
+                        help=f"Output directory. Default: {DEFAULT_OUT_DIR.relative_to(PROJECT_ROOT)}")
+    parser.add_argument("--min-zoom", type=int, default=MIN_ZOOM, help=f"Default: {MIN_ZOOM}.")
+    parser.add_argument("--max-zoom", type=int, default=MAX_ZOOM, help=f"Default: {MAX_ZOOM}.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    if not 0 <= args.min_zoom <= args.max_zoom <= 22:
+        parser.error("need 0 <= --min-zoom <= --max-zoom <= 22")
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+
+    places = load_places(sb)
+    by_category: dict[str, list[dict]] = defaultdict(list)
+    for p in places:
+        by_category[p["category"]].append(p)
+    logger.info(f"Loaded {len(places)} places across {len(by_category)} categories.")
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = args.out_dir / "manifest.json"
+    previous = json.loads(manifest_path.read_text()).get("layers", {}) if manifest_path.exists() else {}
+    layers = {ALL_LAYER: places, **dict(sorted(by_category.items()))}
+    manifest_layers = {}
+    for layer, members in layers.items():
+        stats = write_layer(args.out_dir, layer, members, args.min_zoom, args.max_zoom)
+        manifest_layers[layer] = {"places": stats["places"], "tiles": stats["tiles"]}
+        logger.info(f"{layer}: {stats['places']} places, {stats['tiles']} tiles "
+                    f"({stats['written']} written, {stats['removed']} removed)")
+
+    # Categories with no places left: only layers this job wrote before
+    for name in sorted(set(previous) - set(layers)):
+        layer_dir = args.out_dir / name
+        if layer_dir.is_dir():
+            for path in sorted(layer_dir.rglob("*"), reverse=True):
+                path.unlink() if path.is_file() else path.rmdir()
+            layer_dir.rmdir()
+        logger.info(f"{name}: no places left — layer removed.")
+
+    manifest = {
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "min_zoom": args.min_zoom, "max_zoom": args.max_zoom,
+        "cell_px": CELL_PX, "tile_px": TILE_PX, "columns": COLUMNS,
+        "path": "{layer}/{z}/{x}/{y}.json",
+        "layers": manifest_layers,
+    }
+    manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False))
+    logger.info(f"Manifest at {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+build_nearby.py — Precompute "what's nearby" relations for every place.
+
+For each place and every other category, stores the k nearest places of that
+category (ids + straight-line distances) in `place_nearby` (migration 018),
+so "nearest ATM / pharmacy / laundry to this PG" is a primary-key lookup.
+
+Runs after seeding. By default only relations that can have changed since the
+last build are recomputed: those of places updated since then, and those of
+unchanged places whose current top-k could be displaced by (or contains) a
+changed, archived or deleted place. Use --full to rebuild everything.
+
+Usage:
+    python scripts/build_nearby.py --dry-run --verbose
+    python scripts/build_nearby.py --k 5
+    python scripts/build_nearby.py --full
+"""
+
+import argparse
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from supabase import create_client  # pyre-ignore[21]
+
+from geocell import GridIndex
+from seed_common import iter_places, iter_rows, load_env, setup_logging, upsert_rows
+
+logger = logging.getLogger("build_nearby")
+
+DEFAULT_K = 5
+DEFAULT_MAX_DISTANCE_M = 5000
+
+
+def parse_ts(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def build_indexes(places: dict[str, dict], ids: set[str] | None = None) -> dict[str, GridIndex]:
+    """One GridIndex per category, optionally restricted to `ids`."""
+    indexes: dict[str, GridIndex] = defaultdict(GridIndex)
+    for pid, p in places.items():
+        if ids is None or pid in ids:
+            indexes[p["category"]].add(pid, p["lat"], p["lng"])
+    return indexes
+
+
+def needs_rebuild(
+    pid: str,
+    place: dict,
+    category: str,
+    existing: dict[tuple[str, str], dict],
+    changed: set[str],
+    changed_index: dict[str, GridIndex],
+    places: dict[str, dict],
+    k: int,
+    max_m: float,
+) -> bool:
+    if pid in changed:
+        return True
+    current = existing.get((pid, category))
+    if current is None:
+        return True
+    related = current["related_ids"]
+    if any(rid not in places or rid in changed for rid in related):
+        return True
+    if category not in changed_index:
+        return False
+    # A changed place closer than our current k-th neighbour would displace it.
+    radius = current["distances_m"][-1] if len(related) >= k else max_m
+    hits = changed_index[category].nearest(place["lat"], place["lng"], 1, max_m=radius)
+    return bool(hits)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute k-nearest places per category.")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help=f"Neighbours per category. Default: {DEFAULT_K}.")
+    parser.add_argument(
+        "--max-distance", type=int, default=DEFAULT_MAX_DISTANCE_M,
+        help=f"Ignore neighbours further than this many metres. Default: {DEFAULT_MAX_DISTANCE_M}.",
+    )
+    parser.add_argument("--full", action="store_true", help="Recompute every relation.")
+    parser.add_argument("--dry-run", action="store_true", help="Compute but do not write.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+
+    places: dict[str, dict] = {}
+    for row in iter_places(sb, "id, category, lat, lng, updated_at, archived_at"):
+        # Archived places are neither neighbours nor listed: treat them as deleted
+        if row.get("archived_at") or row.get("lat") is None or row.get("lng") is None:
+            continue
+        places[row["id"]] = {
+            "category": row["category"],
+            "lat": float(row["lat"]),
+            "lng": float(row["lng"]),
+            "updated_at": parse_ts(row.get("updated_at")),
+        }
+    categories = sorted({p["category"] for p in places.values()})
+    logger.info(f"Loaded {len(places)} places across {len(categories)} categories.")
+
+    existing: dict[tuple[str, str], dict] = {}
+    watermark: datetime | None = None
+    if not args.full:
+        for row in iter_rows(
+            sb, "place_nearby", "place_id, category, related_ids, distances_m, computed_at",
+            order=("place_id", "category"),
+        ):
+            existing[(row["place_id"], row["category"])] = row
+            ts = parse_ts(row["computed_at"])
+            if ts and (watermark is None or ts > watermark):
+                watermark = ts
+
+    if watermark is None:
+        changed = set(places)
+    else:
+        changed = {
+            pid for pid, p in places.items()
+            if p["updated_at"] is None or p["updated_at"] > watermark
+        }
+    logger.info(
+        f"Watermark: {watermark.isoformat() if watermark else 'none (full build)'}; "
+        f"{len(changed)} places changed since."
+    )
+
+    index = build_indexes(places)
+    changed_index = build_indexes(places, changed)
+
+    now = datetime.now(timezone.utc).isoformat()
+    rows: list[dict] = []
+    for pid, place in places.items():
+        for category in categories:
+            if category == place["category"]:
+                continue
+            if not needs_rebuild(
+                pid, place, category, existing, changed, changed_index,
+                places, args.k, args.max_distance,
+            ):
+                continue
+            hits = index[category].nearest(
+                place["lat"], place["lng"], args.k, exclude=pid, max_m=args.max_distance,
+            )
+            rows.append({
+                "place_id": pid,
+                "category": category,
+                "related_ids": [rid for _, rid in hits],
+                "distances_m": [round(d) for d, _ in hits],
+                "computed_at": now,
+            })
+
+    logger.info(f"Recomputed {len(rows)} (place, category) relations.")
+    if args.dry_run:
+        for row in rows[:5]:
+            logger.debug(f"  {row['place_id']} → {row['category']}: {row['distances_m']}")
+        logger.info("DRY RUN — nothing written.")
+        return
+
+    written = upsert_rows(sb, "place_nearby", rows, on_conflict="place_id,category")
+    logger.info(f"Wrote {written} rows to place_nearby.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+build_search_index.py — Prebuilt typeahead index for UniEasy places.
+
+Reads every place once and emits a compact, versioned inverted index that
+the server or frontend can load at startup and answer typeahead from memory
+instead of running an ilike query per keystroke.
+
+Artifact layout (JSON, also written gzipped):
+    {
+      "version":  "<content hash>",
+      "built_at": "<ISO timestamp>",
+      "fields":   ["id", "name", "category", "sub_type", "rating", "distance_m"],
+      "docs":     [[...], ...],          # ranked best-first
+      "prefix":   {"caf": [0, 4, 9], ...},
+      "trigram":  {"caf": [0, 4, 9], ...}
+    }
+
+Docs are sorted by static score (rating confidence and distance from
+campus), so a doc's index *is* its rank: every posting list is an ascending
+int list, intersections stay ranked, and the first N hits are the top N.
+`prefix` covers name/tag token prefixes (exact typeahead); `trigram` is the
+fallback for typos and infix matches.
+
+Only rewrites the artifact when its content hash changes. `lookup()` is the
+reference query implementation.
+
+Usage:
+    python scripts/build_search_index.py
+    python scripts/build_search_index.py --out-dir public/data/search --verbose
+    python scripts/build_search_index.py --query "thir wave"
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from supabase import create_client  # pyre-ignore[21]
+
+from geocell import distance_m
+from seed_common import CAMPUS_LAT, CAMPUS_LNG, iter_places, load_env, setup_logging
+
+logger = logging.getLogger("build_search_index")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUT_DIR = PROJECT_ROOT / "public" / "data" / "search"
+
+FIELDS = ["id", "name", "category", "sub_type", "rating", "distance_m"]
+SOURCE_COLUMNS = (
+    "id, name, category, sub_type, type, rating, rating_count, lat, lng, "
+    "cuisine_tags, amenities, tags, archived_at"
+)
+
+MIN_PREFIX = 1
+MAX_PREFIX = 12
+SHORT_PREFIX = 2          # prefixes this short are very common...
+SHORT_PREFIX_POSTINGS = 50  # ...so keep only their top-ranked docs
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+# ─── Text normalisation ───────────────────────────────────────────────────────
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents, collapse everything non-alphanumeric to spaces."""
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return _NON_WORD.sub(" ", folded.lower()).strip()
+
+
+def tokens(text: str | None) -> list[str]:
+    return normalize(text).split() if text else []
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# ─── Ranking ──────────────────────────────────────────────────────────────────
+
+def static_score(rating: float | None, rating_count: int | None, dist_m: float) -> float:
+    """Rating weighted by review volume, decayed by distance from campus."""
+    confidence = math.log10(2 + (rating_count or 0))
+    return (rating or 0.0) * confidence / (1 + dist_m / 2000)
+
+
+# ─── Build ────────────────────────────────────────────────────────────────────
+
+def build_index(rows: list[dict]) -> dict:
+    docs: list[tuple[float, list, set[str]]] = []
+    for row in rows:
+        if row.get("lat") is None or row.get("lng") is None or row.get("archived_at"):
+            continue
+        dist = distance_m(CAMPUS_LAT, CAMPUS_LNG, float(row["lat"]), float(row["lng"]))
+        terms = set(tokens(row.get("name")))
+        for field in ("category", "sub_type", "type"):
+            terms.update(tokens((row.get(field) or "").replace("_", " ")))
+        for field in ("cuisine_tags", "amenities", "tags"):
+            for tag in row.get(field) or []:
+                terms.update(tokens(tag.replace("_", " ")))
+        doc = [
+            row["id"], row["name"], row["category"], row.get("sub_type"),
+            float(row["rating"]) if row.get("rating") is not None else None,
+            round(dist),
+        ]
+        docs.append((static_score(row.get("rating"), row.get("rating_count"), dist), doc, terms))
+
+    docs.sort(key=lambda d: (-d[0], d[1][1]))
+
+    prefix: dict[str, list[int]] = defaultdict(list)
+    trigram: dict[str, list[int]] = defaultdict(list)
+    for rank, (_, _, terms) in enumerate(docs):
+        seen_prefixes: set[str] = set()
+        seen_grams: set[str] = set()
+        for term in terms:
+            for n in range(MIN_PREFIX, min(len(term), MAX_PREFIX) + 1):
+                seen_prefixes.add(term[:n])
+            seen_grams |= trigrams(term)
+        for p in seen_prefixes:
+            postings = prefix[p]
+            if len(p) > SHORT_PREFIX or len(postings) < SHORT_PREFIX_POSTINGS:
+                postings.append(rank)
+        for g in seen_grams:
+            trigram[g].append(rank)
+
+    return {
+        "fields": FIELDS,
+        "docs": [d[1] for d in docs],
+        "prefix": dict(sorted(prefix.items())),
+        "trigram": dict(sorted(trigram.items())),
+    }
+
+
+# ─── Query (reference implementation) ────────────────────────────────────────
+
+def _intersect(lists: list[list[int]]) -> list[int]:
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for other in lists[1:]:
+        members = set(other)
+        result = [d for d in result if d in members]
+    return result
+
+
+def lookup(index: dict, query: str, limit: int = 10) -> list[dict]:
+    """
+    Every query token must prefix-match a doc term; if that finds nothing,
+    fall back to docs sharing the most trigrams with the query. Best-ranked
+    first.
+    """
+    q_tokens = [t[:MAX_PREFIX] for t in tokens(query)]
+    if not q_tokens:
+        return []
+
+    hits: list[int] = []
+    postings = [index["prefix"].get(t) for t in q_tokens]
+    if all(postings):
+        hits = _intersect(postings)[:limit]
+
+    if not hits:
+        overlap: dict[int, int] = defaultdict(int)
+        grams = set().union(*(trigrams(t) for t in q_tokens))
+        for g in grams:
+            for d in index["trigram"].get(g, []):
+                overlap[d] += 1
+        threshold = max(2, (len(grams) + 2) // 3)
+        hits = sorted((d for d, n in overlap.items() if n >= threshold),
+                      key=lambda d: (-overlap[d], d))[:limit]
+
+    fields = index["fields"]
+    return [dict(zip(fields, index["docs"][d])) for d in hits]
+
+
+# ─── Artifact I/O ─────────────────────────────────────────────────────────────
+
+def write_artifact(index: dict, out_dir: Path) -> tuple[str, bool]:
+    """Write the versioned artifact + latest pointer. Returns (version, written)."""
+    body = json.dumps(index, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    version = hashlib.sha256(body.encode()).hexdigest()[:16]
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pointer_path = out_dir / "latest.json"
+    if pointer_path.exists():
+        current = json.loads(pointer_path.read_text())
+        if current.get("version") == version:
+            return version, False
+
+    built_at = datetime.now(timezone.utc).isoformat()
+    artifact = json.dumps(
+        {"version": version, "built_at": built_at, **index},
+        ensure_ascii=False, separators=(",", ":"),
+    ).encode()
+    name = f"search-index.{version}.json"
+    (out_dir / name).write_bytes(artifact)
+    (out_dir / f"{name}.gz").write_bytes(gzip.compress(artifact, compresslevel=9))
+    pointer_path.write_text(json.dumps(
+        {"version": version, "built_at": built_at, "file": name, "docs": len(index["docs"])},
+        indent=2,
+    ))
+    return version, True
+
+
+def load_artifact(out_dir: Path) -> dict:
+    pointer = json.loads((out_dir / "latest.json").read_text())
+    return json.loads((out_dir / pointer["file"]).read_text())
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the typeahead search index artifact.")
+    parser.add_argument("--out-dir", type=Path, default=DEFAULT_OUT_DIR,
+                        help=f"Artifact directory. Default: {DEFAULT_OUT_DIR.relative_to(PROJECT_ROOT)}")
+    parser.add_argument("--query", type=str, default=None,
+                        help="Query the latest artifact instead of building one.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+
+    if args.query is not None:
+        for hit in lookup(load_artifact(args.out_dir), args.query):
+            print(json.dumps(hit, ensure_ascii=False))
+        return
+
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+
+    rows = list(iter_places(sb, SOURCE_COLUMNS))
+    index = build_index(rows)
+    logger.info(
+        f"Indexed {len(index['docs'])} places: {len(index['prefix'])} prefixes, "
+        f"{len(index['trigram'])} trigrams."
+    )
+
+    version, written = write_artifact(index, args.out_dir)
+    if written:
+        logger.info(f"Wrote search index {version} to {args.out_dir}")
+    else:
+        logger.info(f"Search index unchanged ({version}); nothing written.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+bulk_load.py — COPY-based load path into the `places` table.
+
+PostgREST upserts of 50 JSON rows per request are the bottleneck on large
+sweeps. This path talks to Postgres directly:
+
+    1. COPY every mapped row into `places_staging` as one JSONB document,
+       tagged with a per-run load id (one round trip per batch, not per row);
+    2. call merge_places_staging(load_id), a single INSERT … ON CONFLICT
+       (google_place_id) that applies the per-column merge policy from
+       migration 021 (admin-owned fields survive on overridden rows).
+
+The seeders use it via --bulk-load. It can also load NDJSON files of
+already-mapped rows (one JSON object per line), which is the easiest way to
+exercise it against a local Postgres:
+
+    createdb unieasy && for f in supabase/migrations/*.sql; do psql unieasy -f $f; done
+    DATABASE_URL=postgresql:///unieasy python scripts/bulk_load.py rows.ndjson
+
+Requires DATABASE_URL (a direct connection string, not the REST URL) and
+psycopg 3.
+
+Usage:
+    python scripts/bulk_load.py rows.ndjson [more.ndjson ...]
+    python scripts/seed_offcampus_v2.py --bulk-load
+"""
+
+import argparse
+import json
+import logging
+import uuid
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from seed_common import load_env, setup_logging
+
+logger = logging.getLogger("bulk_load")
+
+COPY_SQL = "COPY places_staging (load_id, doc) FROM STDIN"
+
+
+class StagingLoader:
+    """
+    One bulk load: stage() any number of row batches, then merge() once.
+
+        with StagingLoader(database_url, logger) as loader:
+            loader.stage(rows)
+            inserted, updated, protected = loader.merge()
+
+    Staged rows of a load that is never merged are removed on exit.
+    """
+
+    def __init__(self, database_url: str, log: logging.Logger = logger) -> None:
+        self.database_url = database_url
+        self.log = log
+        self.load_id = uuid.uuid4()
+        self.staged = 0
+        self.conn = None
+
+    def __enter__(self) -> "StagingLoader":
+        try:
+            import psycopg  # pyre-ignore[21]
+        except ImportError:
+            raise SystemExit("--bulk-load needs psycopg 3: pip install -r scripts/requirements.txt")
+        self.conn = psycopg.connect(self.database_url)
+        self.log.debug(f"Bulk load {self.load_id} started.")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.staged:
+            # Never merged (error or early exit): drop this load's rows.
+            self.conn.rollback()
+            self.conn.execute("DELETE FROM places_staging WHERE load_id = %s", (self.load_id,))
+            self.conn.commit()
+            self.log.warning(f"Bulk load {self.load_id}: discarded {self.staged} unmerged rows.")
+        self.conn.close()
+
+    def stage(self, rows: Iterable[dict]) -> int:
+        """COPY rows into places_staging. Returns the number staged."""
+        n = 0
+        with self.conn.cursor() as cur, cur.copy(COPY_SQL) as copy:
+            for row in rows:
+                copy.write_row((self.load_id, json.dumps(row, ensure_ascii=False, default=str)))
+                n += 1
+        self.conn.commit()
+        self.staged += n
+        self.log.debug(f"Bulk load {self.load_id}: staged {n} rows ({self.staged} total).")
+        return n
+
+    def merge(self) -> tuple[int, int, int]:
+        """Merge the staged rows into places. Returns (inserted, updated, protected)."""
+        if not self.staged:
+            return 0, 0, 0
+        row = self.conn.execute(
+            "SELECT inserted, updated, protected FROM merge_places_staging(%s)", (self.load_id,)
+        ).fetchone()
+        self.conn.commit()
+        self.staged = 0
+        return int(row[0]), int(row[1]), int(row[2])
+
+
+def read_ndjson(paths: list[Path]) -> Iterator[dict]:
+    for path in paths:
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load mapped place rows (NDJSON) via COPY + merge.")
+    parser.add_argument("files", type=Path, nargs="+", help="NDJSON files, one mapped row per line.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    (database_url,) = load_env(logger, "DATABASE_URL")
+
+    with StagingLoader(database_url) as loader:
+        staged = loader.stage(read_ndjson(args.files))
+        inserted, updated, protected = loader.merge()
+    logger.info(
+        f"Staged {staged} rows → inserted {inserted}, updated {updated} "
+        f"({protected} kept admin-owned fields)."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+change_feed.py — Which places a run changed, as NDJSON, for cache invalidation.
+
+A trigger logs every insert / update / delete of `places` to place_changes
+(migration 031), with the columns each update changed. For a seed run (its
+started_at → finished_at window) or any time window, this writes one line
+per changed place:
+
+    {"place_id": "…", "op": "updated", "categories": ["food"],
+     "changed_columns": ["rating", "rating_count"], "changed_at": "…"}
+
+op is inserted / updated / archived / restored / deleted. finish_run()
+(seed_runs.py) writes data/changes/run-<id>.ndjson for every finished run.
+--publish also inserts a place_change_notifications row (counts, place ids,
+categories) that servers and CDN purgers can poll to invalidate
+/places, /places/:id and the category bundles of export_snapshots.py.
+
+Usage:
+    python scripts/change_feed.py --run-id 42
+    python scripts/change_feed.py --run-id 42 --publish
+    python scripts/change_feed.py --since 2026-10-01T00:00:00Z --out data/changes/october.ndjson
+    python scripts/change_feed.py --prune-days 30
+"""
+
+import argparse
+import json
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+from supabase import create_client  # pyre-ignore[21]
+
+from seed_common import PAGE_SIZE, load_env, setup_logging
+
+logger = logging.getLogger("change_feed")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUT_DIR = PROJECT_ROOT / "data" / "changes"
+
+
+def iter_changes(sb, window_from: str, window_to: str) -> Iterator[dict]:
+    """place_change_summary() rows for the window, one page per request."""
+    offset = 0
+    while True:
+        page = (
+            sb.rpc("place_change_summary", {"p_from": window_from, "p_to": window_to})
+            .order("place_id")
+            .range(offset, offset + PAGE_SIZE - 1)
+            .execute()
+        )
+        rows = page.data or []
+        yield from rows
+        if len(rows) < PAGE_SIZE:
+            return
+        offset += PAGE_SIZE
+
+
+def run_window(sb, run_id: int) -> tuple[str, str]:
+    """(started_at, finished_at) of a run; an unfinished run ends now."""
+    result = sb.table("seed_runs").select("started_at, finished_at").eq("id", run_id).execute()
+    if not result.data:
+        raise ValueError(f"seed run {run_id} not found")
+    run = result.data[0]
+    return run["started_at"], run["finished_at"] or datetime.now(timezone.utc).isoformat()
+
+
+def write_feed(sb, window_from: str, window_to: str, path: Path) -> Counter:
+    """Write the window's changes as NDJSON. Returns places per op."""
+    counts: Counter = Counter()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for row in iter_changes(sb, window_from, window_to):
+            counts[row["op"]] += 1
+            f.write(json.dumps({
+                "place_id": row["place_id"], "op": row["op"], "categories": row["categories"] or [],
+                "changed_columns": row["changed_columns"], "changed_at": row["last_changed_at"],
+            }, ensure_ascii=False) + "\n")
+    tmp.replace(path)
+    return counts
+
+
+def publish(sb, path: Path, run_id: int | None, window_from: str, window_to: str, counts: Counter) -> None:
+    """Insert a place_change_notifications row for the feed at `path`."""
+    ids: list[str] = []
+    categories: set[str] = set()
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            ids.append(row["place_id"])
+            categories.update(row["categories"])
+    sb.table("place_change_notifications").insert({
+        "run_id": run_id, "window_from": window_from, "window_to": window_to,
+        "counts": dict(counts), "place_ids": ids, "categories": sorted(categories),
+    }).execute()
+
+
+def emit_run_changes(sb, run_id: int, log: logging.Logger, publish_changes: bool = False,
+                     out_dir: Path = DEFAULT_OUT_DIR) -> Path:
+    """Write (and optionally publish) the change feed of one seed run."""
+    window_from, window_to = run_window(sb, run_id)
+    path = out_dir / f"run-{run_id}.ndjson"
+    counts = write_feed(sb, window_from, window_to, path)
+    summary = ", ".join(f"{op}={n}" for op, n in sorted(counts.items())) or "no changes"
+    log.info(f"Seed run {run_id}: {summary} → {path}")
+    if publish_changes:
+        publish(sb, path, run_id, window_from, window_to, counts)
+        log.info(f"Seed run {run_id}: change notification published")
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write the places change feed as NDJSON.")
+    parser.add_argument("--run-id", type=int, default=None, help="Changes made during this seed run.")
+    parser.add_argument("--since", type=str, default=None, help="Changes at or after this ISO timestamp.")
+    parser.add_argument("--until", type=str, default=None, help="…and before this one. Default: now.")
+    parser.add_argument("--out", type=Path, default=None,
+                        help="Output file. Default: data/changes/run-<id>.ndjson or changes-<until>.ndjson.")
+    parser.add_argument("--publish", action="store_true", help="Also insert a place_change_notifications row.")
+    parser.add_argument("--prune-days", type=int, default=None,
+                        help="Delete change-log rows older than this many days (and exit).")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    if args.prune_days is None and (args.run_id is None) == (args.since is None):
+        parser.error("give exactly one of --run-id or --since (or --prune-days)")
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+
+    if args.prune_days is not None:
+        pruned = sb.rpc("prune_place_changes", {"p_keep_days": args.prune_days}).execute().data
+        logger.info(f"Pruned {pruned} change-log rows older than {args.prune_days} days.")
+        return
+
+    if args.run_id is not None:
+        try:
+            window_from, window_to = run_window(sb, args.run_id)
+        except ValueError as e:
+            parser.error(str(e))
+        path = args.out or DEFAULT_OUT_DIR / f"run-{args.run_id}.ndjson"
+    else:
+        window_from = args.since
+        window_to = args.until or datetime.now(timezone.utc).isoformat()
+        path = args.out or DEFAULT_OUT_DIR / f"changes-{window_to[:19].replace(':', '')}.ndjson"
+
+    counts = write_feed(sb, window_from, window_to, path)
+    logger.info(", ".join(f"{op}={n}" for op, n in sorted(counts.items())) or "No changes.")
+    logger.info(f"Feed at {path}")
+    if args.publish:
+        publish(sb, path, args.run_id, window_from, window_to, counts)
+        logger.info("Change notification published.")
+
+
+if __name__ == "__main__":
+    main()
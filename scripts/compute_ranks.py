@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+compute_ranks.py — Recompute places.rank_score and category_rank.
+
+Calls compute_ranks() (migration 028), which ranks every live place in one
+set-based pass, per category:
+
+    C           mean rating of the category's rated places
+    m           --prior-count, or the category's median rating_count
+    rank_score  (rating_count · rating + m · C) / (rating_count + m)
+              − --distance-weight · ln(1 + km from campus)
+    category_rank  position within the category by rank_score
+
+so a 5.0 with 3 reviews sits near the category mean while a 4.6 with
+4,000 keeps its 4.6. Only changed rows are written; archived places get
+NULL. Writing the ranks does not bump updated_at.
+
+GET /api/places sorts on rank_score (indexed) by default.
+
+Usage:
+    python scripts/compute_ranks.py --dry-run
+    python scripts/compute_ranks.py
+    python scripts/compute_ranks.py --prior-count 50 --distance-weight 0.1
+"""
+
+import argparse
+import logging
+
+from supabase import create_client  # pyre-ignore[21]
+
+from seed_common import load_env, setup_logging
+
+logger = logging.getLogger("compute_ranks")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute rank_score and category_rank.")
+    parser.add_argument("--prior-count", type=float, default=None,
+                        help="Reviews of prior weight (m). Default: each category's median rating_count.")
+    parser.add_argument("--distance-weight", type=float, default=0.0,
+                        help="Score penalty per ln(1 + km from campus). Default: 0 (off).")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change; write nothing.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    if args.prior_count is not None and args.prior_count <= 0:
+        parser.error("--prior-count must be positive")
+    if args.distance_weight < 0:
+        parser.error("--distance-weight must not be negative")
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+
+    result = sb.rpc("compute_ranks", {
+        "p_prior_count": args.prior_count,
+        "p_distance_weight": args.distance_weight,
+        "p_dry_run": args.dry_run,
+    }).execute()
+
+    rows = result.data or []
+    verb = "would change" if args.dry_run else "changed"
+    if not rows:
+        logger.info(f"Ranks: nothing {verb}.")
+    for row in rows:
+        logger.info(f"Ranks: {row['outcome']:<8} {row['place_count']} places {verb}")
+
+
+if __name__ == "__main__":
+    main()
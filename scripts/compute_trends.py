@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+compute_trends.py — Recompute places.trend_score from the rating history.
+
+Every write that moves a place's rating or rating_count — seeders and the
+ID refreshers alike — appends a (place, run, rating, rating_count) sample
+to place_rating_samples (migrations 025, 034). This job calls compute_trends(),
+which scores every place in one set-based pass over that history:
+
+    v_recent    reviews/day over the last --window-days
+    v_baseline  reviews/day over the --baseline-days before that
+    trend_score = (v_recent − v_baseline) / √(v_baseline + 1)
+                + 2 · rating change over the window
+
+and writes only the scores that changed. Places with no sample older than
+the window, and archived places, get NULL. Writing trend_score does not
+bump updated_at, so incremental jobs are unaffected.
+
+"Trending" lists are then an indexed sort: GET /api/places?sort=trending.
+
+Usage:
+    python scripts/compute_trends.py --dry-run
+    python scripts/compute_trends.py
+    python scripts/compute_trends.py --window-days 7 --baseline-days 21
+"""
+
+import argparse
+import logging
+
+from supabase import create_client  # pyre-ignore[21]
+
+from seed_common import load_env, setup_logging
+
+logger = logging.getLogger("compute_trends")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute trend_score from the rating history.")
+    parser.add_argument("--window-days", type=int, default=14,
+                        help="Recent window for review velocity. Default: 14.")
+    parser.add_argument("--baseline-days", type=int, default=28,
+                        help="Baseline window before it. Default: 28.")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change; write nothing.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    if args.window_days < 1 or args.baseline_days < 1:
+        parser.error("--window-days and --baseline-days must be at least 1")
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+
+    result = sb.rpc("compute_trends", {
+        "p_window_days": args.window_days,
+        "p_baseline_days": args.baseline_days,
+        "p_dry_run": args.dry_run,
+    }).execute()
+
+    rows = result.data or []
+    verb = "would change" if args.dry_run else "changed"
+    if not rows:
+        logger.info(f"Trends: nothing {verb}.")
+    for row in rows:
+        logger.info(f"Trends: {row['outcome']:<8} {row['place_count']} places {verb}")
+
+
+if __name__ == "__main__":
+    main()
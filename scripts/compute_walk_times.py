@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+compute_walk_times.py — places.walk_minutes over the local pedestrian network.
+
+distance_from_campus is a straight line, which badly misjudges places across
+Hosur Road or behind a wall. This job builds a walking graph from a local
+OSM extract (osm_extract.iter_ways: walkable highways within --radius of
+campus), runs ONE multi-source Dijkstra from the campus gates, then looks
+up every place:
+
+    walk_minutes = ⌈(snap + network distance to the nearest gate) / speed⌉
+
+where `snap` is the straight line from the place to its nearest reached
+graph node. Places further than --max-snap from any reached node (or with
+no usable pin) get NULL; on-campus places get 0. Only changed values are
+written (migration 030). GET /api/places?sort=walk lists nearest-on-foot first.
+
+Gates are --gate name=lat,lng (repeatable), each snapped to its nearest
+graph node; the defaults are CAMPUS_GATES.
+
+Usage:
+    python scripts/compute_walk_times.py data/osm/bengaluru.osm.pbf --dry-run --verbose
+    python scripts/compute_walk_times.py data/osm/campus.osm --gate main=12.9352,77.6054 --gate back=12.9331,77.6083
+"""
+
+import argparse
+import heapq
+import logging
+import math
+from collections import defaultdict
+from pathlib import Path
+
+from supabase import create_client  # pyre-ignore[21]
+
+from geocell import GridIndex, distance_m
+from osm_extract import iter_ways
+from seed_common import CAMPUS_LAT, CAMPUS_LNG, PLACE_KEY_COLUMNS, iter_places, load_env, setup_logging, update_places
+
+logger = logging.getLogger("compute_walk_times")
+
+# (name, lat, lng) of the campus entrances. The campus anchor stands in
+# until the real gates are listed here (or passed with --gate).
+CAMPUS_GATES = [
+    ("campus", CAMPUS_LAT, CAMPUS_LNG),
+]
+DEFAULT_RADIUS = 4000
+DEFAULT_MAX_SNAP_M = 250
+DEFAULT_SPEED_M_PER_MIN = 75               # ~4.5 km/h, city walking with crossings
+
+# Every other `highway` is walkable unless tagged foot=no / access=no
+# (arterials here rarely carry a foot ban).
+NOT_WALKABLE = {"motorway", "motorway_link", "construction", "proposed", "raceway", "bus_guideway"}
+SLOW_WAYS = {"steps": 1.5}                 # distance multiplier
+
+
+def walkable(tags: dict) -> bool:
+    highway = tags.get("highway")
+    if not highway or highway in NOT_WALKABLE or tags.get("area") == "yes":
+        return False
+    if tags.get("foot") in ("no", "private") or tags.get("access") in ("no", "private"):
+        return tags.get("foot") in ("yes", "designated", "permissive")
+    return True
+
+
+def build_graph(path: Path, within) -> tuple[dict[str, tuple[float, float]], dict[str, list[tuple[str, float]]]]:
+    """(node coordinates, adjacency with edge lengths in metres)."""
+    coords: dict[str, tuple[float, float]] = {}
+    edges: dict[str, list[tuple[str, float]]] = defaultdict(list)
+    ways = 0
+    for way in iter_ways(path, within, walkable):
+        ways += 1
+        factor = SLOW_WAYS.get(way["tags"].get("highway"), 1.0)
+        nodes = way["nodes"]
+        for key, lat, lng in nodes:
+            coords[key] = (lat, lng)
+        for (a, alat, alng), (b, blat, blng) in zip(nodes, nodes[1:]):
+            d = distance_m(alat, alng, blat, blng) * factor
+            edges[a].append((b, d))
+            edges[b].append((a, d))   # pedestrians ignore oneway
+    logger.info(f"Graph: {len(coords)} nodes, {sum(map(len, edges.values())) // 2} edges from {ways} ways.")
+    return coords, edges
+
+
+def nearest_node(index: GridIndex, lat: float, lng: float, max_m: float) -> tuple[float, str] | None:
+    hits = index.nearest(lat, lng, 1, max_m=max_m)
+    return hits[0] if hits else None
+
+
+def multi_source_dijkstra(edges: dict[str, list[tuple[str, float]]], sources: dict[str, float]) -> dict[str, float]:
+    """Network distance from the nearest source to every reachable node."""
+    dist = dict(sources)
+    heap = [(d, n) for n, d in sources.items()]
+    heapq.heapify(heap)
+    while heap:
+        d, node = heapq.heappop(heap)
+        if d > dist[node]:
+            continue
+        for nxt, w in edges.get(node, ()):
+            nd = d + w
+            if nd < dist.get(nxt, math.inf):
+                dist[nxt] = nd
+                heapq.heappush(heap, (nd, nxt))
+    return dist
+
+
+def parse_gate(spec: str) -> tuple[str, float, float]:
+    """'name=lat,lng' → (name, lat, lng)."""
+    name, _, coords = spec.partition("=")
+    lat, lng = coords.split(",")
+    return name, float(lat), float(lng)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compute walk_minutes from the campus gates over OSM footpaths.")
+    parser.add_argument("extract", type=Path, help="OSM extract (.osm, .pbf, .geojson, .geojsonseq; .gz ok).")
+    parser.add_argument("--gate", action="append", default=[], help="name=lat,lng (repeatable). Default: CAMPUS_GATES.")
+    parser.add_argument("--radius", type=int, default=DEFAULT_RADIUS,
+                        help=f"Graph radius around campus, metres. Default: {DEFAULT_RADIUS}.")
+    parser.add_argument("--max-snap", type=float, default=DEFAULT_MAX_SNAP_M,
+                        help=f"Max straight-line metres from a place to the graph. Default: {DEFAULT_MAX_SNAP_M}.")
+    parser.add_argument("--speed", type=float, default=DEFAULT_SPEED_M_PER_MIN,
+                        help=f"Walking speed, metres per minute. Default: {DEFAULT_SPEED_M_PER_MIN}.")
+    parser.add_argument("--dry-run", action="store_true", help="Compute but do not write.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    if not args.extract.exists():
+        parser.error(f"{args.extract} not found")
+    try:
+        gates = [parse_gate(g) for g in args.gate] or CAMPUS_GATES
+    except ValueError:
+        parser.error("--gate must be name=lat,lng")
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+
+    # A margin beyond the radius so routes may bend outside it
+    reach = args.radius + 1000
+    coords, edges = build_graph(args.extract, lambda lat, lng: distance_m(CAMPUS_LAT, CAMPUS_LNG, lat, lng) <= reach)
+    index = GridIndex()
+    for key, (lat, lng) in coords.items():
+        index.add(key, lat, lng)
+
+    sources: dict[str, float] = {}
+    for name, lat, lng in gates:
+        hit = nearest_node(index, lat, lng, args.max_snap)
+        if hit is None:
+            raise SystemExit(f"Gate {name} is more than {args.max_snap:.0f} m from any walkable way in the extract.")
+        d, node = hit
+        sources[node] = min(d, sources.get(node, math.inf))
+        logger.debug(f"Gate {name} → node {node} ({d:.0f} m)")
+    dist = multi_source_dijkstra(edges, sources)
+    logger.info(f"Reached {len(dist)} of {len(coords)} nodes from {len(gates)} gates.")
+
+    reached = GridIndex()
+    for key in dist:
+        reached.add(key, *coords[key])
+
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+
+    rows: list[dict] = []
+    counts = defaultdict(int)
+    for place in iter_places(sb, ", ".join(PLACE_KEY_COLUMNS) + ", is_on_campus, walk_minutes"):
+        lat, lng = place.get("lat"), place.get("lng")
+        if place.get("is_on_campus"):
+            minutes = 0
+        elif lat is None or lng is None or (float(lat) == 0 and float(lng) == 0):
+            minutes = None
+        else:
+            hit = nearest_node(reached, float(lat), float(lng), args.max_snap)
+            minutes = math.ceil((hit[0] + dist[hit[1]]) / args.speed) if hit else None
+        counts["unreachable" if minutes is None else "timed"] += 1
+        if minutes != place.get("walk_minutes"):
+            rows.append({**{c: place[c] for c in PLACE_KEY_COLUMNS}, "walk_minutes": minutes})
+
+    logger.info(f"{counts['timed']} places timed, {counts['unreachable']} unreachable; {len(rows)} changed.")
+    if args.dry_run:
+        for row in rows[:10]:
+            logger.debug(f"  {row['name']}: {row['walk_minutes']} min")
+        logger.info("DRY RUN — nothing written.")
+        return
+
+    written = update_places(sb, rows)
+    logger.info(f"Wrote walk_minutes for {written} places.")
+
+
+if __name__ == "__main__":
+    main()
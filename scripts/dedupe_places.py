@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+dedupe_places.py — Find (and optionally merge) duplicate place listings.
+
+Rows reach `places` from three seeders, admin and merchant entries. The
+UNIQUE google_place_id index only catches exact repeats: a manual entry
+without a google_place_id, or a place whose id Google changed, becomes a
+second listing. This job resolves them in near-linear time:
+
+  1. Block    every live place goes in its geohash cell; a place is only
+              compared with places in its own and the 8 neighbouring cells
+              (the cell is the finest one at least --max-distance across),
+              and only if the two names share one of their two rarest
+              words (or a contact), so block sizes stay small.
+  2. Score    names are normalised (case, accents, punctuation, stopwords)
+              and compared as IDF-weighted token sets: the mean of Jaccard
+              and containment, so "Third Wave Coffee" ≈ "Third Wave Coffee
+              Roasters" while generic words ("cafe", "pg", the locality)
+              count for little. Same category and within --max-distance
+              are required; a shared phone number or website host matches
+              on its own.
+  3. Cluster  matching pairs are joined with union-find. Each cluster keeps
+              one row — manual override first, then curated sources, a
+              google_place_id, most reviews, oldest — and drops the rest.
+
+Clusters are written as NDJSON (one per line) to --out. With --apply they
+are merged in bulk by merge_duplicate_places() (migration 026): reviews,
+reactions, polls and views move to the kept row, it takes a dropped row's
+google_place_id if it has none, and dropped rows are archived with
+archive_reason 'duplicate' and duplicate_of set. Clusters holding more than
+one manual override are only reported (needs_review).
+
+Usage:
+    python scripts/dedupe_places.py                      # report → data/dedupe/clusters.ndjson
+    python scripts/dedupe_places.py --max-distance 150 --threshold 0.8 --verbose
+    python scripts/dedupe_places.py --apply
+"""
+
+import argparse
+import json
+import logging
+import math
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlparse
+
+from supabase import create_client  # pyre-ignore[21]
+
+from build_search_index import normalize
+from geocell import GEOHASH_PRECISIONS, bounds, distance_m, encode, neighbours
+from seed_common import iter_places, load_env, setup_logging
+
+logger = logging.getLogger("dedupe_places")
+
+DEFAULT_OUT = Path(__file__).resolve().parent.parent / "data" / "dedupe" / "clusters.ndjson"
+DEFAULT_MAX_DISTANCE_M = 100
+DEFAULT_THRESHOLD = 0.75
+APPLY_CHUNK = 500
+BLOCK_TOKENS = 2
+
+SOURCE_COLUMNS = (
+    "id, name, category, lat, lng, google_place_id, data_source, is_manual_override, "
+    "phone, website, rating_count, created_at, archived_at"
+)
+
+# Website hosts shared by unrelated places (profiles, aggregators)
+SHARED_HOSTS = {
+    "instagram.com", "facebook.com", "linktr.ee", "wa.me", "google.com", "sites.google.com",
+    "g.page", "zomato.com", "swiggy.com", "justdial.com", "magicpin.in",
+}
+
+STOPWORDS = {"the", "and", "of", "a", "an", "at", "by", "in", "near", "pvt", "ltd", "private", "limited"}
+
+# Which row of a cluster survives: lower rank wins
+SOURCE_RANK = {"manual": 0, "admin": 0, "merchant": 1, "google_places_seed_v2": 2}
+DEFAULT_SOURCE_RANK = 3
+
+
+# ─── Normalisation ───────────────────────────────────────────────────────────
+
+def name_words(name: str | None) -> list[str]:
+    """Normalised name words ("Domino's Pizza & Co." → [dominos, pizza, co])."""
+    text = (name or "").replace("'", "").replace("’", "")
+    return [t for t in normalize(text).split() if t not in STOPWORDS]
+
+
+def phone_key(phone: str | None) -> str | None:
+    digits = "".join(c for c in phone or "" if c.isdigit())
+    return digits[-10:] if len(digits) >= 8 else None
+
+
+def website_key(website: str | None) -> str | None:
+    if not website:
+        return None
+    host = urlparse(website if "//" in website else f"//{website}").netloc.lower().removeprefix("www.")
+    return host if host and host not in SHARED_HOSTS else None
+
+
+# ─── Scoring ─────────────────────────────────────────────────────────────────
+
+def idf_weights(token_sets: list[frozenset[str]]) -> dict[str, float]:
+    df: dict[str, int] = defaultdict(int)
+    for tokens in token_sets:
+        for t in tokens:
+            df[t] += 1
+    n = len(token_sets)
+    return {t: math.log((n + 1) / (c + 1)) + 0.1 for t, c in df.items()}
+
+
+def name_score(a: frozenset[str], b: frozenset[str], idf: dict[str, float]) -> float:
+    """Mean of IDF-weighted Jaccard and containment, in [0, 1]."""
+    if not a or not b:
+        return 0.0
+    shared = sum(idf[t] for t in a & b)
+    if not shared:
+        return 0.0
+    wa = sum(idf[t] for t in a)
+    wb = sum(idf[t] for t in b)
+    return (shared / (wa + wb - shared) + shared / min(wa, wb)) / 2
+
+
+def block_precision(max_m: float, lat: float) -> int:
+    """Finest geohash precision whose cells are at least max_m across at lat."""
+    for p in sorted(GEOHASH_PRECISIONS, reverse=True):
+        lat_lo, lng_lo, lat_hi, lng_hi = bounds(encode(lat, 0.0, p))
+        height = (lat_hi - lat_lo) * 111_320
+        width = (lng_hi - lng_lo) * 111_320 * math.cos(math.radians(lat))
+        if min(height, width) >= max_m:
+            return p
+    return min(GEOHASH_PRECISIONS)
+
+
+# ─── Matching ────────────────────────────────────────────────────────────────
+
+class UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def load_places(sb) -> list[dict]:
+    """Live places with a real location."""
+    places = []
+    for row in iter_places(sb, SOURCE_COLUMNS):
+        if row.get("archived_at") or row.get("lat") is None or row.get("lng") is None:
+            continue
+        lat, lng = float(row["lat"]), float(row["lng"])
+        if lat == 0 and lng == 0:   # campus entries created without a pin
+            continue
+        places.append({**row, "lat": lat, "lng": lng})
+    return places
+
+
+def match_pairs(
+    places: list[dict], max_m: float, threshold: float
+) -> list[tuple[int, int, float, float]]:
+    """(i, j, score, distance_m) for every matching pair, i < j."""
+    if not places:
+        return []
+    words = [name_words(p["name"]) for p in places]
+    tokens = [frozenset(w) for w in words]
+    # Spacing variants ("Thirdwave" / "Third Wave") block and match on the joined name
+    compact = ["".join(w) for w in words]
+    phones = [phone_key(p.get("phone")) for p in places]
+    sites = [website_key(p.get("website")) for p in places]
+    idf = idf_weights(tokens)
+    # Blocking keys: the rarest BLOCK_TOKENS words. Generic words ("pg", "cafe")
+    # would put whole neighbourhoods in one block, and cannot carry a match alone.
+    keys = [
+        [*sorted(t, key=lambda w: (-idf[w], w))[:BLOCK_TOKENS], *(["=" + c] if c else [])]
+        for t, c in zip(tokens, compact)
+    ]
+
+    precision = block_precision(max_m, sum(p["lat"] for p in places) / len(places))
+    cells: dict[str, list[int]] = defaultdict(list)
+    for i, p in enumerate(places):
+        cells[encode(p["lat"], p["lng"], precision)].append(i)
+
+    pairs = []
+    compared = 0
+    for cell, members in cells.items():
+        # Key → indexes over the 3×3 neighbourhood: only pairs sharing a key are scored
+        by_token: dict[str, list[int]] = defaultdict(list)
+        by_contact: dict[str, list[int]] = defaultdict(list)
+        for n in neighbours(cell):
+            for j in cells.get(n, ()):
+                for key in keys[j]:
+                    by_token[key].append(j)
+                for key in (phones[j], sites[j]):
+                    if key:
+                        by_contact[key].append(j)
+
+        for i in members:
+            a = places[i]
+            candidates = {j for key in keys[i] for j in by_token[key] if j > i}
+            contact = {j for key in (phones[i], sites[i]) if key for j in by_contact[key] if j > i}
+            for j in candidates | contact:
+                b = places[j]
+                compared += 1
+                d = distance_m(a["lat"], a["lng"], b["lat"], b["lng"])
+                if d > max_m:
+                    continue
+                if j in contact or compact[i] == compact[j]:
+                    score = 1.0
+                elif a["category"] != b["category"]:
+                    continue
+                else:
+                    score = name_score(tokens[i], tokens[j], idf)
+                if score >= threshold:
+                    pairs.append((i, j, round(score, 3), round(d)))
+
+    logger.info(
+        f"Blocked {len(places)} places into {len(cells)} geohash-{precision} cells; "
+        f"scored {compared} candidate pairs, {len(pairs)} matched."
+    )
+    return pairs
+
+
+def survivor_key(p: dict) -> tuple:
+    return (
+        not p.get("is_manual_override"),
+        SOURCE_RANK.get(p.get("data_source") or "", DEFAULT_SOURCE_RANK),
+        not p.get("google_place_id"),
+        -(p.get("rating_count") or 0),
+        p.get("created_at") or "",
+    )
+
+
+def find_clusters(places: list[dict], max_m: float, threshold: float) -> list[dict]:
+    """Duplicate clusters: {"keep", "drop", "needs_review", "members"}."""
+    pairs = match_pairs(places, max_m, threshold)
+    uf = UnionFind(len(places))
+    matched: set[int] = set()
+    for i, j, _, _ in pairs:
+        uf.union(i, j)
+        matched.update((i, j))
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for k in matched:
+        groups[uf.find(k)].append(k)
+
+    clusters = []
+    for members in groups.values():
+        rows = sorted((places[k] for k in members), key=survivor_key)
+        keep = rows[0]
+        clusters.append({
+            "keep": keep["id"],
+            "drop": [r["id"] for r in rows[1:]],
+            "needs_review": sum(bool(r.get("is_manual_override")) for r in rows) > 1,
+            "members": [
+                {
+                    "id": r["id"],
+                    "name": r["name"],
+                    "category": r["category"],
+                    "data_source": r.get("data_source"),
+                    "google_place_id": r.get("google_place_id"),
+                    "distance_m": round(distance_m(keep["lat"], keep["lng"], r["lat"], r["lng"])),
+                }
+                for r in rows
+            ],
+        })
+    clusters.sort(key=lambda c: -len(c["members"]))
+    return clusters
+
+
+# ─── Apply ───────────────────────────────────────────────────────────────────
+
+def apply_clusters(sb, clusters: list[dict]) -> dict[str, int]:
+    """Merge every cluster not flagged needs_review, APPLY_CHUNK pairs per call."""
+    pairs = [
+        {"keep_id": c["keep"], "drop_id": d}
+        for c in clusters if not c["needs_review"]
+        for d in c["drop"]
+    ]
+    totals: dict[str, int] = defaultdict(int)
+    for i in range(0, len(pairs), APPLY_CHUNK):
+        result = sb.rpc("merge_duplicate_places", {"p_pairs": pairs[i:i + APPLY_CHUNK]}).execute()
+        for row in result.data or []:
+            totals[row["outcome"]] += row["n"]
+    return dict(totals)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Find and merge duplicate place listings.")
+    parser.add_argument("--max-distance", type=float, default=DEFAULT_MAX_DISTANCE_M,
+                        help=f"Duplicates must be within this many metres. Default: {DEFAULT_MAX_DISTANCE_M}.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Minimum name score (0–1). Default: {DEFAULT_THRESHOLD}.")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT,
+                        help="Cluster report (NDJSON). Default: data/dedupe/clusters.ndjson.")
+    parser.add_argument("--apply", action="store_true", help="Merge the clusters (needs migration 026).")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+
+    places = load_places(sb)
+    clusters = find_clusters(places, args.max_distance, args.threshold)
+    review = sum(c["needs_review"] for c in clusters)
+    logger.info(
+        f"{len(clusters)} duplicate clusters, {sum(len(c['drop']) for c in clusters)} rows to drop "
+        f"({review} clusters need review)."
+    )
+    for c in clusters[:10]:
+        logger.debug("  " + " | ".join(f"{m['name']} [{m['data_source']}, {m['distance_m']} m]" for m in c["members"]))
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        for c in clusters:
+            f.write(json.dumps(c, ensure_ascii=False) + "\n")
+    logger.info(f"Clusters written to {args.out}")
+
+    if not args.apply:
+        return
+    totals = apply_clusters(sb, clusters)
+    for outcome, n in sorted(totals.items()):
+        logger.info(f"Merge: {outcome:<16} {n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+export_snapshots.py — Static per-category place bundles for CDN delivery.
+
+Place data only changes when a seeder (or an admin) writes, so list pages can
+be served from static files instead of a `select("*", count: "exact")` per
+request. This exporter writes one minimal-column bundle per category:
+
+    public/data/snapshots/
+      manifest.json                    # category → file, hash, count, …
+      food.3f9c1e2ab4d0.json           # content-addressed, cache forever
+      food.3f9c1e2ab4d0.json.gz
+      food.3f9c1e2ab4d0.json.br        # only if the `brotli` package is installed
+
+Bundles are columnar: {"category", "columns": [...], "rows": [[...], ...]}.
+Only `manifest.json` needs a short cache TTL.
+
+A cheap scan of (category, updated_at) gives each category a fingerprint
+(row count + newest updated_at); only categories whose fingerprint differs
+from the manifest are re-exported, and their superseded files removed.
+updated_at ignores derived and run bookkeeping columns (migration 032), so
+a seeder run that changes nothing leaves the fingerprints alone.
+
+Usage:
+    python scripts/export_snapshots.py
+    python scripts/export_snapshots.py --categories food,study --force
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from supabase import create_client  # pyre-ignore[21]
+
+from seed_common import iter_places, load_env, setup_logging
+
+try:
+    import brotli  # pyre-ignore[21]
+except ImportError:  # optional: gzip alone is enough for every CDN
+    brotli = None
+
+logger = logging.getLogger("export_snapshots")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUT_DIR = PROJECT_ROOT / "public" / "data" / "snapshots"
+
+# Columns the category list pages actually read (src/hooks/use*.ts).
+LIST_COLUMNS = [
+    "id", "name", "category", "type", "sub_type", "address", "lat", "lng",
+    "is_on_campus", "rating", "rating_count", "price_level", "price_inr",
+    "display_price_label", "is_veg", "cuisine_tags", "amenities",
+    "distance_from_campus", "timing", "description", "primary_photo_url",
+    "photo_refs", "has_wifi", "noise_level", "crowd_level", "extra",
+]
+# Keys of `extra` the frontend uses; everything else stays in the DB.
+EXTRA_KEYS = ("opening_hours", "open_now", "serves_vegetarian_food")
+# List cards only show the first photo.
+MAX_PHOTO_REFS = 1
+
+
+def minimal_row(row: dict) -> list:
+    extra = row.get("extra") or {}
+    trimmed = {
+        **row,
+        "extra": {k: extra[k] for k in EXTRA_KEYS if k in extra} or None,
+        "photo_refs": (row.get("photo_refs") or [])[:MAX_PHOTO_REFS],
+    }
+    return [trimmed.get(c) for c in LIST_COLUMNS]
+
+
+def fingerprints(sb) -> dict[str, dict]:
+    """Per-category {count, max_updated_at} from a light column scan."""
+    fps: dict[str, dict] = defaultdict(lambda: {"count": 0, "max_updated_at": ""})
+    for row in iter_places(sb, "category, updated_at"):
+        fp = fps[row["category"]]
+        fp["count"] += 1
+        fp["max_updated_at"] = max(fp["max_updated_at"], row.get("updated_at") or "")
+    return dict(fps)
+
+
+def export_category(sb, category: str, out_dir: Path) -> dict:
+    rows = sorted(
+        (r for r in iter_places(sb, ", ".join(LIST_COLUMNS + ["archived_at"]), category=category)
+         if not r.get("archived_at")),   # swept by sweep_places.py
+        key=lambda r: (-(r.get("rating") or 0), r["name"]),
+    )
+    body = json.dumps(
+        {"category": category, "columns": LIST_COLUMNS, "rows": [minimal_row(r) for r in rows]},
+        ensure_ascii=False, separators=(",", ":"),
+    ).encode()
+    digest = hashlib.sha256(body).hexdigest()
+    name = f"{category}.{digest[:12]}.json"
+
+    encodings = ["identity", "gzip"]
+    (out_dir / name).write_bytes(body)
+    (out_dir / f"{name}.gz").write_bytes(gzip.compress(body, compresslevel=9))
+    if brotli is not None:
+        (out_dir / f"{name}.br").write_bytes(brotli.compress(body, quality=11))
+        encodings.append("br")
+
+    return {"file": name, "sha256": digest, "bytes": len(body), "rows": len(rows), "encodings": encodings}
+
+
+def remove_bundle(out_dir: Path, name: str) -> None:
+    for suffix in ("", ".gz", ".br"):
+        (out_dir / f"{name}{suffix}").unlink(missing_ok=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export per-category place snapshots for CDN delivery.")
+    parser.add_argument("--out-dir", type=Path, default=DEFAULT_OUT_DIR,
+                        help=f"Output directory. Default: {DEFAULT_OUT_DIR.relative_to(PROJECT_ROOT)}")
+    parser.add_argument("--categories", type=str, default=None,
+                        help="Comma-separated categories to consider. Default: all.")
+    parser.add_argument("--force", action="store_true", help="Re-export even if unchanged.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = args.out_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {"categories": {}}
+    entries: dict[str, dict] = manifest["categories"]
+
+    current = fingerprints(sb)
+    wanted = [c.strip() for c in args.categories.split(",")] if args.categories else sorted(current)
+
+    exported = 0
+    for category in wanted:
+        fp = current.get(category)
+        old = entries.get(category)
+        if fp is None:
+            continue
+        if old and not args.force and old.get("fingerprint") == fp:
+            logger.debug(f"{category}: unchanged ({fp['count']} rows).")
+            continue
+
+        entry = export_category(sb, category, args.out_dir)
+        entry["fingerprint"] = fp
+        if old and old["file"] != entry["file"]:
+            remove_bundle(args.out_dir, old["file"])
+        entries[category] = entry
+        exported += 1
+        logger.info(f"{category}: {entry['rows']} rows → {entry['file']} ({entry['bytes']} bytes)")
+
+    # Categories deleted entirely since the last export
+    if not args.categories:
+        for category in [c for c in entries if c not in current]:
+            remove_bundle(args.out_dir, entries.pop(category)["file"])
+            logger.info(f"{category}: no rows left — bundle removed.")
+
+    manifest["generated_at"] = datetime.now(timezone.utc).isoformat()
+    manifest["categories"] = dict(sorted(entries.items()))
+    manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False))
+    logger.info(f"Exported {exported} categories; manifest at {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+food_signals.py — Derived price and veg signals for food places, at ingest.
+
+One deterministic stage shared by the seeders' mappers, ported from
+estimatePriceForTwo / inferIsVeg in server/scripts/populateFoodSignals.js
+(which mirror src/hooks/useFoodItems.ts), so rows arrive with the values
+the frontend would compute and no full-table post-pass is needed.
+
+  price_inr            per-person equivalent of the "for two" midpoint
+  display_price_label  "₹300–₹600 for two"
+  price_range_min/max  the "for two" band behind the label
+  is_veg               servesVegetarianFood == false → False, else the name /
+                       cuisine / type keyword inference; omitted when that is
+                       inconclusive, so a curated or earlier value survives
+"""
+
+import math
+import re
+
+BASE_RANGES = {
+    0: (0, 0),
+    1: (100, 250),
+    2: (300, 600),
+    3: (700, 1200),
+    4: (1500, 3000),
+}
+DEFAULT_LEVEL = 2   # frontend default when Google has no priceLevel
+
+CHEAP_CUISINES = ("south indian", "darshini", "street food", "chaat", "udupi", "tiffin", "idli")
+PRICEY_CUISINES = (
+    "continental", "japanese", "italian", "korean", "mediterranean",
+    "sushi", "steak", "thai", "french",
+)
+
+NON_VEG_WORDS = (
+    "chicken", "fish", "mutton", "meat", "prawn", "crab", "lamb", "beef",
+    "pork", "seafood", "egg", "biryani", "kebab", "shawarma", "bbq",
+    "non-veg", "nonveg", "kfc", "mcdonald", "burger king", "subway",
+    "grills", "barbeque", "tandoori chicken",
+)
+VEG_WORDS = (
+    "pure veg", "purely veg", "vegetarian", "veg restaurant", "veg cafe",
+    "jain", "satvik", "udupi", "darshini", "satvic",
+)
+_STANDALONE_VEG = re.compile(r"(?<!non)(?<!non-)(?<!non )veg", re.IGNORECASE)
+
+
+def _js_round(x: float) -> int:
+    """Math.round: halves round up (Python's round() rounds them to even)."""
+    return math.floor(x + 0.5)
+
+
+def _tags_text(cuisine_tags: list[str] | None) -> str:
+    # v2 tags are snake_case ("south_indian"); the keyword lists use spaces
+    return " ".join(t.lower().replace("_", " ") for t in (cuisine_tags or []))
+
+
+def estimate_price_for_two(
+    price_level: int | None, place_type: str | None, cuisine_tags: list[str] | None
+) -> dict:
+    """Price band for two: {"lo", "hi", "per_person", "label"}."""
+    level = price_level if isinstance(price_level, int) else DEFAULT_LEVEL
+    if level == 0:
+        return {"lo": 0, "hi": 0, "per_person": 0, "label": "Free"}
+
+    lo, hi = BASE_RANGES.get(level, BASE_RANGES[DEFAULT_LEVEL])
+    t = (place_type or "").lower()
+    if "cafe" in t or "bakery" in t or "coffee" in t:
+        lo, hi = _js_round(lo * 0.85), _js_round(hi * 0.85)
+    elif "fast_food" in t or "snack" in t:
+        lo, hi = _js_round(lo * 0.85), _js_round(hi * 0.9)
+    elif "bar" in t or "lounge" in t or "pub" in t:
+        lo, hi = _js_round(lo * 1.15), _js_round(hi * 1.2)
+
+    tags = _tags_text(cuisine_tags)
+    if any(c in tags for c in CHEAP_CUISINES):
+        lo, hi = _js_round(lo * 0.8), _js_round(hi * 0.85)
+    elif any(c in tags for c in PRICEY_CUISINES):
+        lo, hi = _js_round(lo * 1.1), _js_round(hi * 1.15)
+
+    lo, hi = _js_round(lo / 50) * 50, _js_round(hi / 50) * 50
+    midpoint = _js_round((lo + hi) / 2)
+    return {
+        "lo": lo,
+        "hi": hi,
+        "per_person": _js_round(midpoint / 2 / 50) * 50,
+        "label": f"₹{lo} for two" if lo == hi else f"₹{lo}–₹{hi} for two",
+    }
+
+
+def infer_is_veg(name: str, cuisine_tags: list[str] | None, place_type: str | None) -> bool | None:
+    """Non-veg keywords win over veg keywords; None when genuinely ambiguous."""
+    text = " ".join([name, _tags_text(cuisine_tags), place_type or ""]).lower()
+    if any(w in text for w in NON_VEG_WORDS):
+        return False
+    if any(w in text for w in VEG_WORDS):
+        return True
+    if _STANDALONE_VEG.search(text):
+        return True
+    return None
+
+
+def food_signals(
+    name: str,
+    place_type: str | None,
+    cuisine_tags: list[str] | None,
+    price_level: int | None,
+    place: dict,
+) -> dict:
+    """PlaceRecord fields for a food place (is_veg only when known)."""
+    est = estimate_price_for_two(price_level, place_type, cuisine_tags)
+    signals = {
+        "price_inr": est["per_person"],
+        "display_price_label": est["label"],
+        "price_range_min": est["lo"],
+        "price_range_max": est["hi"],
+    }
+    if place.get("servesVegetarianFood") is False:
+        signals["is_veg"] = False
+    else:
+        is_veg = infer_is_veg(name, cuisine_tags, place_type)
+        if is_veg is not None:
+            signals["is_veg"] = is_veg
+    return signals
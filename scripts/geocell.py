@@ -0,0 +1,228 @@
+"""
+geocell.py — Hierarchical spatial cell IDs (geohash) for UniEasy places.
+
+Every place gets its geohash at GEOHASH_PRECISIONS. A geohash prefix is the
+parent cell, so a viewport or "nearby" lookup becomes an indexed
+`geohash_N IN (...)` / prefix scan instead of lat/lng range predicates over
+the whole table.
+
+Approximate cell sizes near Bangalore (lat ≈ 13°):
+    5 → 4.9 km × 4.9 km     6 → 1.2 km × 0.6 km     7 → 153 m × 153 m
+
+`GridIndex` is the in-memory counterpart used by the batch jobs for radius
+and k-nearest queries over all places.
+"""
+
+import math
+from collections import defaultdict
+from typing import Hashable
+
+EARTH_RADIUS_M = 6_371_000
+METRES_PER_DEG_LAT = 111_320
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(BASE32)}
+
+GEOHASH_PRECISIONS = (5, 6, 7)
+MAX_PRECISION = max(GEOHASH_PRECISIONS)
+
+
+def encode(lat: float, lng: float, precision: int = MAX_PRECISION) -> str:
+    """Geohash of a point at the given precision (characters)."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars: list[str] = []
+    bits = 0
+    value = 0
+    even = True   # geohash interleaves bits starting with longitude
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                value = (value << 1) | 1
+                lng_lo = mid
+            else:
+                value <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                value = (value << 1) | 1
+                lat_lo = mid
+            else:
+                value <<= 1
+                lat_hi = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def bounds(cell: str) -> tuple[float, float, float, float]:
+    """(min_lat, min_lng, max_lat, max_lng) of a geohash cell."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    even = True
+    for ch in cell:
+        value = _DECODE[ch]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                if bit:
+                    lng_lo = mid
+                else:
+                    lng_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if bit:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            even = not even
+    return lat_lo, lng_lo, lat_hi, lng_hi
+
+
+def cell_columns(lat: float, lng: float) -> dict[str, str]:
+    """Column values {geohash_5: ..., geohash_6: ..., geohash_7: ...} for a point."""
+    full = encode(lat, lng, MAX_PRECISION)
+    return {f"geohash_{p}": full[:p] for p in GEOHASH_PRECISIONS}
+
+
+def cover_bbox(
+    min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+    precision: int,
+) -> list[str]:
+    """
+    Cells at `precision` that together cover a bounding box. Use the result
+    as `geohash_<precision> IN (...)`, then trim edges with the exact bbox.
+    """
+    lat_lo, lng_lo, lat_hi, lng_hi = bounds(encode(min_lat, min_lng, precision))
+    cell_h = lat_hi - lat_lo
+    cell_w = lng_hi - lng_lo
+
+    cells: list[str] = []
+    lat = lat_lo + cell_h / 2
+    while lat - cell_h / 2 <= max_lat:
+        lng = lng_lo + cell_w / 2
+        while lng - cell_w / 2 <= max_lng:
+            cells.append(encode(lat, lng, precision))
+            lng += cell_w
+        lat += cell_h
+    return cells
+
+
+def neighbours(cell: str) -> list[str]:
+    """The cell itself plus its 8 surrounding cells at the same precision."""
+    lat_lo, lng_lo, lat_hi, lng_hi = bounds(cell)
+    cell_h = lat_hi - lat_lo
+    cell_w = lng_hi - lng_lo
+    lat_c = (lat_lo + lat_hi) / 2
+    lng_c = (lng_lo + lng_hi) / 2
+    return [
+        encode(lat_c + dy * cell_h, lng_c + dx * cell_w, len(cell))
+        for dy in (-1, 0, 1)
+        for dx in (-1, 0, 1)
+    ]
+
+
+def distance_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in metres (haversine)."""
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat1))
+        * math.cos(math.radians(lat2))
+        * math.sin(dlng / 2) ** 2
+    )
+    return EARTH_RADIUS_M * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class GridIndex:
+    """
+    Uniform lat/lng grid over points for radius and k-nearest queries.
+    `cell_deg` ≈ 0.005 (~550 m) suits campus-scale data; queries only visit
+    the rings of cells that can still contain a closer point.
+    """
+
+    def __init__(self, cell_deg: float = 0.005) -> None:
+        self.cell_deg = cell_deg
+        self._cells: dict[tuple[int, int], list[tuple[float, float, Hashable]]] = defaultdict(list)
+        self._min = [math.inf, math.inf]
+        self._max = [-math.inf, -math.inf]
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._cells.values())
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    def add(self, key: Hashable, lat: float, lng: float) -> None:
+        cy, cx = self._cell(lat, lng)
+        self._cells[(cy, cx)].append((lat, lng, key))
+        self._min = [min(self._min[0], cy), min(self._min[1], cx)]
+        self._max = [max(self._max[0], cy), max(self._max[1], cx)]
+
+    def _ring(self, cy: int, cx: int, r: int):
+        for dy in range(-r, r + 1):
+            for dx in range(-r, r + 1):
+                if max(abs(dy), abs(dx)) != r:
+                    continue
+                yield from self._cells.get((cy + dy, cx + dx), ())
+
+    def _max_ring(self, cy: int, cx: int) -> int:
+        if not self._cells:
+            return -1
+        return int(max(
+            abs(cy - self._min[0]), abs(cy - self._max[0]),
+            abs(cx - self._min[1]), abs(cx - self._max[1]),
+        ))
+
+    def _ring_clearance_m(self, lat: float, r: int) -> float:
+        """Distance guaranteed to any point outside rings 0..r."""
+        side = self.cell_deg * METRES_PER_DEG_LAT * min(1.0, math.cos(math.radians(lat)))
+        return r * side
+
+    def nearest(
+        self, lat: float, lng: float, k: int,
+        exclude: Hashable | None = None,
+        max_m: float | None = None,
+    ) -> list[tuple[float, Hashable]]:
+        """Up to k (distance_m, key) pairs, closest first."""
+        cy, cx = self._cell(lat, lng)
+        found: list[tuple[float, Hashable]] = []
+        for r in range(self._max_ring(cy, cx) + 1):
+            for plat, plng, key in self._ring(cy, cx, r):
+                if key == exclude:
+                    continue
+                d = distance_m(lat, lng, plat, plng)
+                if max_m is None or d <= max_m:
+                    found.append((d, key))
+            found.sort(key=lambda t: t[0])
+            del found[k:]
+            clearance = self._ring_clearance_m(lat, r)
+            if len(found) == k and found[-1][0] <= clearance:
+                break
+            if max_m is not None and clearance >= max_m:
+                break
+        return found
+
+    def within(self, lat: float, lng: float, radius_m: float) -> list[tuple[float, Hashable]]:
+        """All (distance_m, key) pairs within radius_m, closest first."""
+        cy, cx = self._cell(lat, lng)
+        found: list[tuple[float, Hashable]] = []
+        for r in range(self._max_ring(cy, cx) + 1):
+            for plat, plng, key in self._ring(cy, cx, r):
+                d = distance_m(lat, lng, plat, plng)
+                if d <= radius_m:
+                    found.append((d, key))
+            if self._ring_clearance_m(lat, r) >= radius_m:
+                break
+        found.sort(key=lambda t: t[0])
+        return found
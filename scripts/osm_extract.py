@@ -0,0 +1,334 @@
+"""
+osm_extract.py — Streaming readers for local OpenStreetMap extracts.
+
+`iter_features(path, within)` yields tagged OSM features as
+
+    {"osm_id": "node/123", "lat": 12.93, "lng": 77.60, "tags": {...}}
+
+one at a time, whatever the file format, so an extract of any size is read
+in bounded memory:
+
+  .geojsonseq / .geojsonl / .ndjson   one feature per line
+  .geojson / .json                    a FeatureCollection, decoded feature
+                                      by feature (never loaded whole)
+  .osm / .xml                         OSM XML via iterparse; way centroids
+                                      come from node coordinates kept only
+                                      for nodes inside `within`
+  .pbf                                via pyosmium (optional dependency)
+
+Ways and polygons become their centroid (vertex mean; fine at POI scale).
+Relations are skipped. `within(lat, lng)` filters features by location —
+e.g. a radius around campus — before they are yielded.
+
+`iter_ways(path, within, keep)` instead yields the node sequence of every
+way whose tags pass `keep` (e.g. walkable highways), for routing graphs:
+
+    {"osm_id": "way/9", "tags": {...}, "nodes": [(node_key, lat, lng), ...]}
+
+A way leaving the `within` region is split into its runs of inside nodes.
+GeoJSON has no node ids, so vertices are keyed by their coordinates
+(shared junction vertices still join up).
+"""
+
+import gzip
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Callable, Iterator
+
+Within = Callable[[float, float], bool]
+
+READ_CHUNK = 1 << 16
+
+_TYPE_PREFIX = {"n": "node", "w": "way", "r": "relation"}
+
+
+# ─── GeoJSON ─────────────────────────────────────────────────────────────────
+
+def _centroid(geometry: dict | None) -> tuple[float, float] | None:
+    """(lat, lng) of a Point, or the vertex mean of any other geometry."""
+    if not geometry:
+        return None
+    coords = geometry.get("coordinates")
+    if geometry.get("type") == "Point":
+        return (coords[1], coords[0]) if coords else None
+
+    total_lat = total_lng = 0.0
+    n = 0
+    stack = [coords]
+    while stack:
+        c = stack.pop()
+        if not c:
+            continue
+        if isinstance(c[0], (int, float)):
+            total_lng += c[0]
+            total_lat += c[1]
+            n += 1
+        else:
+            stack.extend(c)
+    return (total_lat / n, total_lng / n) if n else None
+
+
+def _osm_id(feature: dict, props: dict) -> str | None:
+    """'node/123' from the id conventions of osmium export, Overpass and ogr2ogr."""
+    if props.get("osm_type") and props.get("osm_id"):
+        return f"{props['osm_type']}/{props['osm_id']}"
+    raw = str(feature.get("id") or props.get("@id") or props.get("id") or "")
+    if "/" in raw:
+        return raw
+    if raw[:1] in _TYPE_PREFIX and raw[1:].isdigit():
+        return f"{_TYPE_PREFIX[raw[0]]}/{raw[1:]}"
+    return None
+
+
+def _from_geojson(feature: dict, within: Within) -> dict | None:
+    props = feature.get("properties") or {}
+    osm_id = _osm_id(feature, props)
+    if not osm_id or osm_id.startswith("relation/"):
+        return None
+    point = _centroid(feature.get("geometry"))
+    if point is None or not within(*point):
+        return None
+    tags = props.get("tags") if isinstance(props.get("tags"), dict) else props
+    tags = {k: str(v) for k, v in tags.items() if not k.startswith("@") and v is not None}
+    return {"osm_id": osm_id, "lat": point[0], "lng": point[1], "tags": tags}
+
+
+def _iter_json_array(f, key: str) -> Iterator[dict]:
+    """Decode the elements of the top-level array `key` one at a time."""
+    decoder = json.JSONDecoder()
+    buf = ""
+    marker = f'"{key}"'
+    while True:                       # skip to the array (the header is small)
+        i = buf.find(marker)
+        j = buf.find("[", i) if i >= 0 else -1
+        if j >= 0:
+            buf = buf[j + 1:]
+            break
+        more = f.read(READ_CHUNK)
+        if not more:
+            return
+        buf += more
+
+    while True:
+        buf = buf.lstrip(" \t\r\n,")
+        if buf.startswith("]"):
+            return
+        try:
+            obj, end = decoder.raw_decode(buf) if buf else (None, 0)
+        except json.JSONDecodeError:
+            obj = None
+        if obj is None:               # element continues past the buffer
+            more = f.read(READ_CHUNK)
+            if not more:
+                if buf:
+                    raise ValueError(f"Truncated GeoJSON near: {buf[:80]!r}")
+                return
+            buf += more
+            continue
+        yield obj
+        buf = buf[end:]
+
+
+def _open_text(path: Path):
+    return gzip.open(path, "rt", encoding="utf-8") if path.suffix == ".gz" else open(path, encoding="utf-8")
+
+
+def iter_geojsonseq(path: Path, within: Within) -> Iterator[dict]:
+    with _open_text(path) as f:
+        for line in f:
+            line = line.strip().lstrip("\x1e")   # RFC 8142 record separator
+            if line:
+                feature = _from_geojson(json.loads(line), within)
+                if feature:
+                    yield feature
+
+
+def iter_geojson(path: Path, within: Within) -> Iterator[dict]:
+    with _open_text(path) as f:
+        for obj in _iter_json_array(f, "features"):
+            feature = _from_geojson(obj, within)
+            if feature:
+                yield feature
+
+
+# ─── OSM XML ─────────────────────────────────────────────────────────────────
+
+def _iter_osm_elements(path: Path) -> Iterator[ET.Element]:
+    """Complete node / way / relation elements, each dropped once processed."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as f:
+        context = ET.iterparse(f, events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event == "end" and elem.tag in ("node", "way", "relation"):
+                yield elem
+                root.clear()
+
+
+def _tags(elem: ET.Element) -> dict[str, str]:
+    return {t.get("k"): t.get("v") for t in elem.iter("tag")}
+
+
+def iter_osm_xml(path: Path, within: Within) -> Iterator[dict]:
+    """
+    Tagged nodes and ways. Nodes precede ways in .osm files, so coordinates
+    are remembered (inside `within` only) for way centroids.
+    """
+    coords: dict[str, tuple[float, float]] = {}
+    for elem in _iter_osm_elements(path):
+        tags = _tags(elem)
+        if elem.tag == "node":
+            lat, lng = float(elem.get("lat")), float(elem.get("lon"))
+            if within(lat, lng):
+                coords[elem.get("id")] = (lat, lng)
+                if tags:
+                    yield {"osm_id": f"node/{elem.get('id')}", "lat": lat, "lng": lng, "tags": tags}
+        elif elem.tag == "way" and tags:
+            points = [coords[nd.get("ref")] for nd in elem.iter("nd") if nd.get("ref") in coords]
+            if points:
+                lat = sum(p[0] for p in points) / len(points)
+                lng = sum(p[1] for p in points) / len(points)
+                yield {"osm_id": f"way/{elem.get('id')}", "lat": lat, "lng": lng, "tags": tags}
+
+
+# ─── PBF ─────────────────────────────────────────────────────────────────────
+
+def _import_osmium():
+    try:
+        import osmium  # pyre-ignore[21]
+    except ImportError:
+        raise SystemExit(
+            "PBF extracts need pyosmium (pip install -r scripts/requirements.txt), or convert first: "
+            "osmium export extract.osm.pbf -f geojsonseq -o extract.geojsonseq"
+        )
+    return osmium
+
+
+def iter_pbf(path: Path, within: Within) -> Iterator[dict]:
+    osmium = _import_osmium()
+    for obj in osmium.FileProcessor(str(path)).with_locations():
+        if not obj.tags or obj.is_relation():
+            continue
+        if obj.is_node():
+            if not obj.location.valid():
+                continue
+            lat, lng = obj.location.lat, obj.location.lon
+            kind = "node"
+        else:
+            points = [(n.lat, n.lon) for n in obj.nodes if n.location.valid()]
+            if not points:
+                continue
+            lat = sum(p[0] for p in points) / len(points)
+            lng = sum(p[1] for p in points) / len(points)
+            kind = "way"
+        if within(lat, lng):
+            yield {"osm_id": f"{kind}/{obj.id}", "lat": lat, "lng": lng,
+                   "tags": {t.k: t.v for t in obj.tags}}
+
+
+# ─── Ways (routing graphs) ───────────────────────────────────────────────────
+
+Keep = Callable[[dict], bool]
+WayNode = tuple[str, float, float]
+
+
+def _runs(osm_id: str, tags: dict, nodes: list[WayNode | None]) -> Iterator[dict]:
+    """Split a way at nodes outside the region (None) into runs of 2+ nodes."""
+    run: list[WayNode] = []
+    for node in nodes + [None]:
+        if node is not None:
+            run.append(node)
+            continue
+        if len(run) >= 2:
+            yield {"osm_id": osm_id, "tags": tags, "nodes": run}
+        run = []
+
+
+def iter_ways_osm_xml(path: Path, within: Within, keep: Keep) -> Iterator[dict]:
+    coords: dict[str, tuple[float, float]] = {}
+    for elem in _iter_osm_elements(path):
+        if elem.tag == "node":
+            lat, lng = float(elem.get("lat")), float(elem.get("lon"))
+            if within(lat, lng):
+                coords[elem.get("id")] = (lat, lng)
+        elif elem.tag == "way":
+            tags = _tags(elem)
+            if keep(tags):
+                refs = [nd.get("ref") for nd in elem.iter("nd")]
+                yield from _runs(f"way/{elem.get('id')}", tags,
+                                 [(r, *coords[r]) if r in coords else None for r in refs])
+
+
+def _geojson_ways(features: Iterator[dict], within: Within, keep: Keep) -> Iterator[dict]:
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        props = feature.get("properties") or {}
+        tags = props.get("tags") if isinstance(props.get("tags"), dict) else props
+        if geometry.get("type") not in ("LineString", "MultiLineString") or not keep(tags):
+            continue
+        osm_id = _osm_id(feature, props) or ""
+        lines = geometry["coordinates"] if geometry["type"] == "MultiLineString" else [geometry["coordinates"]]
+        for line in lines:
+            yield from _runs(osm_id, tags, [
+                (f"{lat:.7f},{lng:.7f}", lat, lng) if within(lat, lng) else None
+                for lng, lat, *_ in line
+            ])
+
+
+def iter_ways_geojsonseq(path: Path, within: Within, keep: Keep) -> Iterator[dict]:
+    with _open_text(path) as f:
+        lines = (json.loads(line.strip().lstrip("\x1e")) for line in f if line.strip())
+        yield from _geojson_ways(lines, within, keep)
+
+
+def iter_ways_geojson(path: Path, within: Within, keep: Keep) -> Iterator[dict]:
+    with _open_text(path) as f:
+        yield from _geojson_ways(_iter_json_array(f, "features"), within, keep)
+
+
+def iter_ways_pbf(path: Path, within: Within, keep: Keep) -> Iterator[dict]:
+    osmium = _import_osmium()
+    for obj in osmium.FileProcessor(str(path)).with_locations():
+        if not obj.is_way():
+            continue
+        tags = {t.k: t.v for t in obj.tags}
+        if not keep(tags):
+            continue
+        yield from _runs(f"way/{obj.id}", tags, [
+            (str(n.ref), n.lat, n.lon) if n.location.valid() and within(n.lat, n.lon) else None
+            for n in obj.nodes
+        ])
+
+
+READERS = {
+    ".geojsonseq": iter_geojsonseq, ".geojsonl": iter_geojsonseq, ".geojsons": iter_geojsonseq,
+    ".ndjson": iter_geojsonseq, ".geojson": iter_geojson, ".json": iter_geojson,
+    ".osm": iter_osm_xml, ".xml": iter_osm_xml, ".pbf": iter_pbf,
+}
+
+
+WAY_READERS = {
+    iter_geojsonseq: iter_ways_geojsonseq, iter_geojson: iter_ways_geojson,
+    iter_osm_xml: iter_ways_osm_xml, iter_pbf: iter_ways_pbf,
+}
+
+
+def _reader(path: Path) -> Callable:
+    suffixes = [s for s in path.suffixes if s != ".gz"]
+    reader = READERS.get(suffixes[-1].lower()) if suffixes else None
+    if reader is None:
+        raise SystemExit(f"Unsupported extract format: {path.name} (expected {', '.join(sorted(READERS))})")
+    if reader is iter_pbf and path.suffix == ".gz":
+        raise SystemExit("PBF is already compressed; pass the .pbf file itself")
+    return reader
+
+
+def iter_features(path: Path, within: Within = lambda lat, lng: True) -> Iterator[dict]:
+    """Tagged features of an extract, by file extension (optionally .gz)."""
+    return _reader(path)(path, within)
+
+
+def iter_ways(path: Path, within: Within = lambda lat, lng: True, keep: Keep = lambda tags: True) -> Iterator[dict]:
+    """Node sequences of the ways whose tags pass `keep`, by file extension."""
+    return WAY_READERS[_reader(path)](path, within, keep)
@@ -0,0 +1,244 @@
+"""
+place_record.py — Typed place record shared by all UniEasy seeders.
+
+`PlaceRecord` is a slotted object with one attribute per `places` column a
+seeder may write; mappers build one instead of an ad-hoc 30–45 key dict.
+Columns a mapper does not set stay UNSET and are left out of the row, so
+v1 never clobbers columns only v2 writes.
+
+`merge_rows()` is the write path: one `merge_places_batch` call per chunk
+(migration 021), which refreshes Google-owned columns and keeps admin-owned
+ones on rows with is_manual_override — no read-before-write per row.
+
+`PlacesSchema` is the live column list of the `places` table, read once per
+run from PostgREST's OpenAPI description. `validate()` checks records
+against it before anything is sent, so an unknown column or a wrongly-typed
+value is reported per record instead of failing a whole 50-row upsert.
+"""
+
+import logging
+from functools import lru_cache
+from operator import attrgetter
+
+import requests  # pyre-ignore[21]
+
+logger = logging.getLogger("place_record")
+
+PLACE_COLUMNS = (
+    # identity / classification
+    "google_place_id", "osm_id", "name", "category", "type", "sub_type",
+    # location
+    "address", "city", "lat", "lng", "geohash_5", "geohash_6", "geohash_7",
+    "distance_from_campus", "is_on_campus",
+    # contact
+    "phone", "website", "google_maps_url",
+    # provenance
+    "is_static", "is_manual_override", "data_source", "last_fetched_at",
+    "last_seen_run", "verified", "updated_at",
+    # Google signals
+    "rating", "rating_count", "business_status", "price_level",
+    # derived pricing
+    "price_inr", "price_range_min", "price_range_max", "price_display",
+    "display_price_label",
+    # food / study attributes
+    "is_veg", "cuisine_tags", "amenities", "has_wifi", "noise_level",
+    "delivery_available", "takeaway_available", "dine_in_available",
+    # hours
+    "timing", "opening_hours_mask",
+    # content
+    "photo_refs", "primary_photo_url", "description", "tags", "extra",
+)
+
+
+class _Unset:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "UNSET"
+
+    # Unpickle (records returned from remap's worker processes) to the
+    # module singleton, so `is UNSET` checks still hold.
+    def __reduce__(self) -> str:
+        return "UNSET"
+
+
+UNSET = _Unset()
+
+_get_all = attrgetter(*PLACE_COLUMNS)
+
+
+class PlaceRecord:
+    """One mapped place, ready to be written to the `places` table."""
+
+    __slots__ = PLACE_COLUMNS
+
+    def __init__(self, **fields: object) -> None:
+        for column in PLACE_COLUMNS:
+            setattr(self, column, fields.pop(column, UNSET))
+        if fields:
+            raise TypeError(f"Unknown places column(s): {', '.join(sorted(fields))}")
+
+    def to_row(self) -> dict:
+        """Serialize to the JSON row PostgREST expects, omitting unset columns."""
+        return {
+            column: value
+            for column, value in zip(PLACE_COLUMNS, _get_all(self))
+            if value is not UNSET
+        }
+
+    # Read access in the style of the dicts this replaces (logging, dry runs).
+    def __getitem__(self, column: str) -> object:
+        value = getattr(self, column, UNSET) if column in PLACE_COLUMNS else UNSET
+        if value is UNSET:
+            raise KeyError(column)
+        return value
+
+    def get(self, column: str, default: object = None) -> object:
+        try:
+            return self[column]
+        except KeyError:
+            return default
+
+    def __repr__(self) -> str:
+        return f"PlaceRecord({self.get('google_place_id')!r}, {self.get('name')!r})"
+
+
+# ─── Schema validation ───────────────────────────────────────────────────────
+
+# PostgREST OpenAPI `format` → accepted Python types (None is checked separately)
+_FORMAT_TYPES: dict[str, tuple[type, ...]] = {
+    "text": (str,),
+    "uuid": (str,),
+    "timestamp with time zone": (str,),
+    "bit": (str,),
+    "boolean": (bool,),
+    "smallint": (int,),
+    "integer": (int,),
+    "bigint": (int,),
+    "numeric": (int, float),
+    "double precision": (int, float),
+    "jsonb": (dict, list),
+}
+
+
+class PlacesSchema:
+    """Column names, formats and NOT NULL flags of the live `places` table."""
+
+    def __init__(self, columns: dict[str, str], required: set[str]) -> None:
+        self.columns = columns
+        self.required = required
+
+    def _check_value(self, column: str, value: object) -> str | None:
+        if value is None:
+            return f"{column} is NOT NULL" if column in self.required else None
+        fmt = self.columns[column]
+        if fmt.endswith("[]"):
+            return None if isinstance(value, list) else f"{column} expects an array"
+        fmt = fmt.split("(")[0]   # numeric(10,7), bit(672), …
+        expected = _FORMAT_TYPES.get(fmt)
+        if expected is None:
+            return None
+        # bool is an int subclass; don't let True pass as an integer
+        if isinstance(value, bool) and bool not in expected:
+            return f"{column} expects {fmt}, got bool"
+        if not isinstance(value, expected):
+            return f"{column} expects {fmt}, got {type(value).__name__}"
+        return None
+
+    def validate(self, records: list[PlaceRecord]) -> tuple[list[PlaceRecord], list[str]]:
+        """
+        Split records into (valid, errors). Unknown columns are reported once
+        and invalidate every record that sets them.
+        """
+        valid: list[PlaceRecord] = []
+        errors: list[str] = []
+        unknown_seen: set[str] = set()
+        for record in records:
+            problems: list[str] = []
+            for column, value in zip(PLACE_COLUMNS, _get_all(record)):
+                if value is UNSET:
+                    continue
+                if column not in self.columns:
+                    if column not in unknown_seen:
+                        unknown_seen.add(column)
+                        errors.append(f"column '{column}' does not exist in places")
+                    problems.append(column)
+                    continue
+                problem = self._check_value(column, value)
+                if problem:
+                    problems.append(problem)
+            if problems:
+                errors.append(f"{record!r}: {'; '.join(problems)}")
+            else:
+                valid.append(record)
+        return valid, errors
+
+
+@lru_cache(maxsize=None)
+def load_places_schema(sb_url: str, sb_key: str) -> PlacesSchema | None:
+    """
+    Fetch the `places` definition from PostgREST's OpenAPI root once per run.
+    Returns None (validation skipped) if the description is unavailable.
+    """
+    try:
+        resp = requests.get(
+            f"{sb_url.rstrip('/')}/rest/v1/",
+            headers={"apikey": sb_key, "Authorization": f"Bearer {sb_key}"},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        definition = resp.json()["definitions"]["places"]
+    except (requests.RequestException, KeyError, ValueError) as e:
+        logger.warning(f"Could not load places schema; skipping validation: {e}")
+        return None
+
+    columns = {
+        name: prop.get("format", prop.get("type", ""))
+        for name, prop in definition.get("properties", {}).items()
+    }
+    return PlacesSchema(columns, set(definition.get("required", [])))
+
+
+def validated_rows(
+    records: list[PlaceRecord],
+    schema: PlacesSchema | None,
+    log: logging.Logger,
+) -> list[dict]:
+    """Validate (when a schema is available), log rejects, serialize the rest."""
+    if schema is not None:
+        records, errors = schema.validate(records)
+        for err in errors:
+            log.error(f"Schema check: {err}")
+    return [r.to_row() for r in records]
+
+
+# ─── Writes ──────────────────────────────────────────────────────────────────
+
+MERGE_CHUNK = 50
+
+
+def merge_rows(
+    sb,
+    rows: list[dict],
+    log: logging.Logger,
+    chunk: int = MERGE_CHUNK,
+) -> tuple[int, int, int, int]:
+    """
+    Merge serialized rows into `places` through the column-policy merge, one
+    RPC per chunk. Returns (inserted, updated, protected, failed), where
+    `protected` counts updates that kept admin-owned fields.
+    """
+    inserted = updated = protected = failed = 0
+    for i in range(0, len(rows), chunk):
+        part = rows[i:i + chunk]
+        try:
+            result = sb.rpc("merge_places_batch", {"p_rows": part}).execute()
+        except Exception as e:
+            log.error(f"Merge error (chunk {i}): {e}")
+            failed += len(part)
+            continue
+        counts = (result.data or [{}])[0]
+        inserted += counts.get("inserted") or 0
+        updated += counts.get("updated") or 0
+        protected += counts.get("protected") or 0
+    return inserted, updated, protected, failed
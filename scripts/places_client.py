@@ -0,0 +1,179 @@
+"""
+places_client.py — Place Details (New) client for UniEasy's refresh jobs.
+
+The seeders search; jobs that revisit known places fetch them by ID instead
+(GET /v1/places/{id}), with a minimal field mask so a refresh is billed at
+the cheapest tier that carries the signals we keep — or, for the detail
+cache pre-warm, with the same mask as the server's live fetch.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import time
+
+import requests  # pyre-ignore[21]
+
+from weekly_hours import opening_hours_mask
+
+PLACES_API_BASE = "https://places.googleapis.com/v1"
+
+# Signals a refresh keeps current (all Google-owned in place_column_policy)
+REFRESH_FIELD_MASK = ",".join([
+    "id",
+    "rating",
+    "userRatingCount",
+    "businessStatus",
+    "regularOpeningHours",
+])
+
+# GET /api/places/:id's field mask (server/lib/constants.js DETAIL_FIELD_MASK);
+# prewarm_details.py writes the same fields the server's live fetch does.
+DETAIL_FIELD_MASK = ",".join([
+    "id",
+    "displayName",
+    "formattedAddress",
+    "location",
+    "rating",
+    "userRatingCount",
+    "currentOpeningHours",
+    "businessStatus",
+    "reviews",
+    "photos",
+    "internationalPhoneNumber",
+    "websiteUri",
+    "types",
+    "priceLevel",
+    "servesVegetarianFood",
+])
+
+PRICE_LEVELS = {
+    "PRICE_LEVEL_FREE": 0,
+    "PRICE_LEVEL_INEXPENSIVE": 1,
+    "PRICE_LEVEL_MODERATE": 2,
+    "PRICE_LEVEL_EXPENSIVE": 3,
+    "PRICE_LEVEL_VERY_EXPENSIVE": 4,
+}
+
+MAX_RETRIES = 4
+INITIAL_WAIT = 1.0
+MAX_WAIT = 30.0
+
+
+class PlaceNotFound(Exception):
+    """Details returned 404 — the ID is obsolete or the place was removed."""
+
+
+def fetch_place_details(
+    api_key: str,
+    place_id: str,
+    field_mask: str,
+    log: logging.Logger,
+    session: requests.Session | None = None,
+) -> dict | None:
+    """
+    GET one place by ID with backoff on 429/5xx. Returns the JSON body, or
+    None on an unrecoverable error. Raises PlaceNotFound on 404.
+    """
+    resource = place_id if place_id.startswith("places/") else f"places/{place_id}"
+    headers = {"X-Goog-Api-Key": api_key, "X-Goog-FieldMask": field_mask}
+    http = session or requests
+    wait = INITIAL_WAIT
+
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            resp = http.get(f"{PLACES_API_BASE}/{resource}", headers=headers, timeout=30)
+            if resp.status_code == 404:
+                raise PlaceNotFound(place_id)
+            if resp.status_code == 403:
+                log.error(f"Place Details 403 Forbidden: {resp.text[:200]}")
+                return None
+            if resp.status_code < 400:
+                return resp.json()
+            if resp.status_code != 429 and resp.status_code < 500:
+                log.warning(f"Place Details HTTP {resp.status_code} for {place_id}: {resp.text[:200]}")
+                return None
+            log.debug(f"Place Details HTTP {resp.status_code} for {place_id} (attempt {attempt})")
+        except requests.exceptions.RequestException as e:
+            log.debug(f"Place Details request error for {place_id} (attempt {attempt}): {e}")
+
+        time.sleep(min(wait + random.uniform(0, wait * 0.5), MAX_WAIT))
+        wait *= 2
+
+    log.warning(f"Place Details retries exhausted for {place_id}")
+    return None
+
+
+def refresh_signals(place: dict) -> dict:
+    """Map a REFRESH_FIELD_MASK response onto the places columns it refreshes."""
+    return {
+        "rating": place.get("rating"),
+        "rating_count": place.get("userRatingCount"),
+        "business_status": place.get("businessStatus"),
+        "opening_hours_mask": opening_hours_mask(place),
+    }
+
+
+def signals_hash(signals: dict) -> str:
+    """Stable content hash of refreshed signals; changes when Google's data does."""
+    body = json.dumps(signals, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(body.encode()).hexdigest()[:16]
+
+
+def detail_update(row: dict, place: dict) -> dict:
+    """
+    Columns a DETAIL_FIELD_MASK response updates — the same payload as the
+    server's fetchAndUpdatePlaceDetails (server/lib/placesService.js), plus
+    the refresh signals. Fields Google omits keep the row's value.
+    """
+    extra = dict(row.get("extra") or {})
+    hours = place.get("currentOpeningHours")
+    if hours:
+        extra["opening_hours"] = {
+            "openNow": hours.get("openNow"),
+            "periods": hours.get("periods"),
+            "weekdayDescriptions": hours.get("weekdayDescriptions"),
+        }
+    if place.get("businessStatus"):
+        extra["business_status"] = place["businessStatus"]
+    if place.get("reviews"):
+        extra["reviews"] = [
+            {
+                "author": (r.get("authorAttribution") or {}).get("displayName") or "Anonymous",
+                "rating": r.get("rating"),
+                "text": (r.get("text") or {}).get("text", ""),
+                "publishTime": r.get("publishTime"),
+                "relativePublishTime": r.get("relativePublishTimeDescription"),
+            }
+            for r in place["reviews"][:3]
+        ]
+    if isinstance(place.get("servesVegetarianFood"), bool):
+        extra["serves_vegetarian_food"] = place["servesVegetarianFood"]
+
+    photo_refs = row.get("photo_refs") or []
+    if place.get("photos"):
+        photo_refs = [
+            {
+                "ref": p.get("name", ""),
+                "width": p.get("widthPx"),
+                "height": p.get("heightPx"),
+                "html_attributions": [
+                    a.get("displayName", "") for a in (p.get("authorAttributions") or [])
+                ],
+            }
+            for p in place["photos"][:5]
+        ]
+
+    signals = refresh_signals(place)
+    return {
+        "rating": place.get("rating", row.get("rating")),
+        "rating_count": place.get("userRatingCount", row.get("rating_count")),
+        "price_level": PRICE_LEVELS.get(place.get("priceLevel"), row.get("price_level")),
+        "phone": place.get("internationalPhoneNumber") or row.get("phone"),
+        "website": place.get("websiteUri") or row.get("website"),
+        "business_status": signals["business_status"] or row.get("business_status"),
+        "opening_hours_mask": signals["opening_hours_mask"] or row.get("opening_hours_mask"),
+        "extra": extra,
+        "photo_refs": photo_refs,
+    }
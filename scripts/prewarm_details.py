@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+prewarm_details.py — Keep the most-viewed places' detail cache warm.
+
+GET /api/places/:id serves the stored row while last_fetched_at is within
+the server's TTL (OPENING_HOURS_TTL, 2 h) and otherwise fetches Place
+Details from Google inside the user's request. This worker refreshes the
+places users actually open shortly *before* that TTL runs out, so detail
+requests for them almost always hit the cached row.
+
+Each cycle:
+  1. Take the top --top places by view weight
+         weight = view_count · ½^(days since last view / VIEW_HALF_LIFE_DAYS)
+     from place_views (bumped by the detail route).
+  2. Refresh, concurrently, those whose cache expires within --lead-minutes,
+     using the server's own field mask and update payload
+     (places_client.detail_update), written through the column-policy merge.
+  3. Sleep until the next one comes due (at most --replan-minutes).
+
+Rows the detail route never live-fetches (no google_place_id, manual
+skeletons, on-campus overrides) and archived rows are skipped.
+
+Usage:
+    python scripts/prewarm_details.py --top 200
+    python scripts/prewarm_details.py --top 500 --lead-minutes 15 --concurrency 16
+    python scripts/prewarm_details.py --once --dry-run
+"""
+
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import requests  # pyre-ignore[21]
+from supabase import create_client  # pyre-ignore[21]
+
+from place_record import merge_rows
+from places_client import DETAIL_FIELD_MASK, PlaceNotFound, detail_update, fetch_place_details
+from seed_common import load_env, setup_logging
+
+logger = logging.getLogger("prewarm_details")
+
+# server/lib/constants.js: isLiveDataStale() uses the shorter of RATING_TTL
+# and OPENING_HOURS_TTL
+DETAIL_TTL = timedelta(hours=2)
+VIEW_HALF_LIFE_DAYS = 7
+CANDIDATE_FACTOR = 4     # place_views rows read per --top slot before re-weighting
+ID_CHUNK = 200
+
+ROW_COLUMNS = (
+    "id, google_place_id, name, data_source, is_on_campus, is_manual_override, archived_at, "
+    "last_fetched_at, rating, rating_count, price_level, phone, website, business_status, "
+    "opening_hours_mask, extra, photo_refs"
+)
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def _parse_ts(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+def expires_at(row: dict) -> datetime:
+    fetched = _parse_ts(row.get("last_fetched_at"))
+    return fetched + DETAIL_TTL if fetched else datetime.min.replace(tzinfo=timezone.utc)
+
+
+def live_fetched(row: dict) -> bool:
+    """Mirrors the detail route: which rows would it live-fetch when stale?"""
+    return bool(
+        row.get("google_place_id")
+        and row.get("data_source") != "manual_skeleton"
+        and not (row.get("is_on_campus") and row.get("is_manual_override"))
+        and not row.get("archived_at")
+    )
+
+
+def top_places(sb, top: int, now: datetime) -> list[dict]:
+    """The `top` live-fetched places by recency-weighted views, heaviest first."""
+    views = (
+        sb.table("place_views")
+        .select("place_id, view_count, last_viewed_at")
+        .order("view_count", desc=True)
+        .limit(top * CANDIDATE_FACTOR)
+        .execute()
+    ).data or []
+
+    weight: dict[str, float] = {}
+    for v in views:
+        age_days = (now - _parse_ts(v["last_viewed_at"])).total_seconds() / 86400
+        weight[v["place_id"]] = v["view_count"] * 0.5 ** (max(age_days, 0) / VIEW_HALF_LIFE_DAYS)
+
+    ids = sorted(weight, key=weight.get, reverse=True)
+    rows: list[dict] = []
+    for i in range(0, len(ids), ID_CHUNK):
+        rows += sb.table("places").select(ROW_COLUMNS).in_("id", ids[i:i + ID_CHUNK]).execute().data or []
+    rows = [r for r in rows if live_fetched(r)]
+    rows.sort(key=lambda r: weight[r["id"]], reverse=True)
+    return rows[:top]
+
+
+def refresh(sb, api_key: str, rows: list[dict], concurrency: int, dry_run: bool) -> dict[str, int]:
+    """Fetch details for rows concurrently and merge the server's update payload."""
+    counts = {"refreshed": 0, "not_found": 0, "errors": 0}
+
+    def fetch(row: dict) -> tuple[dict, dict | None, bool]:
+        try:
+            details = fetch_place_details(
+                api_key, row["google_place_id"], DETAIL_FIELD_MASK, logger, _session()
+            )
+            return row, details, False
+        except PlaceNotFound:
+            return row, None, True
+
+    docs: list[dict] = []
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for row, details, not_found in pool.map(fetch, rows):
+            if not_found:
+                counts["not_found"] += 1   # left to sweep_places.py
+            if details is None:
+                continue
+            docs.append({
+                "google_place_id": row["google_place_id"],
+                **detail_update(row, details),
+                "last_fetched_at": datetime.now(timezone.utc).isoformat(),
+            })
+    counts["errors"] = len(rows) - len(docs) - counts["not_found"]
+
+    if docs and not dry_run:
+        _, updated, _, failed = merge_rows(sb, docs, logger)
+        counts["refreshed"] = updated
+        counts["errors"] += failed
+    else:
+        counts["refreshed"] = len(docs)
+    return counts
+
+
+def run(sb, api_key: str, args: argparse.Namespace) -> None:
+    lead = timedelta(minutes=args.lead_minutes)
+    max_sleep = args.replan_minutes * 60
+    while True:
+        now = datetime.now(timezone.utc)
+        rows = top_places(sb, args.top, now)
+        due = [r for r in rows if expires_at(r) - lead <= now]
+        if due:
+            counts = refresh(sb, api_key, due, args.concurrency, args.dry_run)
+            logger.info(
+                f"Top {len(rows)}: refreshed {counts['refreshed']} due within "
+                f"{args.lead_minutes} min ({counts['not_found']} not found, {counts['errors']} errors)"
+            )
+        else:
+            logger.debug(f"Top {len(rows)}: nothing due.")
+        if args.once or args.dry_run:   # nothing was written, so the same rows would be due again
+            return
+
+        upcoming = [expires_at(r) - lead for r in rows if r not in due]
+        next_due = min(upcoming, default=now + timedelta(seconds=max_sleep))
+        time.sleep(min(max((next_due - datetime.now(timezone.utc)).total_seconds(), 1.0), max_sleep))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh the most-viewed places before their detail cache expires.")
+    parser.add_argument("--top", type=int, default=200, help="Places to keep warm. Default: 200.")
+    parser.add_argument("--lead-minutes", type=float, default=10,
+                        help="Refresh this long before the TTL expires. Default: 10.")
+    parser.add_argument("--replan-minutes", type=float, default=5,
+                        help="Reload the top list at least this often. Default: 5.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent Details requests. Default: 8.")
+    parser.add_argument("--once", action="store_true", help="Run one cycle and exit (e.g. from cron).")
+    parser.add_argument("--dry-run", action="store_true", help="Run one cycle, fetching but writing nothing.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    api_key, sb_url, sb_key = load_env(
+        logger, "GOOGLE_PLACES_API_KEY", "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY"
+    )
+    sb = create_client(sb_url, sb_key)
+    try:
+        run(sb, api_key, args)
+    except KeyboardInterrupt:
+        logger.info("Stopped.")
+
+
+if __name__ == "__main__":
+    main()
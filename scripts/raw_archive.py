@@ -0,0 +1,106 @@
+"""
+raw_archive.py — Compressed NDJSON archive of raw Places API responses.
+
+Every seeder run writes the places each search response returned, as
+received, to data/raw_places/<data_source>/<UTC timestamp>[-run<id>].ndjson.gz
+— one line per response:
+
+    {"data_source": ..., "run_id": 42, "fetched_at": "2026-…Z",
+     "anchor": {"lat": 12.9345, "lng": 77.6069, "radius_m": 3000},
+     "types": ["restaurant"], "query": null, "classified": false,
+     "deduped": false, "places": [{...}, ...]}
+
+`types` (and `query`, for Text Search) record what the request asked for,
+and `classified` whether the seeder typed each place with
+seed_offcampus_v2.classify() (--batch-types) instead of taking types[0] —
+which is all a mapper needs to re-derive the rows. `deduped` marks runs
+that skip places an earlier response of the run returned, so the first
+response wins there (and the last one everywhere else). remap.py streams the
+archive back through the current mappers without calling the API.
+"""
+
+import gzip
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+ARCHIVE_DIR = Path(__file__).resolve().parent.parent / "data" / "raw_places"
+
+
+class RawArchive:
+    """Append-only writer for one seeder run; use as a context manager."""
+
+    def __init__(
+        self,
+        data_source: str,
+        lat: float,
+        lng: float,
+        radius_m: int,
+        run_id: int | None,
+        log: logging.Logger,
+        directory: Path = ARCHIVE_DIR,
+        tag: str | None = None,
+        deduped: bool = False,
+    ) -> None:
+        self.data_source = data_source
+        self.deduped = deduped
+        self.anchor = {"lat": lat, "lng": lng, "radius_m": radius_m}
+        self.run_id = run_id
+        self.log = log
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        suffix = f"-run{run_id}" if run_id is not None else ""
+        suffix += f"-{tag}" if tag else ""   # several writers per run (seed_worker.py)
+        self.path = directory / data_source / f"{stamp}{suffix}.ndjson.gz"
+        self.responses = 0
+        self._fh = None
+
+    def __enter__(self) -> "RawArchive":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = gzip.open(self.path, "at", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if self._fh is not None:
+            self._fh.close()
+        self.log.info(f"Archived {self.responses} raw responses to {self.path}")
+
+    def write(
+        self,
+        types: list[str],
+        places: list[dict],
+        query: str | None = None,
+        anchor: dict | None = None,
+        run_id: int | None = None,
+        classified: bool = False,
+    ) -> None:
+        """Append one response; anchor/run_id override the archive's own."""
+        entry = {
+            "data_source": self.data_source,
+            "run_id": run_id if run_id is not None else self.run_id,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "anchor": anchor or self.anchor,
+            "types": types,
+            "query": query,
+            "classified": classified,
+            "deduped": self.deduped,
+            "places": places,
+        }
+        self._fh.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.responses += 1
+
+
+def archive_files(data_source: str | None = None, directory: Path = ARCHIVE_DIR) -> list[Path]:
+    """Archive files (optionally of one data_source), oldest first."""
+    pattern = f"{data_source}/*.ndjson.gz" if data_source else "*/*.ndjson.gz"
+    return sorted(directory.glob(pattern), key=lambda p: p.name)
+
+
+def iter_lines(paths: list[Path]) -> Iterator[str]:
+    """Raw NDJSON lines of the given archive files, in order."""
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield line
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+refresh_existing.py — Refresh known places by ID instead of re-searching.
+
+Re-running searchNearby to update ratings and hours mostly returns the same
+top-20 places per type and never reaches the ones ranked lower. This mode
+pages through the google_place_ids already in `places` and fetches each
+one through Place Details, concurrently, with a minimal field mask
+(REFRESH_FIELD_MASK).
+
+Per page of rows:
+  - Obsolete IDs: when Details answers with a different `id`, the row's
+    google_place_id is migrated to it (unless that ID already exists —
+    those are logged and left for dedupe). 404s are counted and left to
+    sweep_places.py.
+  - Only changed fields are written: each row's doc carries the columns
+    whose value differs (plus hash bookkeeping), and the page is written
+    in one column-policy merge. Unchanged rows only get last_fetched_at,
+    which tells sweep_places.py they are alive and leaves updated_at alone.
+
+The seeders expose this as --refresh-existing (scoped to their own
+data_source); it can also be run directly.
+
+Usage:
+    python scripts/refresh_existing.py
+    python scripts/refresh_existing.py --data-source google_places_seed_v2 --concurrency 16
+    python scripts/seed_offcampus_v2.py --refresh-existing
+"""
+
+import argparse
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests  # pyre-ignore[21]
+from supabase import create_client  # pyre-ignore[21]
+
+from place_record import merge_rows
+from places_client import (
+    REFRESH_FIELD_MASK,
+    PlaceNotFound,
+    fetch_place_details,
+    refresh_signals,
+    signals_hash,
+)
+from seed_common import PAGE_SIZE, iter_places, load_env, setup_logging
+
+logger = logging.getLogger("refresh_existing")
+
+DEFAULT_CONCURRENCY = 8
+ROW_COLUMNS = (
+    "id, google_place_id, name, rating, rating_count, business_status, "
+    "opening_hours_mask, content_hash, refresh_count, change_count, archived_at, data_source"
+)
+
+# Columns refresh_signals() produces
+SIGNAL_COLUMNS = {"rating", "rating_count", "business_status", "opening_hours_mask"}
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def _same(column: str, old: object, new: object) -> bool:
+    if column == "rating" and old is not None and new is not None:
+        return round(float(old), 1) == round(float(new), 1)
+    return old == new
+
+
+def changed_doc(row: dict, details: dict, google_place_id: str) -> dict | None:
+    """Partial merge doc with only the columns that changed, or None."""
+    signals = refresh_signals(details)
+    digest = signals_hash(signals)
+    if digest == row.get("content_hash"):
+        return None
+    changes = {c: v for c, v in signals.items() if not _same(c, row.get(c), v)}
+    return {
+        "google_place_id": google_place_id,
+        **changes,
+        "content_hash": digest,
+        "refresh_count": (row.get("refresh_count") or 0) + 1,
+        "change_count": (row.get("change_count") or 0) + (1 if changes and row.get("content_hash") else 0),
+        "last_fetched_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def migrate_id(sb, row: dict, new_id: str, dry_run: bool, log: logging.Logger) -> bool:
+    """Point a row at Google's current ID. Returns False if that ID is already taken."""
+    taken = sb.table("places").select("id").eq("google_place_id", new_id).execute()
+    if taken.data:
+        log.warning(
+            f"Obsolete ID {row['google_place_id']} ('{row['name']}') now resolves to "
+            f"{new_id}, which another row already has — left for dedupe."
+        )
+        return False
+    log.info(f"Migrating '{row['name']}': {row['google_place_id']} → {new_id}")
+    if not dry_run:
+        sb.table("places").update({"google_place_id": new_id}).eq("id", row["id"]).execute()
+    return True
+
+
+def refresh_existing(
+    sb,
+    api_key: str,
+    log: logging.Logger,
+    data_source: str | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """Refresh every live place (optionally of one data_source). Returns counters."""
+    counts = {"fetched": 0, "changed": 0, "unchanged": 0, "migrated": 0,
+              "not_found": 0, "errors": 0, "written": 0}
+    filters = {"data_source": data_source} if data_source else {}
+
+    def fetch(row: dict) -> tuple[dict, dict | None, bool]:
+        try:
+            details = fetch_place_details(
+                api_key, row["google_place_id"], REFRESH_FIELD_MASK, log, _session()
+            )
+            return row, details, False
+        except PlaceNotFound:
+            return row, None, True
+
+    page: list[dict] = []
+    rows = (r for r in iter_places(sb, ROW_COLUMNS, **filters)
+            if r.get("google_place_id") and not r.get("archived_at")
+            and r.get("data_source") != "manual_skeleton")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        def process(batch: list[dict]) -> None:
+            docs: list[dict] = []
+            for row, details, not_found in pool.map(fetch, batch):
+                if not_found:
+                    counts["not_found"] += 1
+                    log.debug(f"Not found: '{row['name']}' ({row['google_place_id']})")
+                    continue
+                if details is None:
+                    counts["errors"] += 1
+                    continue
+                counts["fetched"] += 1
+                gid = row["google_place_id"]
+                new_id = details.get("id")
+                if new_id and new_id != gid:
+                    if not migrate_id(sb, row, new_id, dry_run, log):
+                        continue
+                    counts["migrated"] += 1
+                    gid = new_id
+                doc = changed_doc(row, details, gid)
+                changes = sorted(doc.keys() & SIGNAL_COLUMNS) if doc else []
+                counts["changed" if changes else "unchanged"] += 1
+                if changes:
+                    log.debug(f"Changed '{row['name']}': {changes}")
+                if doc is not None:   # a row's first refresh also records its hash
+                    docs.append(doc)
+                else:
+                    docs.append({"google_place_id": gid,
+                                 "last_fetched_at": datetime.now(timezone.utc).isoformat()})
+            if docs and not dry_run:
+                inserted, updated, _, failed = merge_rows(sb, docs, log)
+                counts["written"] += updated
+                counts["errors"] += failed
+            log.info(
+                f"Refreshed {counts['fetched']} so far: {counts['changed']} changed, "
+                f"{counts['migrated']} IDs migrated, {counts['not_found']} not found"
+            )
+
+        for row in rows:
+            page.append(row)
+            if len(page) >= PAGE_SIZE:
+                process(page)
+                page = []
+        if page:
+            process(page)
+
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh known places through Place Details by ID.")
+    parser.add_argument("--data-source", type=str, default=None,
+                        help="Only refresh rows from this data_source. Default: all.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Concurrent Details requests. Default: {DEFAULT_CONCURRENCY}.")
+    parser.add_argument("--dry-run", action="store_true", help="Fetch and diff, but write nothing.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    api_key, sb_url, sb_key = load_env(
+        logger, "GOOGLE_PLACES_API_KEY", "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY"
+    )
+    sb = create_client(sb_url, sb_key)
+    counts = refresh_existing(sb, api_key, logger, args.data_source, args.concurrency, args.dry_run)
+    logger.info("Done: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
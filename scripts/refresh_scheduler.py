@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+refresh_scheduler.py — Freshness-priority refresh daemon for UniEasy places.
+
+Instead of re-sweeping every place on a cron, this long-running job spends a
+fixed Place Details budget per hour on the places that most need it:
+
+    priority = staleness × popularity × volatility
+
+    staleness   hours since last_fetched_at
+    popularity  1 + ln(1 + rating_count) + 2·ln(1 + views)   (place_views)
+    volatility  (change_count + 1) / (refresh_count + 2)     (how often a
+                refresh actually changed the signals' content hash)
+
+A trending café with shifting hours climbs the queue; a long-stable ATM
+sinks. Calls are paced evenly (3600 / --budget-per-hour seconds apart) and
+each refresh is a minimal-field Details call by place ID. Results are
+written back in small batches through the column-policy merge
+(merge_places_batch), so admin-owned fields are never touched.
+
+Priorities drift with time (staleness grows at different rates per place),
+so the queue is re-planned from the database every --replan-minutes.
+
+Usage:
+    python scripts/refresh_scheduler.py --budget-per-hour 300
+    python scripts/refresh_scheduler.py --dry-run --top 25
+    python scripts/refresh_scheduler.py --budget-per-hour 600 --max-calls 100
+"""
+
+import argparse
+import heapq
+import logging
+import math
+import time
+from datetime import datetime, timezone
+
+import requests  # pyre-ignore[21]
+from supabase import create_client  # pyre-ignore[21]
+
+from place_record import merge_rows
+from places_client import (
+    REFRESH_FIELD_MASK,
+    PlaceNotFound,
+    fetch_place_details,
+    refresh_signals,
+    signals_hash,
+)
+from seed_common import iter_places, iter_rows, load_env, setup_logging
+
+logger = logging.getLogger("refresh_scheduler")
+
+CANDIDATE_COLUMNS = (
+    "id, google_place_id, name, data_source, last_fetched_at, rating_count, "
+    "content_hash, refresh_count, change_count, archived_at"
+)
+NEVER_FETCHED_HOURS = 24 * 30   # staleness assumed for rows with no last_fetched_at
+FLUSH_EVERY = 20                # refreshed rows per merge call
+
+
+# ─── Priority ────────────────────────────────────────────────────────────────
+
+def staleness_hours(last_fetched_at: str | None, now: datetime) -> float:
+    if not last_fetched_at:
+        return NEVER_FETCHED_HOURS
+    fetched = datetime.fromisoformat(last_fetched_at.replace("Z", "+00:00"))
+    return max((now - fetched).total_seconds() / 3600, 0.0)
+
+
+def priority(row: dict, views: int, now: datetime) -> float:
+    popularity = 1 + math.log1p(row.get("rating_count") or 0) + 2 * math.log1p(views)
+    volatility = (row.get("change_count", 0) + 1) / (row.get("refresh_count", 0) + 2)
+    return staleness_hours(row.get("last_fetched_at"), now) * popularity * volatility
+
+
+def load_candidates(sb) -> tuple[list[dict], dict[str, int]]:
+    """Refreshable places (live, Google-backed) and their view counts."""
+    rows = [
+        r for r in iter_places(sb, CANDIDATE_COLUMNS)
+        if r.get("google_place_id") and not r.get("archived_at")
+        and r.get("data_source") != "manual_skeleton"
+    ]
+    views = {
+        v["place_id"]: v["view_count"]
+        for v in iter_rows(sb, "place_views", "place_id, view_count", ("place_id",))
+    }
+    return rows, views
+
+
+def plan(rows: list[dict], views: dict[str, int]) -> list[tuple[float, str, dict]]:
+    """Max-heap (negated priorities) of candidate rows."""
+    now = datetime.now(timezone.utc)
+    heap = [(-priority(r, views.get(r["id"], 0), now), r["id"], r) for r in rows]
+    heapq.heapify(heap)
+    return heap
+
+
+# ─── Refresh ─────────────────────────────────────────────────────────────────
+
+def refresh_row(row: dict, details: dict) -> dict:
+    """Build the partial merge doc for one refreshed place; updates `row` in place."""
+    signals = refresh_signals(details)
+    digest = signals_hash(signals)
+    changed = digest != row.get("content_hash")
+    row["last_fetched_at"] = datetime.now(timezone.utc).isoformat()
+    row["refresh_count"] = row.get("refresh_count", 0) + 1
+    row["change_count"] = row.get("change_count", 0) + (1 if changed and row.get("content_hash") else 0)
+    row["content_hash"] = digest
+    row["rating_count"] = signals["rating_count"]
+    return {
+        "google_place_id": row["google_place_id"],
+        **signals,
+        "content_hash": digest,
+        "refresh_count": row["refresh_count"],
+        "change_count": row["change_count"],
+        "last_fetched_at": row["last_fetched_at"],
+    }
+
+
+def flush(sb, pending: list[dict]) -> None:
+    if not pending:
+        return
+    inserted, updated, _, failed = merge_rows(sb, pending, logger)
+    logger.info(f"Wrote {updated} refreshed places ({failed} failed).")
+    pending.clear()
+
+
+def run(sb, api_key: str, budget_per_hour: int, replan_minutes: float, max_calls: int | None) -> None:
+    interval = 3600.0 / budget_per_hour
+    session = requests.Session()
+    pending: list[dict] = []
+    calls = refreshed = 0
+    heap: list = []
+    planned_at = -math.inf
+    next_call = time.monotonic()
+
+    try:
+        while max_calls is None or calls < max_calls:
+            if time.monotonic() - planned_at >= replan_minutes * 60 or not heap:
+                flush(sb, pending)
+                rows, views = load_candidates(sb)
+                heap = plan(rows, views)
+                planned_at = time.monotonic()
+                logger.info(f"Planned {len(heap)} candidates; pacing one call every {interval:.1f}s.")
+                if not heap:
+                    time.sleep(replan_minutes * 60)
+                    continue
+
+            neg_priority, _, row = heapq.heappop(heap)
+            time.sleep(max(next_call - time.monotonic(), 0.0))
+            next_call = time.monotonic() + interval
+            calls += 1
+
+            try:
+                details = fetch_place_details(
+                    api_key, row["google_place_id"], REFRESH_FIELD_MASK, logger, session
+                )
+            except PlaceNotFound:
+                logger.warning(f"Not found on Google: '{row['name']}' ({row['google_place_id']})")
+                continue
+            if details is None:
+                continue
+
+            pending.append(refresh_row(row, details))
+            refreshed += 1
+            logger.debug(f"Refreshed '{row['name']}' (priority {-neg_priority:.1f})")
+            if len(pending) >= FLUSH_EVERY:
+                flush(sb, pending)
+    except KeyboardInterrupt:
+        logger.info("Interrupted — flushing pending writes.")
+    finally:
+        flush(sb, pending)
+        logger.info(f"Stopped after {calls} calls ({refreshed} refreshed).")
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh places by freshness priority within an hourly API budget.")
+    parser.add_argument("--budget-per-hour", type=int, default=300,
+                        help="Place Details calls to spend per hour. Default: 300.")
+    parser.add_argument("--replan-minutes", type=float, default=15,
+                        help="Reload candidates and priorities this often. Default: 15.")
+    parser.add_argument("--max-calls", type=int, default=None,
+                        help="Stop after this many API calls (default: run forever).")
+    parser.add_argument("--dry-run", action="store_true", help="Print the top of the queue and exit.")
+    parser.add_argument("--top", type=int, default=20, help="Rows to show with --dry-run. Default: 20.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    if args.budget_per_hour <= 0:
+        parser.error("--budget-per-hour must be positive")
+
+    if args.dry_run:
+        sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+        sb = create_client(sb_url, sb_key)
+        heap = plan(*load_candidates(sb))
+        for _ in range(min(args.top, len(heap))):
+            neg_priority, _, row = heapq.heappop(heap)
+            logger.info(
+                f"{-neg_priority:10.1f}  {row['name'][:40]:40s}  "
+                f"last_fetched={row.get('last_fetched_at') or '-'}  "
+                f"refreshes={row.get('refresh_count', 0)} changes={row.get('change_count', 0)}"
+            )
+        return
+
+    api_key, sb_url, sb_key = load_env(
+        logger, "GOOGLE_PLACES_API_KEY", "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY"
+    )
+    sb = create_client(sb_url, sb_key)
+    run(sb, api_key, args.budget_per_hour, args.replan_minutes, args.max_calls)
+
+
+if __name__ == "__main__":
+    main()
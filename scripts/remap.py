@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+remap.py — Re-derive places rows from the raw-response archive.
+
+Mapping rules (cuisine keywords, price bands, lodging heuristics, …) live in
+the seeders' mappers. After changing them, this job applies them to every
+place without a single API call:
+
+  1. Stream data/raw_places/**.ndjson.gz (see raw_archive.py) through the
+     current mapper of each line's data_source on a process pool.
+  2. Keep one response per google_place_id: from its latest run, and
+     within that run the one the seeder kept — the first (mapped) one
+     for runs that skip repeats (`deduped`), else the last.
+  3. Diff each remapped row against the live row and write only the
+     columns that changed, through the column-policy merge (admin-owned
+     fields of overridden rows are kept).
+
+Columns a seeder sets per run rather than per response (last_fetched_at,
+updated_at, last_seen_run) are never rewritten, nor is primary_photo_url
+when GOOGLE_PLACES_API_KEY is unset (v2 URLs embed the key). A place is
+only remapped by the data_source that owns its row. Places the archive has but `places`
+does not (e.g. previously filtered out) are inserted only with --insert-new.
+
+Usage:
+    python scripts/remap.py --dry-run
+    python scripts/remap.py --data-source google_places_seed_v2 --workers 8
+    python scripts/remap.py --insert-new
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Iterator
+
+from supabase import create_client  # pyre-ignore[21]
+
+import seed_offcampus
+import seed_offcampus_v2
+import seed_study_spots
+from place_record import PlaceRecord, load_places_schema, merge_rows, validated_rows
+from raw_archive import archive_files, iter_lines
+from seed_common import iter_places, load_env, setup_logging
+
+logger = logging.getLogger("remap")
+
+LINES_PER_TASK = 100
+RUN_COLUMNS = {"last_fetched_at", "updated_at", "last_seen_run"}
+# Embeds the API key (v2 photo URLs); left as stored when no key is set
+KEYED_COLUMNS = {"primary_photo_url"}
+
+Rank = tuple[tuple, str, bool]     # (run order, fetched_at, deduped) of a response
+
+
+# ─── Mapping (runs in worker processes) ─────────────────────────────────────
+
+def map_place(entry: dict, place: dict, api_key: str) -> PlaceRecord | None:
+    """Map one archived place with the current mapper of its data_source."""
+    source, types = entry["data_source"], entry["types"]
+    if source == seed_offcampus.DATA_SOURCE:
+        return seed_offcampus.map_place_to_record(
+            place, types[0], name_filter=entry.get("query") is None
+        )
+    if source == seed_offcampus_v2.DATA_SOURCE:
+        # Lines archived before `classified` was recorded: only multi-type batches were
+        classified = entry.get("classified", len(types) > 1)
+        gtype = seed_offcampus_v2.classify(place, types) if classified else types[0]
+        return seed_offcampus_v2.map_record(place, gtype, api_key)
+    if source == seed_study_spots.DATA_SOURCE:
+        return seed_study_spots.map_record(place, types[0])
+    return None
+
+
+def entry_rank(entry: dict) -> Rank:
+    """(run order, fetched_at, deduped) of an archived response; see pick()."""
+    run_id = entry.get("run_id")
+    # Responses without a run (seed_runs unavailable) each count as their own, older run
+    run = (1, run_id) if run_id is not None else (0, entry["fetched_at"])
+    # Lines archived before `deduped` was recorded: study spots and v1 text search deduped
+    deduped = entry.get("deduped", entry["data_source"] == seed_study_spots.DATA_SOURCE
+                        or entry.get("query") is not None)
+    return run, entry["fetched_at"], deduped
+
+
+def pick(new: tuple[Rank, PlaceRecord | None], old: tuple[Rank, PlaceRecord | None]) -> bool:
+    """Whether `new` replaces `old` as the response the seeder's write came from."""
+    (new_run, new_at, deduped), new_rec = new
+    (old_run, old_at, _), old_rec = old
+    if new_run != old_run:
+        return new_run > old_run
+    if deduped:
+        # The first response that mapped to a record; later repeats were skipped
+        return (new_rec is None, new_at) < (old_rec is None, old_at)
+    return new_at >= old_at
+
+
+def map_lines(lines: list[str], api_key: str) -> list[tuple[str, Rank, PlaceRecord | None]]:
+    """(google_place_id, rank, record or None if now filtered) per archived place."""
+    out = []
+    for line in lines:
+        entry = json.loads(line)
+        rank = entry_rank(entry)
+        for place in entry["places"]:
+            if place.get("id"):
+                out.append((place["id"], rank, map_place(entry, place, api_key)))
+    return out
+
+
+def chunked(lines: Iterator[str], n: int) -> Iterator[list[str]]:
+    while chunk := list(islice(lines, n)):
+        yield chunk
+
+
+# ─── Diff ────────────────────────────────────────────────────────────────────
+
+def _same(new: object, old: object) -> bool:
+    if isinstance(new, (int, float)) and not isinstance(new, bool) and old is not None:
+        try:
+            return math.isclose(float(new), float(old), abs_tol=1e-6)
+        except (TypeError, ValueError):
+            return False
+    return new == old
+
+
+def changed_doc(row: dict, current: dict, skip: set[str] = RUN_COLUMNS) -> dict | None:
+    """Partial merge doc with the columns whose remapped value differs, or None."""
+    changes = {
+        c: v for c, v in row.items()
+        if c not in skip and c != "google_place_id" and not _same(v, current.get(c))
+    }
+    return {"google_place_id": row["google_place_id"], **changes} if changes else None
+
+
+# ─── Job ─────────────────────────────────────────────────────────────────────
+
+def remap(
+    sb,
+    schema,
+    api_key: str,
+    data_source: str | None,
+    workers: int | None,
+    insert_new: bool,
+    dry_run: bool,
+) -> dict[str, int]:
+    paths = archive_files(data_source)
+    logger.info(f"Remapping {len(paths)} archive files with {workers or os.cpu_count()} workers")
+
+    latest: dict[str, tuple[Rank, PlaceRecord | None]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tasks = chunked(iter_lines(paths), LINES_PER_TASK)
+        for mapped in pool.map(partial(map_lines, api_key=api_key), tasks):
+            for gid, rank, record in mapped:
+                if gid not in latest or pick((rank, record), latest[gid]):
+                    latest[gid] = (rank, record)
+
+    skip = RUN_COLUMNS if api_key else RUN_COLUMNS | KEYED_COLUMNS
+    records = [rec for _, rec in latest.values() if rec is not None]
+    rows = validated_rows(records, schema, logger)
+    counts = {"archived": len(latest), "mapped": len(records),
+              "invalid": len(records) - len(rows), "changed": 0, "unchanged": 0,
+              "new": 0, "other_source": 0, "written": 0, "errors": 0}
+
+    # Every row, not just this data_source's: a place may be owned by another seeder
+    current = {r["google_place_id"]: r for r in iter_places(sb, "*") if r.get("google_place_id")}
+
+    docs: list[dict] = []
+    for row in rows:
+        gid = row["google_place_id"]
+        existing = current.get(gid)
+        if existing is None:
+            counts["new"] += 1
+            if insert_new:
+                docs.append({c: v for c, v in row.items()
+                             if c not in ("updated_at", "last_seen_run") and (api_key or c not in KEYED_COLUMNS)})
+            continue
+        if existing.get("data_source") != row.get("data_source"):
+            counts["other_source"] += 1
+            continue
+        doc = changed_doc(row, existing, skip)
+        counts["changed" if doc else "unchanged"] += 1
+        if doc:
+            logger.debug(f"Changed '{existing.get('name')}': {sorted(set(doc) - {'google_place_id'})}")
+            docs.append(doc)
+
+    if docs and not dry_run:
+        inserted, updated, _, failed = merge_rows(sb, docs, logger)
+        counts["written"] = inserted + updated
+        counts["errors"] = failed
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-derive places from archived raw API responses.")
+    parser.add_argument("--data-source", type=str, default=None,
+                        help="Only remap this seeder's archive and rows. Default: all.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Mapper processes. Default: CPU count.")
+    parser.add_argument("--insert-new", action="store_true",
+                        help="Also insert archived places that have no row yet.")
+    parser.add_argument("--dry-run", action="store_true", help="Diff and report, write nothing.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    # Only used to rebuild v2 photo URLs; no API calls are made
+    api_key = os.getenv("GOOGLE_PLACES_API_KEY", "")
+    if not api_key:
+        logger.warning("GOOGLE_PLACES_API_KEY not set — photo URLs are left as stored.")
+    sb = create_client(sb_url, sb_key)
+    schema = load_places_schema(sb_url, sb_key)
+
+    counts = remap(sb, schema, api_key, args.data_source, args.workers, args.insert_new, args.dry_run)
+    logger.info("Done: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+    if args.dry_run:
+        logger.info("DRY RUN — no rows written.")
+
+
+if __name__ == "__main__":
+    main()
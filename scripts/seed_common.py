@@ -0,0 +1,123 @@
+"""
+seed_common.py — Shared plumbing for UniEasy's post-seed batch scripts.
+
+The seeders keep their own copies of these helpers; new batch jobs import
+them from here instead of duplicating them again.
+"""
+
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Iterator
+
+from dotenv import load_dotenv  # pyre-ignore[21]
+from supabase import Client  # pyre-ignore[21]
+
+CAMPUS_LAT = 12.9345
+CAMPUS_LNG = 77.6069
+
+PAGE_SIZE = 1000     # PostgREST default max-rows
+WRITE_CHUNK = 500
+
+# NOT NULL columns without defaults. Bulk updates go through an upsert keyed
+# on id, and Postgres checks these before it resolves the conflict.
+PLACE_KEY_COLUMNS = ("id", "name", "category", "type", "lat", "lng")
+
+
+def setup_logging(logger: logging.Logger, verbose: bool) -> None:
+    level = logging.DEBUG if verbose else logging.INFO
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setLevel(level)
+    fmt = logging.Formatter(
+        "%(asctime)s [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+    )
+    handler.setFormatter(fmt)
+    logger.setLevel(level)
+    logger.addHandler(handler)
+
+
+def load_env(logger: logging.Logger, *names: str) -> list[str]:
+    """
+    Load server/.env.local (or .env.local) and return the requested env vars
+    in order. Exits with status 1 if any are missing.
+    """
+    project_root = Path(__file__).resolve().parent.parent
+    for env_path in (project_root / "server" / ".env.local", project_root / ".env.local"):
+        if env_path.exists():
+            load_dotenv(env_path)
+            logger.debug(f"Loaded env from: {env_path}")
+            break
+
+    values = [os.getenv(n) for n in names]
+    missing = [n for n, v in zip(names, values) if not v]
+    if missing:
+        logger.error(f"Missing required environment variables: {', '.join(missing)}")
+        logger.error("Set them in server/.env.local or as environment variables.")
+        sys.exit(1)
+    return [v for v in values if v]
+
+
+def iter_rows(
+    sb: Client,
+    table: str,
+    columns: str,
+    order: tuple[str, ...] = ("id",),
+    page_size: int = PAGE_SIZE,
+    **eq_filters: object,
+) -> Iterator[dict]:
+    """Stream rows from a table in a stable order, one page per request."""
+    offset = 0
+    while True:
+        query = sb.table(table).select(columns)
+        for col, value in eq_filters.items():
+            query = query.eq(col, value)
+        for col in order:
+            query = query.order(col)
+        page = query.range(offset, offset + page_size - 1).execute()
+        rows = page.data or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+
+def iter_places(
+    sb: Client,
+    columns: str,
+    page_size: int = PAGE_SIZE,
+    **eq_filters: object,
+) -> Iterator[dict]:
+    """Stream rows from `places` in id order, one page per request."""
+    return iter_rows(sb, "places", columns, ("id",), page_size, **eq_filters)
+
+
+def upsert_rows(
+    sb: Client,
+    table: str,
+    rows: list[dict],
+    on_conflict: str,
+    chunk: int = WRITE_CHUNK,
+) -> int:
+    """Upsert rows in chunks. Returns the number of rows written."""
+    written = 0
+    for i in range(0, len(rows), chunk):
+        part = rows[i:i + chunk]
+        result = sb.table(table).upsert(part, on_conflict=on_conflict).execute()
+        written += len(result.data or [])
+    return written
+
+
+def update_places(sb: Client, rows: list[dict], chunk: int = WRITE_CHUNK) -> int:
+    """
+    Bulk-update existing places by id. Each row must carry PLACE_KEY_COLUMNS
+    plus the columns being changed. Returns the number of rows written.
+    """
+    return upsert_rows(sb, "places", rows, "id", chunk)
+
+
+def parse_anchor(spec: str) -> tuple[str, float, float, int]:
+    """'name=lat,lng,radius' → (name, lat, lng, radius_m)."""
+    name, _, coords = spec.partition("=")
+    lat, lng, radius = coords.split(",")
+    return name, float(lat), float(lng), int(radius)
@@ -6,8 +6,8 @@ Fetches places from Google Places API (Nearby Search) and upserts them into
 the Supabase `places` table. Designed to be idempotent and safe to re-run.
 
 Phase 8 enhancements:
-  - Realistic price_inr with random variation per place
-  - is_veg detection from API fields and name keywords
+  - Deterministic price_inr / display_price_label / is_veg (food_signals.py
+    for food places; the price_level band midpoint for the rest)
   - cuisine_tags mapped from Google place types
   - amenities built from API boolean fields
   - distance_from_campus via haversine calculation
@@ -18,6 +18,8 @@ Usage:
     python scripts/seed_offcampus.py --dry-run --verbose
     python scripts/seed_offcampus.py --categories restaurant,cafe,gym --radius 2500
     python scripts/seed_offcampus.py --location "12.9345,77.6069" --radius 2000
+    python scripts/seed_offcampus.py --radius 5000 --bulk-load
+    python scripts/seed_offcampus.py --text-search --categories lodging,store
 """
 
 import argparse
@@ -29,13 +31,24 @@ import random
 import sys
 import time
 import uuid
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterator
 
 import requests  # pyre-ignore[21]
 from dotenv import load_dotenv  # pyre-ignore[21]
 from supabase import create_client, Client  # pyre-ignore[21]
 
+from bulk_load import StagingLoader
+from food_signals import food_signals
+from geocell import cell_columns
+from place_record import PlaceRecord, PlacesSchema, load_places_schema, merge_rows, validated_rows
+from raw_archive import RawArchive
+from refresh_existing import refresh_existing
+from seed_runs import finish_run, start_run
+from weekly_hours import opening_hours_mask
+
 # ─── Constants ────────────────────────────────────────────────────────────────
 
 CAMPUS_LAT = 12.9345
@@ -49,6 +62,9 @@ DATA_SOURCE = "google_places_seed"
 GOOGLE_NEARBY_SEARCH_URL = (
     "https://places.googleapis.com/v1/places:searchNearby"
 )
+GOOGLE_TEXT_SEARCH_URL = (
+    "https://places.googleapis.com/v1/places:searchText"
+)
 
 # Fields to request from the API
 FIELD_MASK = ",".join([
@@ -61,6 +77,7 @@ FIELD_MASK = ",".join([
     "places.priceLevel",
     "places.businessStatus",
     "places.currentOpeningHours",
+    "places.regularOpeningHours",
     "places.photos",
     "places.types",
     "places.dineIn",
@@ -75,6 +92,11 @@ FIELD_MASK = ",".join([
     "places.wheelchairAccessibleEntrance",
 ])
 
+# searchText pages its results; the token is a top-level response field
+TEXT_SEARCH_FIELD_MASK = FIELD_MASK + ",nextPageToken"
+TEXT_SEARCH_PAGE_SIZE = 20
+TEXT_SEARCH_MAX_PAGES = 3   # Google stops paging at 60 results per query
+
 # Google place type → (category, sub-type) mapping
 GOOGLE_TYPE_MAP = {
     # Food
@@ -102,6 +124,32 @@ GOOGLE_TYPE_MAP = {
     "grocery_or_supermarket": ("essentials", "grocery"),
 }
 
+# ── Text Search queries per Google type (--text-search) ─────────────────────
+# Targeted queries replace the broad searchNearby type for categories where
+# the type alone is too coarse (e.g. `store`, filtered by name in nearby
+# mode). Results are mapped as the keyed type. Types without queries are
+# skipped in text-search mode.
+TEXT_SEARCH_QUERIES: dict[str, list[str]] = {
+    "lodging": [
+        "PG near Christ University",
+        "paying guest near Christ University",
+        "hostel near Christ University",
+        "co-living near Christ University",
+    ],
+    "store": [
+        "xerox shop",
+        "printing shop",
+        "stationery shop",
+        "courier service",
+    ],
+    "laundry": ["laundry", "dry cleaners"],
+    "library": ["library", "reading room"],
+    "gym": ["gym", "fitness centre"],
+    "cafe": ["cafe", "coffee shop"],
+    "bakery": ["bakery"],
+    "restaurant": ["mess", "tiffin centre", "restaurant"],
+}
+
 # ── Cuisine tag mapping from Google types ────────────────────────────────────
 CUISINE_MAP = {
     "indian_restaurant": "Indian",
@@ -146,13 +194,6 @@ PRICE_LABELS = {
     4: "₹1500+",
 }
 
-# ── Non-veg detection keywords ───────────────────────────────────────────────
-NONVEG_KEYWORDS = {
-    "chicken", "mutton", "fish", "egg", "non-veg", "nonveg", "meat",
-    "beef", "pork", "lamb", "prawn", "shrimp", "crab", "kebab", "biryani",
-    "tandoori chicken", "butter chicken", "grilled",
-}
-
 # Keywords for filtering "store" type to relevant sub-types only
 STORE_FILTER_KEYWORDS = {"print", "xerox", "stationery", "courier", "copy", "stationary"}
 
@@ -245,11 +286,11 @@ def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
 
 
 def price_from_level(level: int | None) -> int | None:
-    """Generate a realistic INR price from a Google price_level with random variation."""
+    """INR price for a Google price_level: the midpoint of its PRICE_RANGES band."""
     if level is None:
         return None
     lo, hi = PRICE_RANGES.get(level, (100, 300))
-    return random.randint(lo, hi)
+    return (lo + hi) // 2
 
 
 def make_price_label(level: int | None) -> str | None:
@@ -259,35 +300,6 @@ def make_price_label(level: int | None) -> str | None:
     return PRICE_LABELS.get(level, "₹200–₹500")
 
 
-def detect_is_veg(place: dict, name: str) -> bool | None:
-    """
-    Infer is_veg from API fields and name keywords.
-    Returns True (veg), False (non-veg), or None (unknown).
-    """
-    serves_veg = place.get("servesVegetarianFood")
-    serves_beer = place.get("servesBeer")
-    serves_wine = place.get("servesWine")
-
-    name_lower = name.lower()
-
-    # Check name for non-veg keywords
-    has_nonveg_keyword = any(kw in name_lower for kw in NONVEG_KEYWORDS)
-
-    if has_nonveg_keyword:
-        return False
-
-    # If serves beer/wine, likely non-veg
-    if serves_beer or serves_wine:
-        return False
-
-    # If explicitly serves vegetarian food and no non-veg signals
-    if serves_veg is True:
-        return True
-
-    # Unknown
-    return None
-
-
 def extract_cuisine_tags(place: dict) -> list[str]:
     """Extract cuisine tags from Google place types."""
     google_types = place.get("types", [])
@@ -343,7 +355,12 @@ def get_timing_summary(opening_hours: dict | None) -> str | None:
 
 # ─── Google Places API (New) ─────────────────────────────────────────────────
 
-def fetch_with_backoff(api_key: str, body: dict) -> dict | None:
+def fetch_with_backoff(
+    api_key: str,
+    body: dict,
+    url: str = GOOGLE_NEARBY_SEARCH_URL,
+    field_mask: str = FIELD_MASK,
+) -> dict | None:
     """
     Make a Google Places API (New) POST request with exponential backoff + jitter.
     Returns parsed JSON or None on unrecoverable error.
@@ -351,14 +368,14 @@ def fetch_with_backoff(api_key: str, body: dict) -> dict | None:
     headers = {
         "Content-Type": "application/json",
         "X-Goog-Api-Key": api_key,
-        "X-Goog-FieldMask": FIELD_MASK,
+        "X-Goog-FieldMask": field_mask,
     }
     wait = INITIAL_WAIT
 
     for attempt in range(1, MAX_RETRIES + 1):
         try:
             resp = requests.post(
-                GOOGLE_NEARBY_SEARCH_URL,
+                url,
                 headers=headers,
                 json=body,
                 timeout=30,
@@ -406,10 +423,10 @@ def fetch_with_backoff(api_key: str, body: dict) -> dict | None:
 
 def fetch_nearby_places(
     api_key: str, place_type: str, lat: float, lng: float, radius: int
-) -> list[dict]:
+) -> list[dict] | None:
     """
     Fetch nearby places using Google Places API (New) — searchNearby.
-    Max 20 results per call (no pagination token).
+    Max 20 results per call (no pagination token). None if the request failed.
     """
     body = {
         "includedTypes": [place_type],
@@ -429,13 +446,50 @@ def fetch_nearby_places(
     data = fetch_with_backoff(api_key, body)
 
     if data is None:
-        return []
+        return None
 
     results = data.get("places", [])
     logger.debug(f"Got {len(results)} results for {place_type}")
     return results
 
 
+def fetch_text_search_pages(
+    api_key: str, query: str, lat: float, lng: float, radius: int
+) -> Iterator[list[dict] | None]:
+    """
+    Stream result pages for one query using Google Places API (New) — searchText.
+    Follows nextPageToken for up to TEXT_SEARCH_MAX_PAGES pages of 20; a
+    failed request yields None and ends the stream.
+    The circle is only a location bias (searchText cannot restrict to a
+    circle), so callers must drop results outside the radius themselves.
+    """
+    body: dict = {
+        "textQuery": query,
+        "pageSize": TEXT_SEARCH_PAGE_SIZE,
+        "locationBias": {
+            "circle": {
+                "center": {
+                    "latitude": lat,
+                    "longitude": lng,
+                },
+                "radius": float(radius),
+            }
+        },
+    }
+
+    for page in range(1, TEXT_SEARCH_MAX_PAGES + 1):
+        logger.debug(f"Text search '{query}' page {page}...")
+        data = fetch_with_backoff(api_key, body, GOOGLE_TEXT_SEARCH_URL, TEXT_SEARCH_FIELD_MASK)
+        if data is None:
+            yield None
+            return
+        yield data.get("places", [])
+        token = data.get("nextPageToken")
+        if not token:
+            return
+        body["pageToken"] = token
+
+
 # ─── Data mapping ─────────────────────────────────────────────────────────────
 
 def infer_lodging_subtype(name: str) -> str:
@@ -459,10 +513,13 @@ def should_include_store(name: str) -> bool:
     return any(kw in name_lower for kw in STORE_FILTER_KEYWORDS)
 
 
-def map_place_to_record(place: dict, google_type: str) -> dict | None:
+def map_place_to_record(
+    place: dict, google_type: str, name_filter: bool = True
+) -> PlaceRecord | None:
     """
     Map a Google Places API (New) result to a places table record.
-    Returns None if the place should be skipped.
+    Returns None if the place should be skipped. Pass name_filter=False for
+    results of a targeted text query, which need no name-based filtering.
     """
     category, sub_type = GOOGLE_TYPE_MAP[google_type]
 
@@ -471,7 +528,7 @@ def map_place_to_record(place: dict, google_type: str) -> dict | None:
     name = display_name_obj.get("text", "Unknown") if isinstance(display_name_obj, dict) else "Unknown"
 
     # Special filtering for stores
-    if google_type == "store":
+    if google_type == "store" and name_filter:
         if not should_include_store(name):
             return None
 
@@ -521,16 +578,20 @@ def map_place_to_record(place: dict, google_type: str) -> dict | None:
 
     # ── Phase 8: Rich field extraction ────────────────────────────────────────
 
-    # Price in INR with random variation
-    price_inr = price_from_level(price_level)
-    display_price_label = make_price_label(price_level)
-
-    # Veg/non-veg detection
-    is_veg = detect_is_veg(place, name) if category == "food" else None
-
     # Cuisine tags (food category only)
     cuisine_tags = extract_cuisine_tags(place) if category == "food" else []
 
+    # Price / veg signals: the shared derived-signals stage for food (is_veg
+    # left out when inconclusive); the price_level band for everything else
+    if category == "food":
+        signals = food_signals(name, sub_type, cuisine_tags, price_level, place)
+    else:
+        signals = {
+            "price_inr": price_from_level(price_level),
+            "display_price_label": make_price_label(price_level),
+            "is_veg": None,
+        }
+
     # Amenities from API boolean fields
     amenities = build_amenities(place)
 
@@ -557,131 +618,108 @@ def map_place_to_record(place: dict, google_type: str) -> dict | None:
 
     now_utc = datetime.now(timezone.utc).isoformat()
 
-    return {
-        "name": name,
-        "google_place_id": google_place_id,
-        "category": category,
-        "type": sub_type,
-        "sub_type": sub_type,
-        "address": place.get("formattedAddress"),
-        "city": DEFAULT_CITY,
-        "lat": lat,
-        "lng": lng,
-        "phone": None,
-        "website": None,
-        "is_on_campus": False,
-        "is_static": True,
-        "is_manual_override": False,
-        "data_source": DATA_SOURCE,
-        "last_fetched_at": now_utc,
-        "rating": place.get("rating"),
-        "rating_count": place.get("userRatingCount"),
-        "price_level": price_level,
-        "price_inr": price_inr,
-        "display_price_label": display_price_label,
-        "is_veg": is_veg,
-        "cuisine_tags": cuisine_tags,
-        "amenities": amenities,
-        "distance_from_campus": distance_from_campus,
-        "timing": timing,
-        "photo_refs": photo_refs,
-        "extra": extra,
-        "updated_at": now_utc,
-    }
+    return PlaceRecord(
+        name=name,
+        google_place_id=google_place_id,
+        category=category,
+        type=sub_type,
+        sub_type=sub_type,
+        address=place.get("formattedAddress"),
+        city=DEFAULT_CITY,
+        lat=lat,
+        lng=lng,
+        **cell_columns(lat, lng),
+        phone=None,
+        website=None,
+        is_on_campus=False,
+        is_static=True,
+        is_manual_override=False,
+        data_source=DATA_SOURCE,
+        last_fetched_at=now_utc,
+        rating=place.get("rating"),
+        rating_count=place.get("userRatingCount"),
+        business_status=place.get("businessStatus"),
+        price_level=price_level,
+        **signals,
+        cuisine_tags=cuisine_tags,
+        amenities=amenities,
+        distance_from_campus=distance_from_campus,
+        timing=timing,
+        opening_hours_mask=opening_hours_mask(place),
+        photo_refs=photo_refs,
+        extra=extra,
+        updated_at=now_utc,
+    )
 
 
 # ─── Supabase operations ─────────────────────────────────────────────────────
 
-def check_manual_override(supabase: Client, google_place_id: str) -> bool:
-    """Check if a record exists with is_on_campus=true AND is_manual_override=true."""
+def preview_place(supabase: Client, record: PlaceRecord) -> str:
+    """
+    Dry run: print the record as JSON with the action a merge would take.
+    Returns 'inserted', 'updated' or 'protected'.
+    """
+    google_place_id: str = str(record.get("google_place_id", ""))
     try:
-        result = (
+        existing = (
             supabase.table("places")
-            .select("id, name, is_on_campus, is_manual_override")
+            .select("id, is_manual_override")
             .eq("google_place_id", google_place_id)
-            .eq("is_on_campus", True)
-            .eq("is_manual_override", True)
             .execute()
         )
-        return len(result.data) > 0
-    except Exception as e:
-        logger.warning(f"Error checking manual override for {google_place_id}: {e}")
-        return False
-
-
-def upsert_place(supabase: Client, record: dict, dry_run: bool) -> str:
-    """
-    Upsert a single place record. Returns 'inserted', 'updated', 'skipped', or 'error'.
-    """
-    google_place_id: str = str(record.get("google_place_id", ""))
-
-    if check_manual_override(supabase, google_place_id):
-        logger.warning(
-            f"SKIP (manual_override): '{record['name']}' ({google_place_id}) — "
-            "is_on_campus=true AND is_manual_override=true."
-        )
-        return "skipped"
-
-    if dry_run:
-        try:
-            existing = (
-                supabase.table("places")
-                .select("id")
-                .eq("google_place_id", google_place_id)
-                .execute()
-            )
-            action = "update" if existing.data else "insert"
-        except Exception:
+        if not existing.data:
             action = "insert"
-
-        print(
-            json.dumps(
-                {
-                    "google_place_id": google_place_id,
-                    "name": record["name"],
-                    "category": record["category"],
-                    "type": record["type"],
-                    "price_inr": record.get("price_inr"),
-                    "is_veg": record.get("is_veg"),
-                    "cuisine_tags": record.get("cuisine_tags"),
-                    "amenities": record.get("amenities"),
-                    "distance_from_campus": record.get("distance_from_campus"),
-                    "timing": record.get("timing"),
-                    "lat": record["lat"],
-                    "lng": record["lng"],
-                    "action": action,
-                },
-                ensure_ascii=False,
-            )
+        elif existing.data[0].get("is_manual_override"):
+            action = "protect"   # admin-owned columns would be kept
+        else:
+            action = "update"
+    except Exception:
+        action = "insert"
+
+    print(
+        json.dumps(
+            {
+                "google_place_id": google_place_id,
+                "name": record["name"],
+                "category": record["category"],
+                "type": record["type"],
+                "price_inr": record.get("price_inr"),
+                "is_veg": record.get("is_veg"),
+                "cuisine_tags": record.get("cuisine_tags"),
+                "amenities": record.get("amenities"),
+                "distance_from_campus": record.get("distance_from_campus"),
+                "timing": record.get("timing"),
+                "lat": record["lat"],
+                "lng": record["lng"],
+                "action": action,
+            },
+            ensure_ascii=False,
         )
-        return action + "d"
+    )
+    return {"insert": "inserted", "update": "updated", "protect": "protected"}[action]
 
-    try:
-        result = (
-            supabase.table("places")
-            .upsert(
-                record,
-                on_conflict="google_place_id",
-            )
-            .execute()
-        )
 
-        if result.data:
-            logger.info(
-                f"UPSERT: '{record['name']}' ({google_place_id}) → "
-                f"{record['category']}/{record['type']} "
-                f"₹{record.get('price_inr', '?')} "
-                f"veg={record.get('is_veg')} "
-                f"dist={record.get('distance_from_campus')}"
-            )
-            return "upserted"
-        else:
-            logger.warning(f"Upsert returned no data for '{record['name']}'")
-            return "error"
+def merge_places(
+    supabase: Client, records: list[PlaceRecord], schema: PlacesSchema | None
+) -> tuple[int, int, int, int]:
+    """
+    Validate and write one batch through the column-policy merge
+    (merge_places_batch, migration 021). Google-owned columns are refreshed;
+    admin-owned columns are kept on rows with is_manual_override=true.
 
-    except Exception as e:
-        logger.error(f"Supabase error for '{record['name']}' ({google_place_id}): {e}")
-        return "error"
+    Returns (inserted, updated, protected, errors).
+    """
+    rows = validated_rows(records, schema, logger)
+    inserted, updated, protected, failed = merge_rows(supabase, rows, logger)
+    for record in records:
+        logger.debug(
+            f"MERGE: '{record['name']}' ({record.get('google_place_id')}) → "
+            f"{record['category']}/{record['type']} "
+            f"₹{record.get('price_inr', '?')} "
+            f"veg={record.get('is_veg')} "
+            f"dist={record.get('distance_from_campus')}"
+        )
+    return inserted, updated, protected, failed + len(records) - len(rows)
 
 
 # ─── Main logic ───────────────────────────────────────────────────────────────
@@ -720,6 +758,12 @@ def run(args: argparse.Namespace) -> None:
     else:
         categories = list(GOOGLE_TYPE_MAP.keys())
 
+    if args.text_search:
+        skipped = [c for c in categories if c not in TEXT_SEARCH_QUERIES]
+        if skipped:
+            logger.warning(f"No text queries for {skipped}; skipping them in --text-search mode.")
+        categories = [c for c in categories if c in TEXT_SEARCH_QUERIES]
+
     logger.info(f"Center: ({lat}, {lng}), Radius: {radius}m")
     logger.info(f"Google types: {categories}")
     logger.info(f"Dry run: {args.dry_run}")
@@ -734,46 +778,149 @@ def run(args: argparse.Namespace) -> None:
         logger.error(f"Failed to connect to Supabase: {e}")
         sys.exit(3)
 
+    # --refresh-existing: update places we already have by ID, no searching
+    if args.refresh_existing:
+        counts = refresh_existing(supabase, api_key, logger, DATA_SOURCE, dry_run=args.dry_run)
+        logger.info("REFRESH SUMMARY: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+        return
+
+    # Column names/types of `places`, fetched once and checked before each write
+    schema = load_places_schema(sb_url, sb_key)
+
     # Counters
     total_fetched: int = 0
     total_inserted: int = 0
     total_updated: int = 0
-    total_skipped: int = 0
+    total_protected: int = 0
     total_errors: int = 0
+    failed_requests: int = 0
+
+    # --bulk-load: COPY each type's records into places_staging, then apply
+    # them in one set-based merge (column merge policy applied in SQL).
+    bulk: bool = args.bulk_load and not args.dry_run
+    database_url: str | None = os.getenv("DATABASE_URL")
+    if bulk and not database_url:
+        logger.error("--bulk-load requires DATABASE_URL (direct Postgres connection string).")
+        sys.exit(1)
 
-    for google_type in categories:
-        logger.info(f"\n--- Fetching type: {google_type} ---")
-        places = fetch_nearby_places(api_key, google_type, lat, lng, radius)
-        logger.info(f"Found {len(places)} places for type '{google_type}'")
-        total_fetched += len(places)
-
-        for place in places:
-            record = map_place_to_record(place, google_type)
-            if record is None:
-                logger.debug(f"Filtered out: {place.get('name', 'Unknown')}")
+    # Mark phase for sweep_places.py. Only a run over every type can tell
+    # that a place has vanished, so --categories runs are not full sweeps;
+    # neither are --text-search runs, whose coverage depends on the queries.
+    run_id: int | None = None
+    if not args.dry_run:
+        full_sweep = args.categories is None and not args.text_search
+        run_id = start_run(supabase, DATA_SOURCE, lat, lng, radius, full_sweep, logger)
+
+    def result_pages(archive: RawArchive | None) -> Iterator[tuple[str, str, list[dict]]]:
+        """(google_type, label, places) per API page, in either search mode."""
+        nonlocal failed_requests
+        for google_type in categories:
+            if not args.text_search:
+                logger.info(f"\n--- Fetching type: {google_type} ---")
+                places = fetch_nearby_places(api_key, google_type, lat, lng, radius)
+                if places is None:
+                    failed_requests += 1
+                    continue
+                if archive is not None:
+                    archive.write([google_type], places)
+                yield google_type, google_type, places
+                continue
+            for query in TEXT_SEARCH_QUERIES[google_type]:
+                logger.info(f"\n--- Text search ({google_type}): '{query}' ---")
+                for page in fetch_text_search_pages(api_key, query, lat, lng, radius):
+                    if page is None:
+                        failed_requests += 1
+                        continue
+                    # locationBias is not a restriction: keep the seeding radius
+                    places = [
+                        p for p in page
+                        if "location" in p and haversine_km(
+                            lat, lng, p["location"]["latitude"], p["location"]["longitude"]
+                        ) * 1000 <= radius
+                    ]
+                    if archive is not None:
+                        archive.write([google_type], places, query)
+                    yield google_type, f"{google_type}: {query}", places
+
+    # Overlapping text queries return the same places; write each once
+    seen_ids: set[str] = set()
+
+    # Raw responses go to the archive so remap.py can re-derive rows later
+    archiving: bool = not args.dry_run and not args.no_archive
+
+    with (
+        StagingLoader(database_url, logger) if bulk else nullcontext()
+    ) as loader, (
+        RawArchive(DATA_SOURCE, lat, lng, radius, run_id, logger, deduped=args.text_search)
+        if archiving else nullcontext()
+    ) as archive:
+        for google_type, label, places in result_pages(archive):
+            logger.info(f"Found {len(places)} places for '{label}'")
+            total_fetched += len(places)
+
+            batch: list[PlaceRecord] = []
+            for place in places:
+                if place.get("id") in seen_ids:
+                    continue
+                record = map_place_to_record(place, google_type, name_filter=not args.text_search)
+                if record is None:
+                    logger.debug(f"Filtered out: {place.get('name', 'Unknown')}")
+                    continue
+                if args.text_search:
+                    seen_ids.add(place["id"])
+                if run_id is not None:
+                    record.last_seen_run = run_id
+                batch.append(record)
+
+            if not batch:
                 continue
 
-            result = upsert_place(supabase, record, args.dry_run)
+            if args.dry_run:
+                for record in batch:
+                    result = preview_place(supabase, record)
+                    if result == "inserted":
+                        total_inserted += 1
+                    elif result == "updated":
+                        total_updated += 1
+                    elif result == "protected":
+                        total_protected += 1
+            elif loader is not None:
+                rows = validated_rows(batch, schema, logger)
+                total_errors += len(batch) - len(rows)
+                loader.stage(rows)
+            else:
+                inserted, updated, protected, errors = merge_places(supabase, batch, schema)
+                total_inserted += inserted
+                total_updated += updated
+                total_protected += protected
+                total_errors += errors
+                logger.info(
+                    f"Merged '{label}': inserted={inserted} updated={updated} "
+                    f"admin-protected={protected} errors={errors}"
+                )
 
-            if result == "inserted":
-                total_inserted += 1
-            elif result == "updated":
-                total_updated += 1
-            elif result == "upserted":
-                total_inserted += 1
-            elif result == "skipped":
-                total_skipped += 1
-            elif result == "error":
-                total_errors += 1
+        if loader is not None:
+            total_inserted, total_updated, total_protected = loader.merge()
+
+    # A run with gaps must not count as a sweep: leave it unfinished
+    if failed_requests or total_errors:
+        if run_id is not None:
+            logger.warning(
+                f"Seed run {run_id} left unfinished: {failed_requests} failed requests, "
+                f"{total_errors} records not written."
+            )
+    else:
+        finish_run(supabase, run_id, logger)
 
     # Summary
     logger.info("\n" + "=" * 60)
     logger.info("SEED SUMMARY")
     logger.info("=" * 60)
     logger.info(f"  Total places fetched:     {total_fetched}")
-    logger.info(f"  Total inserted/upserted:  {total_inserted}")
+    logger.info(f"  Total inserted:           {total_inserted}")
     logger.info(f"  Total updated:            {total_updated}")
-    logger.info(f"  Total skipped (override): {total_skipped}")
+    logger.info(f"  Admin fields kept:        {total_protected}")
+    logger.info(f"  Failed requests:          {failed_requests}")
     logger.info(f"  Total errors:             {total_errors}")
     logger.info("=" * 60)
 
@@ -800,6 +947,15 @@ Examples:
 
   # Seed all categories including hangout/essentials
   python scripts/seed_offcampus.py --radius 3000
+
+  # Large sweep: COPY into places_staging + one set-based merge (DATABASE_URL)
+  python scripts/seed_offcampus.py --radius 5000 --bulk-load
+
+  # Refresh ratings/hours of already-seeded places via Place Details by ID
+  python scripts/seed_offcampus.py --refresh-existing
+
+  # Targeted Text Search queries (TEXT_SEARCH_QUERIES), up to 60 results each
+  python scripts/seed_offcampus.py --text-search --categories lodging,store
         """,
     )
 
@@ -831,6 +987,39 @@ Examples:
         default=False,
         help="Print intended DB upserts as JSON; do not write to DB.",
     )
+    parser.add_argument(
+        "--bulk-load",
+        action="store_true",
+        default=False,
+        help=(
+            "Stage records with Postgres COPY and merge them in one "
+            "INSERT … ON CONFLICT instead of per-row upserts. Needs DATABASE_URL."
+        ),
+    )
+    parser.add_argument(
+        "--text-search",
+        action="store_true",
+        default=False,
+        help=(
+            "Use paginated Text Search with the per-type query lists in "
+            "TEXT_SEARCH_QUERIES instead of one 20-result Nearby Search per type."
+        ),
+    )
+    parser.add_argument(
+        "--no-archive",
+        action="store_true",
+        default=False,
+        help="Do not archive raw API responses under data/raw_places/ (see remap.py).",
+    )
+    parser.add_argument(
+        "--refresh-existing",
+        action="store_true",
+        default=False,
+        help=(
+            "Skip searching; refresh this seeder's existing places through "
+            "Place Details by google_place_id, writing only changed fields."
+        ),
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
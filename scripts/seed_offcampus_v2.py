@@ -7,9 +7,13 @@ Usage:
     python scripts/seed_offcampus_v2.py --dry-run --verbose
     python scripts/seed_offcampus_v2.py --radius 3000
     python scripts/seed_offcampus_v2.py --categories restaurant,cafe,gym,lodging
+    python scripts/seed_offcampus_v2.py --radius 5000 --bulk-load   # COPY + one merge (DATABASE_URL)
+    python scripts/seed_offcampus_v2.py --refresh-existing          # Place Details by ID, changed fields only
+    python scripts/seed_offcampus_v2.py --batch-types               # one request per category, classified locally
 """
 
 import argparse, json, logging, math, os, random, sys, time
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -18,6 +22,15 @@ import requests
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from bulk_load import StagingLoader
+from food_signals import food_signals
+from geocell import cell_columns
+from place_record import UNSET, PlaceRecord, load_places_schema, merge_rows, validated_rows
+from raw_archive import RawArchive
+from refresh_existing import refresh_existing
+from seed_runs import finish_run, start_run
+from weekly_hours import opening_hours_mask
+
 # ─── Campus anchor (Christ University, Central Campus) ───────────────────────
 CAMPUS_LAT = 12.9345
 CAMPUS_LNG = 77.6069
@@ -68,12 +81,24 @@ DEFAULT_TYPES = [
     "park","shopping_mall","supermarket","atm","bank","bus_station","subway_station",
 ]
 
+# --batch-types: when a place carries several mapped types and its primaryType
+# is not one of them, the first match in this order wins (specific before generic)
+TYPE_PRECEDENCE = [
+    "juice_shop","ice_cream_shop","bakery","cafe","fast_food_restaurant","restaurant",
+    "guest_house","hotel","lodging",
+    "library","book_store",
+    "dentist","doctor","pharmacy","hospital",
+    "yoga_studio","gym","sports_complex",
+    "laundry","supermarket","convenience_store","bank","atm",
+    "subway_station","bus_station",
+    "movie_theater","shopping_mall","park",
+    "store",
+]
+
 PG_KW = {"pg","paying guest","paying-guest"}
 FLAT_KW = {"flat","apartment","rental","furnished"}
 COLIVING_KW = {"co-living","coliving","co living"}
 HOSTEL_KW = {"hostel","dormitory","dorm"}
-VEG_KW = {"pure veg","vegetarian","udupi","satvik","satvic"}
-NON_VEG_KW = {"chicken","mutton","fish","seafood","biryani","kebab","tandoori","beef"}
 STORE_FILTER_KW = {"print","xerox","stationery","courier","copy","stationary","binding"}
 
 PRICE_INR = {
@@ -116,7 +141,9 @@ def fmt_dist(km):
     return f"{int(km*1000)} m" if km<1 else f"{km:.1f} km"
 
 def fetch_nearby(api_key, ptype, lat, lng, radius, maxr=20):
-    body={"includedTypes":[ptype],"maxResultCount":min(maxr,20),
+    """Places for one searchNearby request; None if it failed (HTTP errors / retries exhausted)."""
+    ptypes=ptype if isinstance(ptype,list) else [ptype]
+    body={"includedTypes":ptypes,"maxResultCount":min(maxr,20),
           "locationRestriction":{"circle":{"center":{"latitude":lat,"longitude":lng},"radius":float(radius)}},
           "rankPreference":"POPULARITY"}
     headers={"Content-Type":"application/json","X-Goog-Api-Key":api_key,"X-Goog-FieldMask":FIELD_MASK}
@@ -130,7 +157,23 @@ def fetch_nearby(api_key, ptype, lat, lng, radius, maxr=20):
             else: return r.json().get("places",[])
         except requests.RequestException as e: logger.warning(f"Req err {attempt}: {e}")
         time.sleep(min(wait+random.uniform(0,0.4*wait),60)); wait*=2
-    return []
+    return None
+
+def type_batches(types):
+    """Group requested types into one includedTypes list per category (requests stay compatible)."""
+    groups={}
+    for t in types: groups.setdefault(GOOGLE_TYPE_MAP[t][0],[]).append(t)
+    return list(groups.values())
+
+def classify(place, requested):
+    """GOOGLE_TYPE_MAP key for a place: primaryType if mapped, else TYPE_PRECEDENCE over its types."""
+    pt=place.get("primaryType") or ""
+    if pt in GOOGLE_TYPE_MAP: return pt
+    if pt.endswith("_restaurant"): return "restaurant"   # indian_restaurant, pizza_restaurant, ...
+    gtypes=set(place.get("types",[]))
+    for t in TYPE_PRECEDENCE:
+        if t in gtypes: return t
+    return next((t for t in requested if t in gtypes),None)
 
 def opening_hours(place):
     for key in ["currentOpeningHours","regularOpeningHours"]:
@@ -151,13 +194,6 @@ def photo_refs(place, n=5):
 def photo_url(ref, api_key, w=800):
     return f"https://places.googleapis.com/v1/{ref}/media?maxWidthPx={w}&key={api_key}" if ref else None
 
-def infer_veg(place, name):
-    nl=name.lower()
-    if any(k in nl for k in VEG_KW): return True
-    if any(k in nl for k in NON_VEG_KW): return False
-    if place.get("servesVegetarianFood"): return None
-    return None
-
 def cuisine_tags(place, name):
     tags=set(); nl=name.lower()
     maps={"north_indian":["north indian","punjabi","mughlai"],"south_indian":["udupi","south indian","dosa","idli"],
@@ -210,10 +246,13 @@ def map_record(place, gtype, api_key):
     refs=photo_refs(place)
     primary=photo_url(refs[0]["ref"],api_key) if refs else None
     gtypes=place.get("types",[])
-    is_veg=infer_is_veg=None
+    is_veg=None; sig={}
     ctags=[]; ams=[]; hw=False; deliv=False; take=False; dine=False; desc=None
     if category=="food":
-        is_veg=infer_veg(place,name); ctags=cuisine_tags(place,name)
+        ctags=cuisine_tags(place,name)
+        # Derived price/veg signals (food_signals.py); is_veg stays UNSET when inconclusive
+        sig=food_signals(name,gtype,ctags,PRICE_INT.get(pl_str),place)
+        is_veg=sig.get("is_veg",UNSET); price_inr=float(sig["price_inr"])
         ams=amenities(place); hw=False; deliv=bool(place.get("delivery"))
         take=bool(place.get("takeout")); dine=bool(place.get("dineIn"))
     elif category in ("accommodation","study","hangout","fitness"):
@@ -225,52 +264,46 @@ def map_record(place, gtype, api_key):
     if pt: tags.append(pt.replace("_"," ").title())
     if is_veg is True: tags.append("Pure Veg")
     if dist_km<0.5: tags.append("Near Campus")
-    pr_min=pr_max=None
-    if category=="food":
-        rngs={"PRICE_LEVEL_INEXPENSIVE":(50,150),"PRICE_LEVEL_MODERATE":(150,400),
-              "PRICE_LEVEL_EXPENSIVE":(400,800),"PRICE_LEVEL_VERY_EXPENSIVE":(800,2000)}
-        rng=rngs.get(pl_str)
-        if rng: pr_min,pr_max=rng
-    pd=None
-    if pl_str and pl_str!="PRICE_LEVEL_FREE":
+    pr_min=sig.get("price_range_min"); pr_max=sig.get("price_range_max")
+    pd=sig.get("display_price_label")
+    if pd is None and pl_str and pl_str!="PRICE_LEVEL_FREE":
         if category=="accommodation":
             pd={"PRICE_LEVEL_INEXPENSIVE":"₹5,000–₹8,000/mo","PRICE_LEVEL_MODERATE":"₹8,000–₹15,000/mo",
                 "PRICE_LEVEL_EXPENSIVE":"₹15,000–₹25,000/mo","PRICE_LEVEL_VERY_EXPENSIVE":"₹25,000+/mo"}.get(pl_str)
         elif price_inr>0: pd=f"₹{int(price_inr)}"
-    return {
-        "google_place_id":gid,"name":name,"category":category,"type":gtype,"sub_type":sub_type,
-        "address":place.get("formattedAddress") or place.get("shortFormattedAddress",""),
-        "city":DEFAULT_CITY,"lat":lat,"lng":lng,
-        "phone":place.get("nationalPhoneNumber") or place.get("internationalPhoneNumber"),
-        "website":place.get("websiteUri"),"google_maps_url":place.get("googleMapsUri"),
-        "is_on_campus":dist_km<0.1,"is_static":False,"is_manual_override":False,
-        "data_source":DATA_SOURCE,"last_fetched_at":datetime.now(timezone.utc).isoformat(),
-        "rating":round(float(place["rating"]),1) if place.get("rating") else None,
-        "rating_count":int(place["userRatingCount"]) if place.get("userRatingCount") else None,
-        "price_level":PRICE_INT.get(pl_str),"price_inr":price_inr if price_inr>0 else None,
-        "price_range_min":pr_min,"price_range_max":pr_max,"price_display":pd,"display_price_label":pd,
-        "photo_refs":refs,"primary_photo_url":primary,"timing":opening_hours(place),
-        "business_status":place.get("businessStatus","OPERATIONAL"),
-        "distance_from_campus":fmt_dist(dist_km),
-        "is_veg":is_veg,"cuisine_tags":ctags or None,"amenities":ams or None,
-        "has_wifi":False,"delivery_available":deliv,"takeaway_available":take,"dine_in_available":dine,
-        "description":desc,"tags":tags or None,"verified":False,
-        "extra":{"google_types":gtypes,"primary_type":pt,"price_level_str":pl_str},
-    }
+    return PlaceRecord(
+        google_place_id=gid,name=name,category=category,type=gtype,sub_type=sub_type,
+        address=place.get("formattedAddress") or place.get("shortFormattedAddress",""),
+        city=DEFAULT_CITY,lat=lat,lng=lng,**cell_columns(lat,lng),
+        phone=place.get("nationalPhoneNumber") or place.get("internationalPhoneNumber"),
+        website=place.get("websiteUri"),google_maps_url=place.get("googleMapsUri"),
+        is_on_campus=dist_km<0.1,is_static=False,is_manual_override=False,
+        data_source=DATA_SOURCE,last_fetched_at=datetime.now(timezone.utc).isoformat(),
+        rating=round(float(place["rating"]),1) if place.get("rating") else None,
+        rating_count=int(place["userRatingCount"]) if place.get("userRatingCount") else None,
+        price_level=PRICE_INT.get(pl_str),price_inr=price_inr if price_inr>0 else None,
+        price_range_min=pr_min,price_range_max=pr_max,price_display=pd,display_price_label=pd,
+        photo_refs=refs,primary_photo_url=primary,timing=opening_hours(place),
+        opening_hours_mask=opening_hours_mask(place),
+        business_status=place.get("businessStatus"),
+        distance_from_campus=fmt_dist(dist_km),
+        is_veg=is_veg,cuisine_tags=ctags or None,amenities=ams or None,
+        has_wifi=False,delivery_available=deliv,takeaway_available=take,dine_in_available=dine,
+        description=desc,tags=tags or None,verified=False,
+        extra={"google_types":gtypes,"primary_type":pt,"price_level_str":pl_str},
+    )
 
-def upsert(sb, records, dry_run):
+def upsert(sb, records, schema, dry_run, loader=None):
+    rows=validated_rows(records,schema,logger)
+    invalid=len(records)-len(rows)
     if dry_run:
-        logger.info(f"  [DRY RUN] {len(records)} records would upsert")
-        return len(records),0
-    ins=skip=0
-    for i in range(0,len(records),50):
-        chunk=records[i:i+50]
-        try:
-            r=sb.table("places").upsert(chunk,on_conflict="google_place_id",ignore_duplicates=False).execute()
-            ins+=len(r.data or [])
-        except Exception as e:
-            logger.error(f"Upsert error chunk {i}: {e}"); skip+=len(chunk)
-    return ins,skip
+        logger.info(f"  [DRY RUN] {len(rows)} records would upsert ({invalid} failed schema check)")
+        return len(rows),invalid
+    if loader:  # --bulk-load: COPY into places_staging, merged once after the sweep
+        return loader.stage(rows),invalid
+    ins,upd,prot,failed=merge_rows(sb,rows,logger)
+    if prot: logger.info(f"  Kept admin-owned fields on {prot} overridden rows")
+    return ins+upd,invalid+failed
 
 def main():
     ap=argparse.ArgumentParser()
@@ -280,6 +313,10 @@ def main():
     ap.add_argument("--categories",type=str,default="")
     ap.add_argument("--location",type=str,default="")
     ap.add_argument("--max-per-type",type=int,default=20)
+    ap.add_argument("--bulk-load",action="store_true",help="COPY into places_staging + one set-based merge (needs DATABASE_URL)")
+    ap.add_argument("--refresh-existing",action="store_true",help="Refresh known places via Place Details by ID instead of searching")
+    ap.add_argument("--no-archive",action="store_true",help="Do not archive raw API responses (data/raw_places/, see remap.py)")
+    ap.add_argument("--batch-types",action="store_true",help="One request per category (includedTypes list); classify each place by primaryType/types")
     args=ap.parse_args()
     setup_logging(args.verbose)
     radius=min(args.radius,MAX_RADIUS)
@@ -296,25 +333,57 @@ def main():
         if not types: logger.error("No valid types"); sys.exit(1)
     api_key,sb_url,sb_key=load_env()
     sb=create_client(sb_url,sb_key)
+    if args.refresh_existing:
+        c=refresh_existing(sb,api_key,logger,DATA_SOURCE,dry_run=args.dry_run)
+        logger.info("Refresh: "+", ".join(f"{k}={v}" for k,v in c.items())); return
+    schema=load_places_schema(sb_url,sb_key)
     logger.info("="*60)
     logger.info(f"UniEasy Seeder v2 | Center: {lat},{lng} | Radius: {radius}m | Types: {len(types)}")
     logger.info("="*60)
-    tf=tm=tu=ts=0
-    for ptype in types:
-        logger.info(f"\n▶ {ptype} ...")
-        raw=fetch_nearby(api_key,ptype,lat,lng,radius,args.max_per_type)
-        logger.info(f"  API: {len(raw)} results")
-        tf+=len(raw)
-        recs=[r for r in (map_record(p,ptype,api_key) for p in raw) if r]
-        logger.info(f"  Mapped: {len(recs)} (skipped {len(raw)-len(recs)})")
-        tm+=len(recs)
-        if recs:
-            i,s=upsert(sb,recs,args.dry_run)
-            tu+=i; ts+=s
-            logger.info(f"  Upserted: {i}, Skipped/err: {s}")
-        time.sleep(0.3)
+    bulk=args.bulk_load and not args.dry_run
+    db_url=os.getenv("DATABASE_URL")
+    if bulk and not db_url: logger.error("--bulk-load needs DATABASE_URL"); sys.exit(1)
+    # mark phase: a full sweep (default types, 20/type) lets sweep_places.py prune what it missed;
+    # --batch-types shares 20 results across a category, so its runs never count as full sweeps
+    full=not args.categories and args.max_per_type>=20 and not args.batch_types
+    run_id=None if args.dry_run else start_run(sb,DATA_SOURCE,lat,lng,radius,full,logger)
+    batches=type_batches(types) if args.batch_types else [[t] for t in types]
+    if args.batch_types: logger.info(f"Batched {len(types)} types into {len(batches)} requests")
+    seen=set()
+    tf=tm=tu=ts=tfail=0
+    archiving=not args.dry_run and not args.no_archive
+    with (StagingLoader(db_url,logger) if bulk else nullcontext()) as loader, \
+         (RawArchive(DATA_SOURCE,lat,lng,radius,run_id,logger,deduped=args.batch_types) if archiving else nullcontext()) as archive:
+        for batch in batches:
+            logger.info(f"\n▶ {','.join(batch)} ...")
+            raw=fetch_nearby(api_key,batch,lat,lng,radius,args.max_per_type)
+            if raw is None: tfail+=1; continue
+            if archive: archive.write(batch,raw,classified=args.batch_types)
+            logger.info(f"  API: {len(raw)} results")
+            tf+=len(raw)
+            if args.batch_types:
+                raw=[p for p in raw if p.get("id") not in seen]; seen.update(p.get("id") for p in raw)
+                recs=[r for r in (map_record(p,classify(p,batch),api_key) for p in raw) if r]
+            else:
+                recs=[r for r in (map_record(p,batch[0],api_key) for p in raw) if r]
+            if run_id:
+                for r in recs: r.last_seen_run=run_id
+            logger.info(f"  Mapped: {len(recs)} (skipped {len(raw)-len(recs)})")
+            tm+=len(recs)
+            if recs:
+                i,s=upsert(sb,recs,schema,args.dry_run,loader)
+                tu+=i; ts+=s
+                logger.info(f"  Upserted: {i}, Skipped/err: {s}")
+            time.sleep(0.3)
+        if loader:
+            ins,upd,prot=loader.merge(); tu=ins+upd
+            logger.info(f"\nBulk merge: inserted {ins}, updated {upd} ({prot} kept admin-owned fields)")
+    # a run with failed requests or rows is not a complete sweep: leave it unfinished
+    if tfail or ts:
+        if run_id: logger.warning(f"Seed run {run_id} left unfinished: {tfail} failed requests, {ts} rows skipped/errored")
+    else: finish_run(sb,run_id,logger)
     logger.info("\n"+"="*60)
-    logger.info(f"DONE | Fetched:{tf} Mapped:{tm} Upserted:{tu} Skipped:{ts}")
+    logger.info(f"DONE | Fetched:{tf} Mapped:{tm} Upserted:{tu} Skipped:{ts} Failed requests:{tfail}")
     if args.dry_run: logger.info("(DRY RUN — nothing written)")
     if not args.dry_run:
         res=sb.table("places").select("id",count="exact").execute()
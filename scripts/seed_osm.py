@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+seed_osm.py — Quota-free secondary source: ingest a local OpenStreetMap extract.
+
+Streams an extract (GeoJSON, GeoJSONSeq, OSM XML or PBF — see
+osm_extract.py) for the campus region, maps amenity / shop / leisure /
+tourism tags onto the GOOGLE_TYPE_MAP taxonomy, and matches every feature
+against the places already in the table:
+
+  match      a live row within --max-distance whose name scores at least
+             --threshold (dedupe_places.py's IDF-weighted token score; same
+             category, or a shared phone / website) — the row is enriched:
+             osm_id is set and only columns it lacks (phone, website,
+             address, cuisine_tags, is_veg, has_wifi, timing) are filled.
+  closed     the best match is archived — the feature is skipped rather
+             than resurrecting a place Google reports closed.
+  new        no match — inserted with data_source 'osm_extract' (unless
+             --no-insert); re-runs update these rows by osm_id.
+
+No Google request is made, so it runs fully offline against the database.
+Memory holds the region's existing rows plus one write chunk; the extract
+itself is never loaded whole.
+
+Usage:
+    python scripts/seed_osm.py data/osm/bengaluru.geojsonseq --dry-run --verbose
+    python scripts/seed_osm.py data/osm/campus.osm --radius 3000
+    python scripts/seed_osm.py data/osm/karnataka-latest.osm.pbf --no-insert
+"""
+
+import argparse
+import logging
+import math
+import re
+from collections import defaultdict
+from pathlib import Path
+
+from supabase import create_client  # pyre-ignore[21]
+
+from dedupe_places import idf_weights, name_score, name_words, phone_key, website_key
+from food_signals import food_signals
+from geocell import GridIndex, cell_columns, distance_m
+from osm_extract import iter_features
+from place_record import PlaceRecord, load_places_schema, validated_rows
+from seed_common import CAMPUS_LAT, CAMPUS_LNG, WRITE_CHUNK, iter_places, load_env, setup_logging, update_places, upsert_rows
+from seed_offcampus_v2 import DEFAULT_CITY, GOOGLE_TYPE_MAP, fmt_dist, haversine_km, lodging_subtype
+
+logger = logging.getLogger("seed_osm")
+
+DATA_SOURCE = "osm_extract"
+DEFAULT_RADIUS = 3000
+DEFAULT_MAX_DISTANCE_M = 75
+DEFAULT_THRESHOLD = 0.75
+
+# OSM (key, value) → GOOGLE_TYPE_MAP key; keys are tried in this order
+OSM_KEY_ORDER = ("amenity", "shop", "leisure", "tourism")
+OSM_TAG_MAP = {
+    ("amenity", "restaurant"): "restaurant", ("amenity", "cafe"): "cafe",
+    ("amenity", "fast_food"): "fast_food_restaurant", ("amenity", "food_court"): "restaurant",
+    ("amenity", "ice_cream"): "ice_cream_shop", ("amenity", "juice_bar"): "juice_shop",
+    ("amenity", "library"): "library",
+    ("amenity", "pharmacy"): "pharmacy", ("amenity", "hospital"): "hospital",
+    ("amenity", "clinic"): "doctor", ("amenity", "doctors"): "doctor", ("amenity", "dentist"): "dentist",
+    ("amenity", "atm"): "atm", ("amenity", "bank"): "bank",
+    ("amenity", "cinema"): "movie_theater", ("amenity", "bus_station"): "bus_station",
+    ("shop", "bakery"): "bakery", ("shop", "pastry"): "bakery", ("shop", "juice"): "juice_shop",
+    ("shop", "books"): "book_store", ("shop", "chemist"): "pharmacy",
+    ("shop", "laundry"): "laundry", ("shop", "dry_cleaning"): "laundry",
+    ("shop", "copyshop"): "store", ("shop", "stationery"): "store",
+    ("shop", "supermarket"): "supermarket", ("shop", "convenience"): "convenience_store",
+    ("shop", "mall"): "shopping_mall", ("shop", "department_store"): "shopping_mall",
+    ("leisure", "park"): "park", ("leisure", "fitness_centre"): "gym",
+    ("leisure", "sports_centre"): "sports_complex",
+    ("tourism", "hotel"): "hotel", ("tourism", "guest_house"): "guest_house",
+    ("tourism", "hostel"): "lodging",
+}
+
+LODGING_TYPES = ("lodging", "hotel", "guest_house")
+ENRICH_COLUMNS = ("osm_id", "phone", "website", "address", "cuisine_tags", "is_veg", "has_wifi", "timing")
+SOURCE_COLUMNS = (
+    "id, name, category, type, lat, lng, google_place_id, data_source, is_manual_override, "
+    "archived_at, " + ", ".join(ENRICH_COLUMNS)
+)
+
+
+# ─── Mapping ─────────────────────────────────────────────────────────────────
+
+def osm_type(tags: dict) -> str | None:
+    """GOOGLE_TYPE_MAP key for an OSM feature's tags, or None if unmapped."""
+    if tags.get("station") == "subway" or (tags.get("public_transport") == "station" and tags.get("subway") == "yes"):
+        return "subway_station"
+    for key in OSM_KEY_ORDER:
+        gtype = OSM_TAG_MAP.get((key, tags.get(key)))
+        if gtype:
+            return gtype
+    return None
+
+
+def _first(value: str | None) -> str | None:
+    """First entry of a ';'-separated OSM value."""
+    return value.split(";")[0].strip() or None if value else None
+
+
+OSM_DAYS = ("Mo", "Tu", "We", "Th", "Fr", "Sa", "Su")
+CLOCK = re.compile(r"\d{1,2}:\d{2}")
+
+
+def _clock(hhmm: str) -> str:
+    """'21:30' → '9:30 PM' (Google's weekdayDescriptions form)."""
+    h, m = map(int, hhmm.split(":"))
+    h %= 24
+    return f"{(h + 11) % 12 + 1}:{m:02d} {'AM' if h < 12 else 'PM'}"
+
+
+def osm_timing(value: str | None) -> str | None:
+    """
+    Monday's hours from an OSM opening_hours value, in the display form the
+    v2 seeder stores ('9:00 AM – 10:00 PM', 'Open 24 hours', 'Closed').
+    Only plain day-range / time-range rules are understood (public-holiday
+    rules are skipped); anything else (months, sunrise, …) gives None.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value == "24/7":
+        return "Open 24 hours"
+    monday = "Closed"          # unless a rule covers Monday
+    for rule in filter(None, (r.strip() for r in value.split(";"))):
+        if rule.startswith(("PH", "SH")):
+            continue
+        days, _, times = rule.partition(" ")
+        if not times:          # a rule without days applies to every day
+            days, times = "Mo-Su", days
+        covered: set[str] = set()
+        for part in days.split(","):
+            first, _, last = part.partition("-")
+            if first not in OSM_DAYS or (last and last not in OSM_DAYS):
+                return None
+            i, j = OSM_DAYS.index(first), OSM_DAYS.index(last or first)
+            covered.update(OSM_DAYS[k % 7] for k in range(i, j + 1 if j >= i else j + 8))
+        if "Mo" not in covered:
+            continue
+        times = times.strip()
+        if times in ("off", "closed"):
+            monday = "Closed"
+        elif times == "00:00-24:00":
+            monday = "Open 24 hours"
+        else:
+            spans = []
+            for span in times.split(","):
+                start, _, end = span.strip().partition("-")
+                if not (CLOCK.fullmatch(start) and CLOCK.fullmatch(end)):
+                    return None
+                spans.append(f"{_clock(start)} – {_clock(end)}")
+            monday = ", ".join(spans)
+    return monday
+
+
+def map_feature(feature: dict) -> PlaceRecord | None:
+    tags = feature["tags"]
+    gtype = osm_type(tags)
+    name = tags.get("name:en") or tags.get("name")
+    if not gtype or not name:
+        return None
+    category, sub_type = GOOGLE_TYPE_MAP[gtype]
+    if gtype in LODGING_TYPES:
+        sub_type = lodging_subtype(name)
+
+    lat, lng = feature["lat"], feature["lng"]
+    dist_km = haversine_km(CAMPUS_LAT, CAMPUS_LNG, lat, lng)
+    street = " ".join(filter(None, (tags.get("addr:housenumber"), tags.get("addr:street"))))
+    address = ", ".join(filter(None, (
+        street, tags.get("addr:suburb") or tags.get("addr:neighbourhood"), tags.get("addr:city"),
+    ))) or None
+    wifi = tags.get("internet_access")
+
+    food: dict = {}
+    if category == "food":
+        ctags = sorted({c.strip().lower().replace(" ", "_") for c in tags.get("cuisine", "").split(";") if c.strip()})
+        # No price_level in OSM: the estimator's default band, as the frontend shows
+        food = food_signals(name, gtype, ctags, None, {})
+        if "only" in (tags.get("diet:vegetarian"), tags.get("diet:vegan")):
+            food["is_veg"] = True
+        food["cuisine_tags"] = ctags or None
+
+    return PlaceRecord(
+        osm_id=feature["osm_id"], name=name, category=category, type=gtype, sub_type=sub_type,
+        address=address, city=tags.get("addr:city") or DEFAULT_CITY,
+        lat=round(lat, 7), lng=round(lng, 7), **cell_columns(lat, lng),
+        distance_from_campus=fmt_dist(dist_km), is_on_campus=dist_km < 0.1,
+        phone=_first(tags.get("phone") or tags.get("contact:phone")),
+        website=_first(tags.get("website") or tags.get("contact:website")),
+        is_static=False, is_manual_override=False, data_source=DATA_SOURCE,
+        has_wifi=True if wifi in ("wlan", "yes", "wifi") else False if wifi == "no" else None,
+        # timing is shown verbatim: the v2 display form, the raw OSM rule kept in `extra`
+        timing=osm_timing(tags.get("opening_hours")),
+        extra={"osm_opening_hours": tags["opening_hours"]} if tags.get("opening_hours") else None,
+        **food,
+    )
+
+
+# ─── Matching ────────────────────────────────────────────────────────────────
+
+class Matcher:
+    """Spatial + name matching of OSM records against known rows."""
+
+    def __init__(self, rows: list[dict], max_m: float, threshold: float) -> None:
+        self.rows = rows
+        self.max_m = max_m
+        self.threshold = threshold
+        self.tokens = [frozenset(name_words(r["name"])) for r in rows]
+        weights = idf_weights(self.tokens)
+        rare = math.log(len(rows) + 1) + 0.1       # weight of a word no known name has
+        self.idf = defaultdict(lambda: rare, weights)
+        self.index = GridIndex()
+        for i, r in enumerate(rows):
+            self.index.add(i, float(r["lat"]), float(r["lng"]))
+
+    def add(self, row: dict) -> None:
+        """Make a row (e.g. one just inserted) matchable by later features."""
+        self.rows.append(row)
+        self.tokens.append(frozenset(name_words(row["name"])))
+        self.index.add(len(self.rows) - 1, float(row["lat"]), float(row["lng"]))
+
+    def best(self, record: PlaceRecord) -> dict | None:
+        words = name_words(record.name)
+        tokens = frozenset(words)
+        phone, site = phone_key(record.phone), website_key(record.website)
+        found = None
+        for d, i in self.index.within(record.lat, record.lng, self.max_m):
+            row = self.rows[i]
+            if (phone and phone == phone_key(row.get("phone"))) or (site and site == website_key(row.get("website"))):
+                score = 1.0
+            elif "".join(words) == "".join(name_words(row["name"])):
+                score = 1.0
+            elif row["category"] != record.category:
+                continue
+            else:
+                score = name_score(tokens, self.tokens[i], self.idf)
+            if score >= self.threshold and (found is None or (score, -d) > found[0]):
+                found = ((score, -d), row)
+        return found[1] if found else None
+
+
+def enrichment(row: dict, record: PlaceRecord) -> dict | None:
+    """Update doc filling the row's empty ENRICH_COLUMNS, or None if nothing changes."""
+    doc = {c: row[c] for c in ("id", "name", "category", "type", "lat", "lng")}
+    changed = False
+    for column in ENRICH_COLUMNS:
+        current = row.get(column)
+        new = record.get(column)
+        if current in (None, "", []) and new not in (None, "", []):
+            doc[column] = new
+            changed = True
+        else:
+            doc[column] = current
+    return doc if changed else None
+
+
+# ─── Run ─────────────────────────────────────────────────────────────────────
+
+def run(sb, schema, args: argparse.Namespace) -> dict[str, int]:
+    lat, lng = args.center
+    rows = [
+        r for r in iter_places(sb, SOURCE_COLUMNS)
+        if r.get("lat") is not None and distance_m(lat, lng, float(r["lat"]), float(r["lng"])) <= args.radius + args.max_distance
+    ]
+    logger.info(f"{len(rows)} existing places within {args.radius} m of {lat},{lng}")
+    by_osm_id = {r["osm_id"]: r for r in rows if r.get("osm_id")}
+    matcher = Matcher(rows, args.max_distance, args.threshold)
+
+    counts = defaultdict(int)
+    claimed: set[str] = set()
+    enrich_docs: list[dict] = []
+    new_records: list[PlaceRecord] = []
+
+    def flush(final: bool = False) -> None:
+        if len(enrich_docs) >= WRITE_CHUNK or (final and enrich_docs):
+            if not args.dry_run:
+                update_places(sb, enrich_docs)
+            enrich_docs.clear()
+        if len(new_records) >= WRITE_CHUNK or (final and new_records):
+            valid = validated_rows(new_records, schema, logger)
+            counts["invalid"] += len(new_records) - len(valid)
+            if valid and not args.dry_run:
+                upsert_rows(sb, "places", uniform(valid), on_conflict="osm_id")
+            new_records.clear()
+
+    within = lambda plat, plng: distance_m(lat, lng, plat, plng) <= args.radius
+    for feature in iter_features(args.extract, within):
+        counts["features"] += 1
+        record = map_feature(feature)
+        if record is None:
+            continue
+        counts["mapped"] += 1
+
+        known = by_osm_id.get(record.osm_id)
+        if known is not None and known.get("data_source") == DATA_SOURCE and not known.get("is_manual_override"):
+            new_records.append(record)          # our own row: refresh it in place
+            counts["refreshed"] += 1
+        else:
+            row = known or matcher.best(record)
+            if row is None:
+                if args.no_insert:
+                    counts["unmatched"] += 1
+                    continue
+                new_records.append(record)
+                matcher.add({**record.to_row(), "id": None})   # node + building of one POI
+                counts["new"] += 1
+            elif row.get("archived_at"):
+                counts["closed"] += 1
+            elif row["id"] is None or row["id"] in claimed or row.get("osm_id") not in (None, record.osm_id):
+                counts["ambiguous"] += 1            # another feature already took this row
+            else:
+                claimed.add(row["id"])
+                doc = enrichment(row, record)
+                if doc:
+                    enrich_docs.append(doc)
+                    counts["enriched"] += 1
+                else:
+                    counts["matched"] += 1
+        flush()
+    flush(final=True)
+    return dict(counts)
+
+
+def uniform(rows: list[dict]) -> list[dict]:
+    """Same keys in every row: a bulk upsert takes its columns from the union."""
+    keys = sorted({k for r in rows for k in r})
+    return [{k: r.get(k) for k in keys} for r in rows]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest a local OpenStreetMap extract into places.")
+    parser.add_argument("extract", type=Path, help="Extract file (.geojsonseq, .geojson, .osm, .pbf; .gz ok).")
+    parser.add_argument("--location", type=str, default="", help="Centre lat,lng. Default: campus.")
+    parser.add_argument("--radius", type=int, default=DEFAULT_RADIUS,
+                        help=f"Only features within this many metres. Default: {DEFAULT_RADIUS}.")
+    parser.add_argument("--max-distance", type=float, default=DEFAULT_MAX_DISTANCE_M,
+                        help=f"Match radius against existing rows, metres. Default: {DEFAULT_MAX_DISTANCE_M}.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Minimum name score for a match (0–1). Default: {DEFAULT_THRESHOLD}.")
+    parser.add_argument("--no-insert", action="store_true", help="Only enrich existing rows; add nothing.")
+    parser.add_argument("--dry-run", action="store_true", help="Match and report; write nothing.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    if not args.extract.exists():
+        parser.error(f"{args.extract} not found")
+    try:
+        args.center = tuple(map(float, args.location.split(","))) if args.location else (CAMPUS_LAT, CAMPUS_LNG)
+    except ValueError:
+        parser.error("--location must be lat,lng")
+
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+    counts = run(sb, load_places_schema(sb_url, sb_key), args)
+
+    logger.info("OSM: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+    if args.dry_run:
+        logger.info("DRY RUN — nothing written.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+seed_runs.py — Run bookkeeping for the mark phase of mark-and-sweep.
+
+Each seeder run opens a `seed_runs` row (migration 022) and stamps every
+record it writes with `last_seen_run`. Only finished runs count towards
+sweep_places(), so a crashed run never makes places look vanished.
+
+Finishing a run also samples the rating / rating_count of the places it
+wrote that have no sample of their current values yet (migration 025; a
+trigger samples every change as it is written, migration 034) — the
+history compute_trends.py scores — and writes the run's change feed
+(data/changes/run-<id>.ndjson, migration 031; see change_feed.py).
+"""
+
+import logging
+from datetime import datetime, timezone
+
+from change_feed import emit_run_changes
+
+
+def start_run(
+    sb,
+    data_source: str,
+    lat: float,
+    lng: float,
+    radius_m: int,
+    full_sweep: bool,
+    log: logging.Logger,
+) -> int | None:
+    """Insert a seed_runs row and return its id (None if the table is missing)."""
+    try:
+        result = sb.table("seed_runs").insert({
+            "data_source": data_source,
+            "center_lat": lat,
+            "center_lng": lng,
+            "radius_m": radius_m,
+            "full_sweep": full_sweep,
+        }).execute()
+    except Exception as e:
+        log.warning(f"Could not record seed run; last_seen_run not set: {e}")
+        return None
+    run_id = result.data[0]["id"]
+    log.info(f"Seed run {run_id} ({data_source}, full_sweep={full_sweep})")
+    return run_id
+
+
+def finish_run(sb, run_id: int | None, log: logging.Logger, publish_changes: bool = False) -> None:
+    if run_id is None:
+        return
+    try:
+        sb.table("seed_runs").update(
+            {"finished_at": datetime.now(timezone.utc).isoformat()}
+        ).eq("id", run_id).execute()
+    except Exception as e:
+        log.warning(f"Could not mark seed run {run_id} finished: {e}")
+        return
+    try:
+        sampled = sb.rpc("record_rating_samples", {"p_run_id": run_id}).execute().data
+        log.info(f"Seed run {run_id}: {sampled} rating samples recorded")
+    except Exception as e:
+        log.warning(f"Could not record rating samples for run {run_id}: {e}")
+    try:
+        emit_run_changes(sb, run_id, log, publish_changes)
+    except Exception as e:
+        log.warning(f"Could not write the change feed for run {run_id}: {e}")
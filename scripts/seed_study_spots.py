@@ -10,9 +10,12 @@ Usage:
     python scripts/seed_study_spots.py --dry-run --verbose
     python scripts/seed_study_spots.py --radius 3000
     python scripts/seed_study_spots.py --radius 5000 --max-per-type 20
+    python scripts/seed_study_spots.py --radius 5000 --bulk-load
+    python scripts/seed_study_spots.py --refresh-existing
 """
 
 import argparse, logging, math, os, random, sys, time
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -20,6 +23,14 @@ import requests
 from dotenv import load_dotenv
 from supabase import create_client
 
+from bulk_load import StagingLoader
+from geocell import cell_columns
+from place_record import PlaceRecord, PlacesSchema, load_places_schema, merge_rows, validated_rows
+from raw_archive import RawArchive
+from refresh_existing import refresh_existing
+from seed_runs import finish_run, start_run
+from weekly_hours import opening_hours_mask
+
 # ─── Campus anchor ────────────────────────────────────────────────────────────
 CAMPUS_LAT = 12.9345
 CAMPUS_LNG = 77.6069
@@ -134,7 +145,8 @@ def extract_photo_refs(place: dict, n: int = 5) -> list:
 # ─── Google API ───────────────────────────────────────────────────────────────
 
 def fetch_nearby(api_key: str, gtype: str, lat: float, lng: float,
-                 radius: int, maxr: int = 20) -> list:
+                 radius: int, maxr: int = 20) -> list | None:
+    """Places for one searchNearby request; None if it failed."""
     body = {
         "includedTypes": [gtype],
         "maxResultCount": min(maxr, 20),
@@ -171,12 +183,12 @@ def fetch_nearby(api_key: str, gtype: str, lat: float, lng: float,
             logger.warning(f"Request error attempt {attempt}: {e}")
         time.sleep(min(wait + random.uniform(0, 0.4 * wait), 60))
         wait *= 2
-    return []
+    return None
 
 
 # ─── Record mapping ───────────────────────────────────────────────────────────
 
-def map_record(place: dict, gtype: str) -> dict | None:
+def map_record(place: dict, gtype: str) -> PlaceRecord | None:
     sub_type, noise_level = STUDY_TYPE_MAP[gtype]
 
     dn = place.get("displayName", {})
@@ -203,64 +215,64 @@ def map_record(place: dict, gtype: str) -> dict | None:
     sm = place.get("editorialSummary") or {}
     desc = sm.get("text") if isinstance(sm, dict) else None
 
-    return {
-        "google_place_id":      gid,
-        "name":                 name,
-        "category":             "study",
-        "type":                 gtype,
-        "sub_type":             sub_type,
-        "address":              place.get("formattedAddress") or place.get("shortFormattedAddress", ""),
-        "city":                 DEFAULT_CITY,
-        "lat":                  lat,
-        "lng":                  lng,
-        "phone":                place.get("nationalPhoneNumber"),
-        "website":              place.get("websiteUri"),
-        "google_maps_url":      place.get("googleMapsUri"),
-        "is_on_campus":         dist_km < 0.1,
-        "is_static":            False,
-        "is_manual_override":   False,
-        "data_source":          DATA_SOURCE,
-        "last_fetched_at":      datetime.now(timezone.utc).isoformat(),
-        "rating":               round(float(place["rating"]), 1) if place.get("rating") else None,
-        "rating_count":         int(place["userRatingCount"]) if place.get("userRatingCount") else None,
-        "photo_refs":           refs,
-        "timing":               extract_timing(place),
-        "business_status":      place.get("businessStatus", "OPERATIONAL"),
-        "distance_from_campus": fmt_dist(dist_km),
-        "noise_level":          noise_level,
+    return PlaceRecord(
+        google_place_id=gid,
+        name=name,
+        category="study",
+        type=gtype,
+        sub_type=sub_type,
+        address=place.get("formattedAddress") or place.get("shortFormattedAddress", ""),
+        city=DEFAULT_CITY,
+        lat=lat,
+        lng=lng,
+        **cell_columns(lat, lng),
+        phone=place.get("nationalPhoneNumber"),
+        website=place.get("websiteUri"),
+        google_maps_url=place.get("googleMapsUri"),
+        is_on_campus=dist_km < 0.1,
+        is_static=False,
+        is_manual_override=False,
+        data_source=DATA_SOURCE,
+        last_fetched_at=datetime.now(timezone.utc).isoformat(),
+        rating=round(float(place["rating"]), 1) if place.get("rating") else None,
+        rating_count=int(place["userRatingCount"]) if place.get("userRatingCount") else None,
+        photo_refs=refs,
+        timing=extract_timing(place),
+        opening_hours_mask=opening_hours_mask(place),
+        business_status=place.get("businessStatus"),
+        distance_from_campus=fmt_dist(dist_km),
+        noise_level=noise_level,
         # Google Places API does not expose WiFi data — left as NULL
-        "has_wifi":             None,
-        "description":          desc,
-        "verified":             False,
-        "extra": {
+        has_wifi=None,
+        description=desc,
+        verified=False,
+        extra={
             "google_types":    gtypes,
             "primary_type":    pt,
             "outdoor_seating": place.get("outdoorSeating"),
             "good_for_groups": place.get("goodForGroups"),
         },
-    }
+    )
 
 
 # ─── Supabase upsert ──────────────────────────────────────────────────────────
 
-def upsert(sb, records: list, dry_run: bool) -> tuple[int, int]:
+def upsert(sb, records: list[PlaceRecord], schema: PlacesSchema | None,
+           dry_run: bool, loader: StagingLoader | None = None) -> tuple[int, int]:
+    rows = validated_rows(records, schema, logger)
+    invalid = len(records) - len(rows)
     if dry_run:
-        logger.info(f"  [DRY RUN] would upsert {len(records)} records:")
-        for r in records[:5]:
+        logger.info(f"  [DRY RUN] would upsert {len(rows)} records ({invalid} failed schema check):")
+        for r in rows[:5]:
             logger.info(f"    {r['name']!r:40s} | {r['sub_type']:12s} | {r['noise_level']:8s} | {r['distance_from_campus']}")
-        return len(records), 0
-    ins = skip = 0
-    for i in range(0, len(records), 50):
-        chunk = records[i: i + 50]
-        try:
-            result = sb.table("places").upsert(
-                chunk, on_conflict="google_place_id", ignore_duplicates=False
-            ).execute()
-            ins += len(result.data or [])
-        except Exception as e:
-            logger.error(f"Upsert error (chunk {i}): {e}")
-            skip += len(chunk)
-    return ins, skip
+        return len(rows), invalid
+    if loader is not None:
+        # --bulk-load: COPY into places_staging; merged once after all types
+        return loader.stage(rows), invalid
+    ins, upd, prot, failed = merge_rows(sb, rows, logger)
+    if prot:
+        logger.info(f"   Kept admin-owned fields on {prot} overridden rows")
+    return ins + upd, invalid + failed
 
 
 # ─── Main ─────────────────────────────────────────────────────────────────────
@@ -272,6 +284,9 @@ def main():
     ap.add_argument("--radius",       type=int, default=DEFAULT_RADIUS, help=f"Search radius in metres (max {MAX_RADIUS})")
     ap.add_argument("--max-per-type", type=int, default=20,             help="Max results per Google type (max 20)")
     ap.add_argument("--location",     type=str, default="",             help="lat,lng override (default: Christ University)")
+    ap.add_argument("--bulk-load",    action="store_true",              help="COPY into places_staging + one set-based merge (needs DATABASE_URL)")
+    ap.add_argument("--refresh-existing", action="store_true",          help="Refresh known study spots via Place Details by ID instead of searching")
+    ap.add_argument("--no-archive",   action="store_true",              help="Do not archive raw API responses (data/raw_places/, see remap.py)")
     args = ap.parse_args()
 
     setup_logging(args.verbose)
@@ -287,44 +302,84 @@ def main():
     api_key, sb_url, sb_key = load_env()
     sb = create_client(sb_url, sb_key)
 
+    if args.refresh_existing:
+        counts = refresh_existing(sb, api_key, logger, DATA_SOURCE, dry_run=args.dry_run)
+        logger.info("Refresh: " + "  ".join(f"{k}={v}" for k, v in counts.items()))
+        return
+
+    schema = load_places_schema(sb_url, sb_key)
+
     logger.info("=" * 60)
     logger.info(f"Study Spots Seeder | {lat},{lng} | radius={radius}m")
     logger.info(f"Types: {', '.join(STUDY_TYPE_MAP)}")
     logger.info("=" * 60)
 
-    tf = tm = tu = ts = 0
-    seen_ids: set[str] = set()   # deduplicate across type queries
-
-    for gtype in STUDY_TYPE_MAP:
-        logger.info(f"\n▶  {gtype} ...")
-        raw = fetch_nearby(api_key, gtype, lat, lng, radius, args.max_per_type)
-        logger.info(f"   API returned: {len(raw)}")
-        tf += len(raw)
-
-        recs = []
-        for p in raw:
-            gid = p.get("id", "")
-            if gid in seen_ids:
-                continue
-            rec = map_record(p, gtype)
-            if rec:
-                seen_ids.add(gid)
-                recs.append(rec)
+    bulk = args.bulk_load and not args.dry_run
+    db_url = os.getenv("DATABASE_URL")
+    if bulk and not db_url:
+        logger.error("--bulk-load needs DATABASE_URL (direct Postgres connection string)")
+        sys.exit(1)
 
-        skipped = len(raw) - len(recs)
-        logger.info(f"   Mapped: {len(recs)}  (skipped: {skipped})")
-        tm += len(recs)
+    # Mark phase for sweep_places.py: every study type is queried on each run
+    run_id = None if args.dry_run else start_run(
+        sb, DATA_SOURCE, lat, lng, radius, args.max_per_type >= 20, logger
+    )
 
-        if recs:
-            i, s = upsert(sb, recs, args.dry_run)
-            tu += i
-            ts += s
-            logger.info(f"   Upserted: {i}  Errors: {s}")
+    tf = tm = tu = ts = failed_requests = 0
+    seen_ids: set[str] = set()   # deduplicate across type queries
 
-        time.sleep(0.5)
+    archiving = not args.dry_run and not args.no_archive
+    with (StagingLoader(db_url, logger) if bulk else nullcontext()) as loader, \
+         (RawArchive(DATA_SOURCE, lat, lng, radius, run_id, logger, deduped=True) if archiving else nullcontext()) as archive:
+        for gtype in STUDY_TYPE_MAP:
+            logger.info(f"\n▶  {gtype} ...")
+            raw = fetch_nearby(api_key, gtype, lat, lng, radius, args.max_per_type)
+            if raw is None:
+                failed_requests += 1
+                continue
+            if archive is not None:
+                archive.write([gtype], raw)
+            logger.info(f"   API returned: {len(raw)}")
+            tf += len(raw)
+
+            recs = []
+            for p in raw:
+                gid = p.get("id", "")
+                if gid in seen_ids:
+                    continue
+                rec = map_record(p, gtype)
+                if rec:
+                    if run_id:
+                        rec.last_seen_run = run_id
+                    seen_ids.add(gid)
+                    recs.append(rec)
+
+            skipped = len(raw) - len(recs)
+            logger.info(f"   Mapped: {len(recs)}  (skipped: {skipped})")
+            tm += len(recs)
+
+            if recs:
+                i, s = upsert(sb, recs, schema, args.dry_run, loader)
+                tu += i
+                ts += s
+                logger.info(f"   Upserted: {i}  Errors: {s}")
+
+            time.sleep(0.5)
+
+        if loader is not None:
+            ins, upd, prot = loader.merge()
+            tu = ins + upd
+            logger.info(f"\nBulk merge: inserted={ins}  updated={upd}  kept admin fields={prot}")
+
+    # A run with gaps must not count as a sweep: leave it unfinished
+    if failed_requests or ts:
+        if run_id:
+            logger.warning(f"Seed run {run_id} left unfinished: {failed_requests} failed requests, {ts} errors")
+    else:
+        finish_run(sb, run_id, logger)
 
     logger.info("\n" + "=" * 60)
-    logger.info(f"DONE  fetched={tf}  mapped={tm}  upserted={tu}  errors={ts}")
+    logger.info(f"DONE  fetched={tf}  mapped={tm}  upserted={tu}  errors={ts}  failed requests={failed_requests}")
     if args.dry_run:
         logger.info("(DRY RUN — nothing written to Supabase)")
     else:
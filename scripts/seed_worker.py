@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+seed_worker.py — Sharded seeding through a lease-based work queue.
+
+A sweep becomes a set of independent work units, one searchNearby each:
+
+    (anchor, tile, types)
+      anchor  a named centre + radius (campus, a second city, …)
+      tile    one of the small circles covering the anchor's circle — every
+              tile gets its own top-20, so dense areas are not cut off at 20
+      types   one Google type, or with --batch-types one category's types
+              (classified locally like seed_offcampus_v2.py --batch-types)
+
+`enqueue` opens a seed_runs row per anchor and queues its units (see
+work_queue.py for the SQLite / Postgres backends). Start any number of
+`work` processes, here or on other machines pointing at the same queue:
+each claims a unit under a lease, waits for a token from the shared rate
+budget, fetches, maps with the v2 mappers, merges through the column-policy
+merge and records completion. A crashed worker's unit is re-claimed when
+its lease expires; a unit whose fetch or merge failed is retried. The
+worker that completes a run's last unit marks the seed run finished, so
+sweep_places.py only ever sees complete runs.
+
+Usage:
+    python scripts/seed_worker.py enqueue --anchor christ=12.9345,77.6069,3000 --tile-radius 750
+    python scripts/seed_worker.py enqueue --anchor a=12.97,77.59,4000 --anchor b=13.03,77.56,3000 --batch-types
+    python scripts/seed_worker.py work --budget-per-minute 120      # run N of these
+    python scripts/seed_worker.py status
+    python scripts/seed_worker.py retry --run-id 42                 # requeue a run's failed units
+    python scripts/seed_worker.py work --queue postgres             # shared queue (DATABASE_URL)
+"""
+
+import argparse
+import logging
+import math
+import os
+import socket
+import time
+from contextlib import nullcontext
+
+from supabase import create_client  # pyre-ignore[21]
+
+from geocell import METRES_PER_DEG_LAT
+from place_record import load_places_schema, merge_rows, validated_rows
+from raw_archive import RawArchive
+from seed_common import CAMPUS_LAT, CAMPUS_LNG, load_env, parse_anchor, setup_logging
+from seed_offcampus_v2 import (
+    DATA_SOURCE,
+    DEFAULT_TYPES,
+    GOOGLE_TYPE_MAP,
+    classify,
+    fetch_nearby,
+    map_record,
+    type_batches,
+)
+from seed_runs import finish_run, start_run
+from work_queue import open_queue
+
+logger = logging.getLogger("seed_worker")
+
+DEFAULT_TILE_RADIUS = 750
+DEFAULT_LEASE_S = 300
+RATE_BUDGET = "places_api"
+IDLE_POLL_S = 10
+
+
+# ─── Planning ────────────────────────────────────────────────────────────────
+
+def plan_tiles(lat: float, lng: float, radius_m: int, tile_radius_m: int) -> list[tuple[str, float, float]]:
+    """
+    (tile id, lat, lng) of a square grid of tile circles covering the anchor
+    circle. Spacing r·√2 makes each tile circle circumscribe its grid square.
+    """
+    if tile_radius_m >= radius_m:
+        return [("t0_0", lat, lng)]
+    step = tile_radius_m * math.sqrt(2)
+    n = math.ceil(radius_m / step)
+    m_per_deg_lng = METRES_PER_DEG_LAT * math.cos(math.radians(lat))
+    tiles = []
+    for i in range(-n, n + 1):
+        for j in range(-n, n + 1):
+            dx, dy = i * step, j * step
+            if math.hypot(dx, dy) <= radius_m + tile_radius_m:
+                tiles.append((f"t{i}_{j}", lat + dy / METRES_PER_DEG_LAT, lng + dx / m_per_deg_lng))
+    return tiles
+
+
+def enqueue(args, queue, sb) -> None:
+    types = [t.strip() for t in args.categories.split(",")] if args.categories else DEFAULT_TYPES
+    unknown = [t for t in types if t not in GOOGLE_TYPE_MAP]
+    if unknown:
+        raise SystemExit(f"Unknown types: {unknown}")
+    batches = type_batches(types) if args.batch_types else [[t] for t in types]
+    anchors = [parse_anchor(a) for a in args.anchor] or [("campus", CAMPUS_LAT, CAMPUS_LNG, 3000)]
+
+    for name, lat, lng, radius in anchors:
+        # Every default type over every tile: a complete run, fit for pruning
+        full = not args.categories and not args.batch_types
+        run_id = None if args.dry_run else start_run(sb, DATA_SOURCE, lat, lng, radius, full, logger)
+        tiles = plan_tiles(lat, lng, radius, args.tile_radius)
+        units = [
+            {"run_id": run_id, "anchor": name, "tile": tile, "types": batch, "classified": args.batch_types,
+             "lat": round(tlat, 7), "lng": round(tlng, 7), "radius_m": min(args.tile_radius, radius)}
+            for tile, tlat, tlng in tiles
+            for batch in batches
+        ]
+        if args.dry_run:
+            logger.info(f"[DRY RUN] {name}: {len(tiles)} tiles × {len(batches)} type batches = {len(units)} units")
+            continue
+        added = queue.enqueue(units)
+        logger.info(f"{name} (run {run_id}): queued {added} units ({len(tiles)} tiles × {len(batches)} type batches)")
+
+
+# ─── Working ─────────────────────────────────────────────────────────────────
+
+def process_unit(unit: dict, sb, schema, api_key: str, archive: RawArchive | None) -> dict:
+    """Fetch, map and merge one unit. Returns its result counters.
+
+    Raises if the fetch or any row failed, so the unit is retried and its
+    run (which the sweep may prune by) is not finished on partial results.
+    """
+    types = unit["types"]
+    raw = fetch_nearby(api_key, types, unit["lat"], unit["lng"], unit["radius_m"])
+    if raw is None:
+        raise RuntimeError("nearby search failed")
+    if archive is not None:
+        archive.write(types, raw, anchor={"lat": unit["lat"], "lng": unit["lng"],
+                                          "radius_m": unit["radius_m"]}, run_id=unit["run_id"],
+                      classified=unit["classified"])
+    # --batch-types classifies every place, single-type batches included (as the v2 seeder does)
+    recs = [r for r in (map_record(p, classify(p, types) if unit["classified"] else types[0], api_key)
+                        for p in raw) if r]
+    for r in recs:
+        if unit["run_id"]:
+            r.last_seen_run = unit["run_id"]
+    rows = validated_rows(recs, schema, logger)
+    inserted = updated = failed = 0
+    if rows:
+        inserted, updated, _, failed = merge_rows(sb, rows, logger)
+    failed += len(recs) - len(rows)
+    if failed:
+        raise RuntimeError(f"{failed} of {len(recs)} rows not written")
+    return {"fetched": len(raw), "mapped": len(recs), "inserted": inserted, "updated": updated}
+
+
+def work(args, queue, sb, sb_url: str, sb_key: str, api_key: str) -> None:
+    worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    schema = load_places_schema(sb_url, sb_key)
+    done = 0
+    logger.info(f"Worker {worker_id}: budget {args.budget_per_minute}/min shared across workers")
+
+    # One archive file per worker; each line records its unit's tile and run
+    with (
+        nullcontext() if args.no_archive else RawArchive(DATA_SOURCE, 0, 0, 0, None, logger, tag=worker_id)
+    ) as archive:
+        while args.max_units is None or done < args.max_units:
+            unit = queue.claim(worker_id, args.lease_seconds)
+            if unit is None:
+                if not args.wait:
+                    break
+                time.sleep(IDLE_POLL_S)
+                continue
+
+            while (wait := queue.acquire(RATE_BUDGET, args.budget_per_minute)) > 0:
+                time.sleep(wait)
+
+            label = f"{unit['anchor']}/{unit['tile']}/{','.join(unit['types'])}"
+            try:
+                result = process_unit(unit, sb, schema, api_key, archive)
+            except Exception as e:
+                logger.warning(f"{label} failed (attempt {unit['attempts']}): {e}")
+                queue.fail(unit, worker_id, str(e))
+                continue
+
+            if not queue.complete(unit, worker_id, result):
+                logger.warning(f"{label}: lease expired before completion; another worker may redo it")
+            done += 1
+            logger.info(f"{label}: " + " ".join(f"{k}={v}" for k, v in result.items()))
+            if unit["run_id"] and queue.remaining(unit["run_id"]) == 0:
+                finish_run(sb, unit["run_id"], logger)
+                logger.info(f"Run {unit['run_id']} complete.")
+    logger.info(f"Worker {worker_id}: {done} units done.")
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sharded seeding through a lease-based work queue.")
+    parser.add_argument("command", choices=["enqueue", "work", "status", "retry"])
+    parser.add_argument("--queue", type=str, default=None,
+                        help="SQLite path (default data/seed_queue.sqlite), 'postgres' (DATABASE_URL) or a postgresql:// URL.")
+    # enqueue
+    parser.add_argument("--anchor", action="append", default=[],
+                        help="name=lat,lng,radius_m (repeatable). Default: campus=12.9345,77.6069,3000.")
+    parser.add_argument("--tile-radius", type=int, default=DEFAULT_TILE_RADIUS,
+                        help=f"Tile circle radius in metres. Default: {DEFAULT_TILE_RADIUS}.")
+    parser.add_argument("--categories", type=str, default="", help="Comma-separated Google types. Default: v2 DEFAULT_TYPES.")
+    parser.add_argument("--batch-types", action="store_true", help="One unit per category instead of per type.")
+    # work
+    parser.add_argument("--budget-per-minute", type=float, default=60,
+                        help="API requests per minute across ALL workers on this queue. Default: 60.")
+    parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_S,
+                        help=f"Lease per claimed unit. Default: {DEFAULT_LEASE_S}.")
+    parser.add_argument("--max-units", type=int, default=None, help="Stop after this many units.")
+    parser.add_argument("--wait", action="store_true", help="Keep polling when the queue is empty.")
+    parser.add_argument("--worker-id", type=str, default=None, help="Default: hostname-pid.")
+    parser.add_argument("--no-archive", action="store_true", help="Do not archive raw API responses.")
+    parser.add_argument("--dry-run", action="store_true", help="enqueue: print the plan only.")
+    # retry
+    parser.add_argument("--run-id", type=int, default=None, help="retry: the run whose failed units to requeue.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    if args.budget_per_minute <= 0:
+        parser.error("--budget-per-minute must be positive")
+
+    if args.command == "status":
+        load_env(logger)
+        with open_queue(args.queue, os.getenv("DATABASE_URL"), logger) as queue:
+            for row in queue.status():
+                logger.info(f"run {row['run_id']}: {row['status']:8s} {row['n']}")
+        return
+
+    if args.command == "retry":
+        if args.run_id is None:
+            parser.error("retry needs --run-id")
+        load_env(logger)
+        with open_queue(args.queue, os.getenv("DATABASE_URL"), logger) as queue:
+            logger.info(f"Run {args.run_id}: {queue.retry(args.run_id)} failed units requeued.")
+        return
+
+    names = ["SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY"]
+    if args.command == "work":
+        names.insert(0, "GOOGLE_PLACES_API_KEY")
+    values = load_env(logger, *names)
+    api_key = values.pop(0) if args.command == "work" else ""
+    sb_url, sb_key = values
+    sb = create_client(sb_url, sb_key)
+
+    with open_queue(args.queue, os.getenv("DATABASE_URL"), logger) as queue:
+        if args.command == "enqueue":
+            enqueue(args, queue, sb)
+        else:
+            work(args, queue, sb, sb_url, sb_key, api_key)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+sweep_places.py — Sweep phase of mark-and-sweep for the places table.
+
+Seeders stamp every place they write with `last_seen_run`. This job calls
+sweep_places() (migration 022), which in one UPDATE:
+
+  - archives places Google reports as CLOSED_PERMANENTLY;
+  - archives places that --missed-runs finished full-sweep runs covering
+    their location did not return, unless the ID refreshers
+    (refresh_existing.py, refresh_scheduler.py, prewarm_details.py) have
+    fetched them since those runs started (migration 033);
+  - restores previously swept places that have reappeared or reopened.
+
+Manual overrides and on-campus rows are never touched. With --action flag,
+rows only get `archive_reason` set and stay visible for admin review.
+
+Usage:
+    python scripts/sweep_places.py --dry-run
+    python scripts/sweep_places.py --missed-runs 3
+    python scripts/sweep_places.py --action flag --verbose
+"""
+
+import argparse
+import logging
+
+from supabase import create_client  # pyre-ignore[21]
+
+from seed_common import load_env, setup_logging
+
+logger = logging.getLogger("sweep_places")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive or flag closed and vanished places.")
+    parser.add_argument("--missed-runs", type=int, default=3,
+                        help="Full-sweep runs a place may be missing from before it is swept. Default: 3.")
+    parser.add_argument("--action", choices=("archive", "flag"), default="archive",
+                        help="archive (hide from lists) or flag (mark only). Default: archive.")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change; write nothing.")
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging.")
+    args = parser.parse_args()
+
+    setup_logging(logger, args.verbose)
+    sb_url, sb_key = load_env(logger, "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+    sb = create_client(sb_url, sb_key)
+
+    result = sb.rpc("sweep_places", {
+        "p_missed_runs": args.missed_runs,
+        "p_action": args.action,
+        "p_dry_run": args.dry_run,
+    }).execute()
+
+    rows = result.data or []
+    verb = "would change" if args.dry_run else "changed"
+    if not rows:
+        logger.info(f"Sweep: nothing {verb}.")
+    for row in rows:
+        logger.info(f"Sweep ({args.action}): {row['reason']:<20} {row['place_count']} places {verb}")
+
+
+if __name__ == "__main__":
+    main()
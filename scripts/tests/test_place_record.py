@@ -0,0 +1,72 @@
+"""remap.py mapping: PlaceRecords survive its worker processes and match what the seeders wrote."""
+
+import json
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import remap  # noqa: E402
+import seed_offcampus_v2  # noqa: E402
+import seed_study_spots  # noqa: E402
+from place_record import UNSET, PlaceRecord  # noqa: E402
+
+
+def test_unset_unpickles_to_singleton():
+    assert pickle.loads(pickle.dumps(UNSET)) is UNSET
+    record = pickle.loads(pickle.dumps(PlaceRecord(name="Cafe Test", rating=4.2)))
+    assert record.to_row() == {"name": "Cafe Test", "rating": 4.2}
+
+
+def test_map_lines_in_process_pool_keeps_unset_columns_out():
+    place = {
+        "id": "gid1", "displayName": {"text": "Cafe Test"}, "types": ["cafe"],
+        "location": {"latitude": 12.935, "longitude": 77.607},
+    }
+    line = json.dumps({"data_source": seed_offcampus_v2.DATA_SOURCE, "types": ["cafe"],
+                       "fetched_at": "2026-01-01T00:00:00+00:00", "places": [place]})
+    expected = set(remap.map_lines([line], "key")[0][2].to_row())
+
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        [mapped] = list(pool.map(partial(remap.map_lines, api_key="key"), [[line]]))
+    row = mapped[0][2].to_row()
+    assert set(row) == expected
+    assert "is_veg" not in row and "osm_id" not in row
+
+
+def test_map_lines_classifies_flagged_single_type_batches():
+    place = {
+        "id": "gid2", "displayName": {"text": "Cafe Test"}, "primaryType": "cafe", "types": ["cafe", "library"],
+        "location": {"latitude": 12.935, "longitude": 77.607},
+    }
+    entry = {"data_source": seed_offcampus_v2.DATA_SOURCE, "types": ["library"],
+             "fetched_at": "2026-01-01T00:00:00+00:00", "places": [place]}
+    [(_, _, plain)] = remap.map_lines([json.dumps(entry)], "key")
+    [(_, _, classified)] = remap.map_lines([json.dumps({**entry, "classified": True})], "key")
+    assert plain.type == seed_offcampus_v2.GOOGLE_TYPE_MAP["library"][1]
+    assert classified.type == seed_offcampus_v2.GOOGLE_TYPE_MAP["cafe"][1]
+
+
+def _latest(lines: list[str]) -> dict:
+    latest = {}
+    for gid, rank, record in remap.map_lines(lines, "key"):
+        if gid not in latest or remap.pick((rank, record), latest[gid]):
+            latest[gid] = (rank, record)
+    return {gid: record for gid, (_, record) in latest.items()}
+
+
+def test_deduped_runs_keep_the_first_response_and_the_latest_run():
+    place = {"id": "gid3", "displayName": {"text": "Reading Room"},
+             "location": {"latitude": 12.935, "longitude": 77.607}}
+
+    def line(run_id: int, gtype: str, at: str) -> str:
+        return json.dumps({"data_source": seed_study_spots.DATA_SOURCE, "run_id": run_id, "types": [gtype],
+                           "fetched_at": at, "deduped": True, "places": [place]})
+
+    run1 = [line(1, "library", "2026-01-01T00:00:00"), line(1, "cafe", "2026-01-01T00:01:00")]
+    assert _latest(run1)["gid3"].sub_type == "library"
+    run2 = [line(2, "cafe", "2026-02-01T00:00:00"), line(2, "library", "2026-02-01T00:01:00")]
+    assert _latest(run1 + run2)["gid3"].sub_type == "cafe"
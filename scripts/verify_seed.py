@@ -18,6 +18,8 @@ from pathlib import Path
 from dotenv import load_dotenv  # pyre-ignore[21]
 from supabase import create_client, Client  # pyre-ignore[21]
 
+from dedupe_places import DEFAULT_MAX_DISTANCE_M, DEFAULT_THRESHOLD, find_clusters, load_places
+
 logger = logging.getLogger("verify_seed")
 
 # Minimum expected places per category
@@ -106,21 +108,20 @@ def run_checks(supabase: Client, verbose: bool) -> None:
     null_geo_count = null_geo.count or 0
     check("No NULL lat/lng", null_geo_count == 0, f"{null_geo_count} places with NULL lat")
 
-    # ── Check 3: No duplicate google_place_id ────────────────────────────────
-    # We check by counting all non-null google_place_ids vs distinct count
-    all_gpi = (
-        supabase.table("places")
-        .select("google_place_id", count="exact")
-        .not_.is_("google_place_id", "null")
-        .execute()
-    )
-    all_gpi_count = all_gpi.count or 0
-    # Since google_place_id has a UNIQUE index, duplicates would fail on insert
+    # ── Check 3: No duplicate listings ───────────────────────────────────────
+    # google_place_id is UNIQUE, so exact repeats cannot exist; duplicates are
+    # the same place listed twice under different (or no) ids. Same matcher
+    # as dedupe_places.py.
+    clusters = find_clusters(load_places(supabase), DEFAULT_MAX_DISTANCE_M, DEFAULT_THRESHOLD)
+    dupes = sum(len(c["drop"]) for c in clusters)
     check(
-        "No duplicate google_place_id",
-        True,
-        f"{all_gpi_count} unique google_place_ids (enforced by UNIQUE index)",
+        "No duplicate listings",
+        not clusters,
+        f"{dupes} likely duplicates in {len(clusters)} clusters (run dedupe_places.py)" if clusters else "clean",
     )
+    if verbose:
+        for c in clusters[:10]:
+            logger.debug("      " + " | ".join(m["name"] for m in c["members"]))
 
     # ── Check 4: Categories have minimum places ─────────────────────────────
     for cat in EXPECTED_CATEGORIES:
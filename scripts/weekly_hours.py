@@ -0,0 +1,141 @@
+"""
+weekly_hours.py — Weekly opening-hours bitmap shared by the UniEasy seeders.
+
+Google's `regularOpeningHours.periods` are folded into a 672-bit mask: one
+bit per 15-minute slot of the week, starting Sunday 00:00 (Google numbers
+days 0=Sunday … 6=Saturday). A slot is set when the place is open for any
+part of it.
+
+The mask is written to `places.opening_hours_mask` (BIT(672)) as a string of
+'0'/'1' characters where character N is slot N — the same order Postgres
+uses for `get_bit()`. Open-now and open-late filtering is then one bit test
+per row, either in SQL (`places_open_at()`, migration 016) or in Python via
+`filter_open()`.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES   # 96
+WEEK_SLOTS = 7 * SLOTS_PER_DAY            # 672
+WEEK_MINUTES = 7 * 24 * 60
+
+# Periods are in the place's local time. Every seeded place is in Bangalore,
+# and IST has no DST, so a fixed offset is exact.
+CAMPUS_TZ = timezone(timedelta(hours=5, minutes=30))
+
+
+def _point_minutes(point: dict) -> int:
+    """Minutes since Sunday 00:00 for a period open/close point."""
+    return (
+        int(point.get("day", 0)) * 24 * 60
+        + int(point.get("hour", 0)) * 60
+        + int(point.get("minute", 0))
+    )
+
+
+def periods_to_mask(periods: list[dict] | None) -> int | None:
+    """
+    Fold Google opening-hours periods into an int whose bit N is slot N.
+    Returns None when there are no periods (hours unknown).
+    """
+    if not periods:
+        return None
+
+    mask = 0
+    for period in periods:
+        open_pt = period.get("open")
+        if not open_pt:
+            continue
+        close_pt = period.get("close")
+        # A lone period opening Sunday 00:00 with no close means open 24/7.
+        if close_pt is None:
+            return (1 << WEEK_SLOTS) - 1
+
+        start = _point_minutes(open_pt)
+        end = _point_minutes(close_pt)
+        if end <= start:
+            end += WEEK_MINUTES   # wraps past Saturday midnight
+
+        first = start // SLOT_MINUTES
+        last = -(-end // SLOT_MINUTES)   # ceil: partially-open slots count
+        for slot in range(first, last):
+            mask |= 1 << (slot % WEEK_SLOTS)
+
+    return mask
+
+
+def mask_to_bits(mask: int) -> str:
+    """Render a mask as the BIT(672) literal Postgres expects (slot 0 first)."""
+    return format(mask, f"0{WEEK_SLOTS}b")[::-1]
+
+
+def bits_to_mask(bits: str | None) -> int | None:
+    """Parse a BIT(672) value as returned by PostgREST back into an int."""
+    if not bits:
+        return None
+    return int(bits[::-1], 2)
+
+
+def opening_hours_mask(place: dict) -> str | None:
+    """
+    Build the opening_hours_mask column value for a Places API (New) result.
+    Prefers regularOpeningHours; currentOpeningHours is used as a fallback
+    because it can carry holiday exceptions for the current week only.
+    """
+    for key in ("regularOpeningHours", "currentOpeningHours"):
+        hours = place.get(key) or {}
+        mask = periods_to_mask(hours.get("periods"))
+        if mask is not None:
+            return mask_to_bits(mask)
+    return None
+
+
+# ─── Query helpers ────────────────────────────────────────────────────────────
+
+def week_slot(at: datetime | None = None) -> int:
+    """Slot index for a moment in time (defaults to now), in campus local time."""
+    local = (at or datetime.now(timezone.utc)).astimezone(CAMPUS_TZ)
+    day = (local.weekday() + 1) % 7   # Python Monday=0 → Google Sunday=0
+    return day * SLOTS_PER_DAY + (local.hour * 60 + local.minute) // SLOT_MINUTES
+
+
+def window_mask(
+    start: tuple[int, int],
+    end: tuple[int, int],
+    days: Iterable[int] = range(7),
+) -> int:
+    """
+    Query mask covering local time start→end (hour, minute) on the given days.
+    An end earlier than start runs past midnight, e.g. window_mask((22, 0), (2, 0))
+    is "open late".
+    """
+    mask = 0
+    for day in days:
+        open_pt = {"day": day, "hour": start[0], "minute": start[1]}
+        close_pt = {"day": day, "hour": end[0], "minute": end[1]}
+        if _point_minutes(close_pt) <= _point_minutes(open_pt):
+            close_pt["day"] = (day + 1) % 7
+        mask |= periods_to_mask([{"open": open_pt, "close": close_pt}]) or 0
+    return mask
+
+
+def filter_open(
+    rows: Iterable[dict],
+    at: datetime | None = None,
+    query_mask: int | None = None,
+    column: str = "opening_hours_mask",
+) -> list[dict]:
+    """
+    Batch filter rows to those open at `at` (default: now), or — when
+    `query_mask` is given — open during any slot of that mask. Rows with no
+    known hours are excluded.
+    """
+    probe = query_mask if query_mask is not None else 1 << week_slot(at)
+    matched: list[dict] = []
+    for row in rows:
+        mask = bits_to_mask(row.get(column))
+        if mask is not None and mask & probe:
+            matched.append(row)
+    return matched
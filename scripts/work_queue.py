@@ -0,0 +1,321 @@
+"""
+work_queue.py — Lease-based work queue for sharded seeding.
+
+A sweep is split into work units — one searchNearby per (anchor, tile,
+types) — that any number of seed_worker.py processes, on any number of
+machines, claim and complete:
+
+  claim     take the oldest pending unit, or one whose lease has expired
+            (its worker crashed), and lease it for `lease_s` seconds
+  complete  record the result; only the current lease holder may
+  fail      release the unit for another attempt, or mark it failed after
+            MAX_ATTEMPTS
+  retry     put a run's failed units back to pending with fresh attempts
+            (its run stays unfinished until every unit is done)
+
+Workers also draw from a shared token bucket (`acquire`) so that together
+they stay within one API request budget, however many are running.
+
+Two backends share the logic: SqliteQueue (a local file; processes on one
+machine) and PostgresQueue (tables from migration 024; many machines,
+claims use FOR UPDATE SKIP LOCKED). open_queue() picks one from a spec:
+
+    data/seed_queue.sqlite       SQLite file (default)
+    postgres                     DATABASE_URL
+    postgresql://…               that connection string
+"""
+
+import json
+import logging
+import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+DEFAULT_QUEUE = Path(__file__).resolve().parent.parent / "data" / "seed_queue.sqlite"
+MAX_ATTEMPTS = 3
+
+UNIT_COLUMNS = "id, run_id, anchor, tile, types, classified, lat, lng, radius_m, attempts"
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seed_work_units (
+  id           INTEGER PRIMARY KEY AUTOINCREMENT,
+  unit_key     TEXT    NOT NULL UNIQUE,
+  run_id       INTEGER,
+  anchor       TEXT    NOT NULL,
+  tile         TEXT    NOT NULL,
+  types        TEXT    NOT NULL,
+  classified   INTEGER NOT NULL DEFAULT 0,
+  lat          REAL    NOT NULL,
+  lng          REAL    NOT NULL,
+  radius_m     INTEGER NOT NULL,
+  status       TEXT    NOT NULL DEFAULT 'pending',
+  attempts     INTEGER NOT NULL DEFAULT 0,
+  leased_by    TEXT,
+  lease_until  REAL,
+  finished_at  REAL,
+  result       TEXT,
+  last_error   TEXT,
+  created_at   REAL    NOT NULL DEFAULT (strftime('%s', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_seed_work_units_run ON seed_work_units(run_id, status);
+CREATE TABLE IF NOT EXISTS seed_rate_budget (
+  name         TEXT PRIMARY KEY,
+  tokens       REAL NOT NULL,
+  refilled_at  REAL NOT NULL
+);
+"""
+
+
+def unit_key(anchor: str, tile: str, types: list[str], run_id: int | None) -> str:
+    return f"{anchor}/{tile}/{','.join(types)}@{run_id if run_id is not None else '-'}"
+
+
+class WorkQueue(ABC):
+    """Queue operations; subclasses supply the connection and value conversions."""
+
+    LOCK = ""          # row-locking suffixes for the claim and budget SELECTs
+    BUDGET_LOCK = ""
+
+    def __init__(self, log: logging.Logger) -> None:
+        self.log = log
+
+    # ── backend hooks ──
+    @abstractmethod
+    def _tx(self) -> Iterator:
+        """Context manager yielding a cursor inside one transaction."""
+
+    def _sql(self, sql: str) -> str:
+        return sql
+
+    def _ts(self, dt: datetime) -> object:
+        return dt
+
+    def _from_ts(self, value: object) -> datetime:
+        return value
+
+    def _json(self, value: dict) -> object:
+        return json.dumps(value)
+
+    def _exec(self, cur, sql: str, params: tuple = ()) -> None:
+        cur.execute(self._sql(sql), params)
+
+    # ── operations ──
+    def enqueue(self, units: list[dict]) -> int:
+        """Add units (dicts with run_id, anchor, tile, types, classified, lat, lng, radius_m); returns how many were new."""
+        added = 0
+        with self._tx() as cur:
+            for u in units:
+                self._exec(cur, """
+                    INSERT INTO seed_work_units
+                           (unit_key, run_id, anchor, tile, types, classified, lat, lng, radius_m)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (unit_key) DO NOTHING
+                """, (unit_key(u["anchor"], u["tile"], u["types"], u["run_id"]), u["run_id"],
+                      u["anchor"], u["tile"], ",".join(u["types"]), bool(u.get("classified")),
+                      u["lat"], u["lng"], u["radius_m"]))
+                added += cur.rowcount
+        return added
+
+    def claim(self, worker_id: str, lease_s: float) -> dict | None:
+        """Lease the next claimable unit to worker_id, or return None if there is none."""
+        now = datetime.now(timezone.utc)
+        with self._tx() as cur:
+            # Expired leases that used up their attempts are not retried
+            self._exec(cur, """
+                UPDATE seed_work_units
+                   SET status = 'failed', leased_by = NULL
+                 WHERE status = 'leased' AND lease_until < %s AND attempts >= %s
+            """, (self._ts(now), MAX_ATTEMPTS))
+            self._exec(cur, f"""
+                SELECT {UNIT_COLUMNS}
+                  FROM seed_work_units
+                 WHERE status = 'pending' OR (status = 'leased' AND lease_until < %s)
+                 ORDER BY id
+                 LIMIT 1{self.LOCK}
+            """, (self._ts(now),))
+            row = cur.fetchone()
+            if row is None:
+                return None
+            unit = dict(row)
+            self._exec(cur, """
+                UPDATE seed_work_units
+                   SET status = 'leased', leased_by = %s, lease_until = %s, attempts = attempts + 1
+                 WHERE id = %s
+            """, (worker_id, self._ts(now + timedelta(seconds=lease_s)), unit["id"]))
+        unit["types"] = unit["types"].split(",")
+        unit["classified"] = bool(unit["classified"])
+        unit["lat"], unit["lng"] = float(unit["lat"]), float(unit["lng"])
+        unit["attempts"] += 1
+        return unit
+
+    def complete(self, unit: dict, worker_id: str, result: dict) -> bool:
+        """Mark a unit done. False if worker_id no longer holds its lease."""
+        with self._tx() as cur:
+            self._exec(cur, """
+                UPDATE seed_work_units
+                   SET status = 'done', finished_at = %s, result = %s, lease_until = NULL
+                 WHERE id = %s AND leased_by = %s AND status = 'leased'
+            """, (self._ts(datetime.now(timezone.utc)), self._json(result), unit["id"], worker_id))
+            return cur.rowcount == 1
+
+    def fail(self, unit: dict, worker_id: str, error: str) -> None:
+        """Release a unit for retry, or mark it failed after MAX_ATTEMPTS."""
+        status = "failed" if unit["attempts"] >= MAX_ATTEMPTS else "pending"
+        with self._tx() as cur:
+            self._exec(cur, """
+                UPDATE seed_work_units
+                   SET status = %s, last_error = %s, leased_by = NULL, lease_until = NULL
+                 WHERE id = %s AND leased_by = %s
+            """, (status, error[:500], unit["id"], worker_id))
+
+    def retry(self, run_id: int) -> int:
+        """Reset a run's failed units to pending with zero attempts; returns how many."""
+        with self._tx() as cur:
+            self._exec(cur, """
+                UPDATE seed_work_units
+                   SET status = 'pending', attempts = 0, leased_by = NULL, lease_until = NULL
+                 WHERE run_id = %s AND status = 'failed'
+            """, (run_id,))
+            return cur.rowcount
+
+    def remaining(self, run_id: int) -> int:
+        """Units of a run that are not done. Failed units count: that run stays incomplete."""
+        with self._tx() as cur:
+            self._exec(cur, """
+                SELECT count(*) AS n FROM seed_work_units
+                 WHERE run_id = %s AND status <> 'done'
+            """, (run_id,))
+            return cur.fetchone()["n"]
+
+    def status(self) -> list[dict]:
+        """Unit counts per run and status."""
+        with self._tx() as cur:
+            self._exec(cur, """
+                SELECT run_id, status, count(*) AS n
+                  FROM seed_work_units
+                 GROUP BY run_id, status
+                 ORDER BY run_id, status
+            """)
+            return [dict(r) for r in cur.fetchall()]
+
+    def acquire(self, name: str, per_minute: float) -> float:
+        """
+        Take one token from the shared bucket `name` (refilled at per_minute,
+        holding up to 10 s of tokens). Returns 0 if taken, else the seconds
+        to wait before trying again.
+        """
+        rate = per_minute / 60.0
+        capacity = max(1.0, rate * 10)
+        now = datetime.now(timezone.utc)
+        with self._tx() as cur:
+            self._exec(cur, """
+                INSERT INTO seed_rate_budget (name, tokens, refilled_at)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (name) DO NOTHING
+            """, (name, capacity, self._ts(now)))
+            self._exec(cur, f"""
+                SELECT tokens, refilled_at FROM seed_rate_budget WHERE name = %s{self.BUDGET_LOCK}
+            """, (name,))
+            row = cur.fetchone()
+            elapsed = max((now - self._from_ts(row["refilled_at"])).total_seconds(), 0.0)
+            tokens = min(capacity, row["tokens"] + elapsed * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._exec(cur, """
+                UPDATE seed_rate_budget SET tokens = %s, refilled_at = %s WHERE name = %s
+            """, (tokens, self._ts(now), name))
+        return wait
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "WorkQueue":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class SqliteQueue(WorkQueue):
+    """Queue in a local SQLite file; safe across processes on one machine."""
+
+    def __init__(self, path: Path, log: logging.Logger) -> None:
+        super().__init__(log)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SQLITE_SCHEMA)
+        # Queue files created before units recorded `classified`
+        if "classified" not in {r["name"] for r in self.conn.execute("PRAGMA table_info(seed_work_units)")}:
+            self.conn.execute("ALTER TABLE seed_work_units ADD COLUMN classified INTEGER NOT NULL DEFAULT 0")
+
+    @contextmanager
+    def _tx(self) -> Iterator:
+        cur = self.conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")   # take the write lock up front: claims are serialized
+        try:
+            yield cur
+            cur.execute("COMMIT")
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+
+    def _sql(self, sql: str) -> str:
+        return sql.replace("%s", "?")
+
+    def _ts(self, dt: datetime) -> object:
+        return dt.timestamp()
+
+    def _from_ts(self, value: object) -> datetime:
+        return datetime.fromtimestamp(float(value), timezone.utc)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class PostgresQueue(WorkQueue):
+    """Queue in the seed_work_units / seed_rate_budget tables (migration 024)."""
+
+    LOCK = " FOR UPDATE SKIP LOCKED"
+    BUDGET_LOCK = " FOR UPDATE"
+
+    def __init__(self, database_url: str, log: logging.Logger) -> None:
+        super().__init__(log)
+        try:
+            import psycopg  # pyre-ignore[21]
+            from psycopg.rows import dict_row  # pyre-ignore[21]
+            from psycopg.types.json import Jsonb  # pyre-ignore[21]
+        except ImportError:
+            raise SystemExit("A Postgres queue needs psycopg 3: pip install -r scripts/requirements.txt")
+        self._jsonb = Jsonb
+        self.conn = psycopg.connect(database_url, autocommit=True, row_factory=dict_row)
+
+    @contextmanager
+    def _tx(self) -> Iterator:
+        with self.conn.transaction():
+            with self.conn.cursor() as cur:
+                yield cur
+
+    def _json(self, value: dict) -> object:
+        return self._jsonb(value)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def open_queue(spec: str | None, database_url: str | None, log: logging.Logger) -> WorkQueue:
+    """SqliteQueue or PostgresQueue for a --queue value (see module docstring)."""
+    if spec and spec.startswith(("postgres://", "postgresql://")):
+        return PostgresQueue(spec, log)
+    if spec == "postgres":
+        if not database_url:
+            raise SystemExit("--queue postgres needs DATABASE_URL")
+        return PostgresQueue(database_url, log)
+    return SqliteQueue(Path(spec) if spec else DEFAULT_QUEUE, log)
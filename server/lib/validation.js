@@ -14,10 +14,16 @@ export const listQuerySchema = z.object({
     is_veg: z.enum(["true", "false"]).optional(),
     bbox: z.string().regex(/^-?\d+\.?\d*,-?\d+\.?\d*,-?\d+\.?\d*,-?\d+\.?\d*$/).optional(),
     is_on_campus: z.enum(["true", "false"]).optional(),
+    sort: z.enum(["rank", "rating", "trending", "walk"]).default("rank"),
     limit: z.coerce.number().int().min(1).max(100).default(50),
     offset: z.coerce.number().int().min(0).default(0),
 });
 
+export const facetsQuerySchema = z.object({
+    category: z.enum(VALID_CATEGORIES),
+    anchor: z.string().max(50).default("all"),
+});
+
 export const idParamSchema = z.object({
     id: z.string().uuid("Invalid place ID format"),
 });
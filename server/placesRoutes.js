@@ -11,7 +11,7 @@ import {
 } from "./lib/placesService.js";
 import logger from "./lib/logger.js";
 import { listLimiter, detailLimiter, photoLimiter } from "./middleware/rateLimiter.js";
-import { listQuerySchema, idParamSchema, photoParamSchema, searchQuerySchema } from "./lib/validation.js";
+import { listQuerySchema, idParamSchema, photoParamSchema, searchQuerySchema, facetsQuerySchema } from "./lib/validation.js";
 
 const router = Router();
 
@@ -59,12 +59,13 @@ router.get("/places", listLimiter, async (req, res) => {
             });
         }
 
-        const { category, type, sub_type, is_veg, bbox, is_on_campus, limit, offset } = parsed.data;
+        const { category, type, sub_type, is_veg, bbox, is_on_campus, sort, limit, offset } = parsed.data;
 
         // ── Build query ────────────────────────────────────────────────────────
         let query = supabaseAdmin
             .from("places")
-            .select("*", { count: "exact" });
+            .select("*", { count: "exact" })
+            .is("archived_at", null); // swept: closed / no longer listed by Google
 
         if (category) {
             query = query.eq("category", category);
@@ -102,6 +103,16 @@ router.get("/places", listLimiter, async (req, res) => {
                 .lte("lng", maxLng);
         }
 
+        // rank / trending / walk: precomputed columns (scripts/compute_ranks.py,
+        // compute_trends.py, compute_walk_times.py), all indexed; rating breaks ties
+        if (sort === "rank") {
+            query = query.order("rank_score", { ascending: false, nullsFirst: false });
+        } else if (sort === "trending") {
+            query = query.order("trend_score", { ascending: false, nullsFirst: false });
+        } else if (sort === "walk") {
+            query = query.order("walk_minutes", { ascending: true, nullsFirst: false });
+        }
+
         // Pagination
         query = query
             .order("rating", { ascending: false, nullsFirst: false })
@@ -157,6 +168,7 @@ router.get("/places/search", listLimiter, async (req, res) => {
             .from("places")
             .select("id, name, category, sub_type, type, address, rating, image_url, photo_refs, is_on_campus")
             .or(`name.ilike.${pattern},address.ilike.${pattern},sub_type.ilike.${pattern}`)
+            .is("archived_at", null)
             .order("rating", { ascending: false, nullsFirst: false })
             .limit(limit);
 
@@ -179,6 +191,47 @@ router.get("/places/search", listLimiter, async (req, res) => {
     }
 });
 
+// ═══════════════════════════════════════════════════════════════════════════════
+// GET /api/places/facets?category=food&anchor=campus — Filter-bar counts
+// Precomputed by scripts/build_facets.py (place_facets, migration 029).
+// Must be registered BEFORE /places/:id to avoid Express param conflict.
+// ═══════════════════════════════════════════════════════════════════════════════
+
+router.get("/places/facets", listLimiter, async (req, res) => {
+    try {
+        const parsed = facetsQuerySchema.safeParse(req.query);
+        if (!parsed.success) {
+            return res.status(400).json({
+                error: "Invalid query parameters",
+                details: parsed.error.flatten(),
+            });
+        }
+
+        const { category, anchor } = parsed.data;
+
+        const { data, error } = await supabaseAdmin
+            .from("place_facets")
+            .select("category, anchor, center_lat, center_lng, radius_m, place_count, facets, computed_at")
+            .eq("category", category)
+            .eq("anchor", anchor)
+            .maybeSingle();
+
+        if (error) {
+            logger.error({ err: error }, "GET /places/facets query error");
+            return res.status(500).json({ error: error.message });
+        }
+        if (!data) {
+            return res.status(404).json({ error: "No facets for this category and anchor" });
+        }
+
+        res.set("Cache-Control", "public, max-age=300");
+        return res.json({ data });
+    } catch (err) {
+        logger.error({ err }, "GET /places/facets unexpected error");
+        return res.status(500).json({ error: "Internal server error" });
+    }
+});
+
 // ═══════════════════════════════════════════════════════════════════════════════
 // GET /api/places/photo?ref=<resource_name>&maxwidth=800
 // Proxies a Google Places photo from the resource name stored in photo_refs[].ref
@@ -262,6 +315,13 @@ router.get("/places/:id", detailLimiter, async (req, res) => {
       return res.status(404).json({ error: "Not found" });
     }
 
+    // Popularity signal for scripts/refresh_scheduler.py (fire-and-forget)
+    supabaseAdmin
+      .rpc("record_place_view", { p_place_id: id })
+      .then(({ error: viewError }) => {
+        if (viewError) logger.debug({ err: viewError, id }, "record_place_view failed");
+      });
+
     // 2. If no google_place_id or manual skeleton → return as-is
     if (!place.google_place_id || place.data_source === "manual_skeleton") {
       const latency = Date.now() - start;
@@ -12,6 +12,11 @@
  *   - display_price_label → always overwritten with the range label
  *
  * Safe to re-run. Manually curated is_veg values (true/false) are preserved.
+ *
+ * Superseded for seeded rows: the Python seeders derive the same three
+ * signals while mapping (scripts/food_signals.py, kept in step with the
+ * estimators below), so this pass is only needed for rows written before
+ * that stage existed or inserted by other means.
  */
 
 import "../loadEnv.js";
@@ -0,0 +1,54 @@
+-- ============================================================================
+-- 016_opening_hours_mask.sql
+-- Structured weekly opening hours for places.
+-- Idempotent (safe to re-run).
+--
+-- opening_hours_mask holds one bit per 15-minute slot of the week (672 bits),
+-- slot 0 = Sunday 00:00 IST. Written by the Python seeders (see
+-- scripts/weekly_hours.py). `timing` stays as the human-readable summary.
+-- ============================================================================
+
+ALTER TABLE places
+  ADD COLUMN IF NOT EXISTS opening_hours_mask BIT(672);
+
+-- ── Slot index for a moment in time (campus local time) ─────────────────────
+CREATE OR REPLACE FUNCTION week_slot(p_at TIMESTAMPTZ)
+RETURNS INTEGER AS $$
+  SELECT (
+    EXTRACT(DOW FROM p_at AT TIME ZONE 'Asia/Kolkata')::INTEGER * 96
+    + EXTRACT(HOUR FROM p_at AT TIME ZONE 'Asia/Kolkata')::INTEGER * 4
+    + EXTRACT(MINUTE FROM p_at AT TIME ZONE 'Asia/Kolkata')::INTEGER / 15
+  );
+$$ LANGUAGE sql STABLE;
+
+-- ── Places open at a given moment ───────────────────────────────────────────
+-- Usage: SELECT id, name FROM places_open_at(now(), 'food');
+CREATE OR REPLACE FUNCTION places_open_at(
+  p_at       TIMESTAMPTZ DEFAULT now(),
+  p_category TEXT        DEFAULT NULL
+)
+RETURNS SETOF places AS $$
+  SELECT *
+  FROM places
+  WHERE opening_hours_mask IS NOT NULL
+    AND get_bit(opening_hours_mask, week_slot(p_at)) = 1
+    AND (p_category IS NULL OR category = p_category);
+$$ LANGUAGE sql STABLE;
+
+-- ── Places open during any slot of a query mask ─────────────────────────────
+-- Build the mask with weekly_hours.window_mask(), e.g. "open after 22:00".
+CREATE OR REPLACE FUNCTION places_open_during(
+  query_mask BIT(672),
+  p_category TEXT DEFAULT NULL
+)
+RETURNS SETOF places AS $$
+  SELECT *
+  FROM places
+  WHERE opening_hours_mask IS NOT NULL
+    AND (opening_hours_mask & query_mask) <> 0::BIT(672)
+    AND (p_category IS NULL OR category = p_category);
+$$ LANGUAGE sql STABLE;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
@@ -0,0 +1,30 @@
+-- ============================================================================
+-- 017_places_geohash_cells.sql
+-- Hierarchical spatial cell IDs (geohash) for places.
+-- Idempotent (safe to re-run).
+--
+-- Written by the seeders (scripts/geocell.py) and back-filled for existing
+-- rows by scripts/backfill_geocells.py. Viewport / nearby lookups filter on
+-- geohash_N IN (...) — or a prefix scan on geohash_7 — instead of range
+-- predicates on raw lat/lng.
+-- ============================================================================
+
+ALTER TABLE places
+  ADD COLUMN IF NOT EXISTS geohash_5 TEXT,
+  ADD COLUMN IF NOT EXISTS geohash_6 TEXT,
+  ADD COLUMN IF NOT EXISTS geohash_7 TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_places_geohash_5
+  ON places(geohash_5);
+
+CREATE INDEX IF NOT EXISTS idx_places_category_geohash_6
+  ON places(category, geohash_6);
+
+-- text_pattern_ops lets `geohash_7 LIKE 'tdr1w%'` use the index at any
+-- prefix length, not just the stored precisions.
+CREATE INDEX IF NOT EXISTS idx_places_geohash_7_prefix
+  ON places(geohash_7 text_pattern_ops);
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
@@ -0,0 +1,43 @@
+-- ============================================================================
+-- 018_place_nearby.sql
+-- Precomputed "what's nearby" relations: for each place, the k nearest
+-- places in every other category.
+-- Idempotent (safe to re-run).
+--
+-- Built by scripts/build_nearby.py after seeding. related_ids[i] is the i-th
+-- nearest place in `category`, distances_m[i] its straight-line distance.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS place_nearby (
+  place_id     UUID        NOT NULL REFERENCES places(id) ON DELETE CASCADE,
+  category     TEXT        NOT NULL,
+  related_ids  UUID[]      NOT NULL,
+  distances_m  INTEGER[]   NOT NULL,
+  computed_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (place_id, category)
+);
+
+-- Watermark lookup for incremental rebuilds
+CREATE INDEX IF NOT EXISTS idx_place_nearby_computed_at
+  ON place_nearby(computed_at DESC);
+
+-- Incremental rebuilds compare against places.updated_at
+CREATE INDEX IF NOT EXISTS idx_places_updated_at
+  ON places(updated_at);
+
+-- ── RLS: public read, service-role write (same as places) ───────────────────
+ALTER TABLE place_nearby ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read place_nearby" ON place_nearby;
+CREATE POLICY "Public read place_nearby" ON place_nearby
+  FOR SELECT
+  USING (true);
+
+DROP POLICY IF EXISTS "Service role write place_nearby" ON place_nearby;
+CREATE POLICY "Service role write place_nearby" ON place_nearby
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
@@ -0,0 +1,25 @@
+-- ============================================================================
+-- 019_places_seeder_columns.sql
+-- Columns written by seed_offcampus_v2.py / seed_study_spots.py (and read by
+-- the /places/search route) that no earlier migration created.
+-- Idempotent (safe to re-run) — a no-op on databases that already have them.
+--
+-- The seeders validate every record against the live `places` columns before
+-- writing (scripts/place_record.py), so a missing column here shows up as a
+-- schema-check error instead of a failed upsert chunk.
+-- ============================================================================
+
+ALTER TABLE places
+  ADD COLUMN IF NOT EXISTS google_maps_url     TEXT,
+  ADD COLUMN IF NOT EXISTS price_display       TEXT,
+  ADD COLUMN IF NOT EXISTS primary_photo_url   TEXT,
+  ADD COLUMN IF NOT EXISTS image_url           TEXT,
+  ADD COLUMN IF NOT EXISTS description         TEXT,
+  ADD COLUMN IF NOT EXISTS tags                TEXT[],
+  ADD COLUMN IF NOT EXISTS delivery_available  BOOLEAN,
+  ADD COLUMN IF NOT EXISTS takeaway_available  BOOLEAN,
+  ADD COLUMN IF NOT EXISTS dine_in_available   BOOLEAN;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
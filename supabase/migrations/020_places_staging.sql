@@ -0,0 +1,94 @@
+-- ============================================================================
+-- 020_places_staging.sql
+-- Bulk load path for the seeders (--bulk-load): rows are streamed into
+-- places_staging with COPY, then merged into places in one set-based
+-- INSERT … ON CONFLICT (google_place_id) per load.
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+-- One JSON document per mapped record, tagged with the load it belongs to.
+-- UNLOGGED: staged rows are transient and re-creatable from the API sweep.
+CREATE UNLOGGED TABLE IF NOT EXISTS places_staging (
+  seq        BIGSERIAL PRIMARY KEY,
+  load_id    UUID NOT NULL,
+  doc        JSONB NOT NULL,
+  staged_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_places_staging_load ON places_staging(load_id);
+
+-- Only reachable over a direct database connection; no API policies.
+ALTER TABLE places_staging ENABLE ROW LEVEL SECURITY;
+
+-- ─── Set-based merge ────────────────────────────────────────────────────────
+-- Writes exactly the columns present in the staged documents (so a load
+-- never nulls columns its seeder does not produce), keeps the last staged
+-- copy of each google_place_id, and leaves rows with
+-- is_on_campus AND is_manual_override untouched — the same rule the
+-- seeders' check_manual_override() applies one row at a time.
+-- Staged rows are deleted once merged.
+
+CREATE OR REPLACE FUNCTION merge_places_staging(p_load_id UUID)
+RETURNS TABLE (inserted BIGINT, updated BIGINT, skipped BIGINT)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  cols      TEXT[];
+  staged    BIGINT;
+BEGIN
+  SELECT array_agg(c.column_name::TEXT ORDER BY c.ordinal_position)
+    INTO cols
+    FROM information_schema.columns c
+   WHERE c.table_schema = 'public'
+     AND c.table_name = 'places'
+     AND c.column_name NOT IN ('id', 'created_at')
+     AND c.column_name IN (
+           SELECT DISTINCT k
+             FROM places_staging s, jsonb_object_keys(s.doc) k
+            WHERE s.load_id = p_load_id
+         );
+
+  IF cols IS NULL OR NOT ('google_place_id' = ANY (cols)) THEN
+    RAISE EXCEPTION 'load % has no staged rows with google_place_id', p_load_id;
+  END IF;
+
+  SELECT count(DISTINCT doc->>'google_place_id')
+    INTO staged
+    FROM places_staging
+   WHERE load_id = p_load_id;
+
+  RETURN QUERY EXECUTE format($merge$
+    WITH latest AS (
+      SELECT DISTINCT ON (doc->>'google_place_id') doc
+        FROM places_staging
+       WHERE load_id = $1
+         AND doc->>'google_place_id' IS NOT NULL
+       ORDER BY doc->>'google_place_id', seq DESC
+    ),
+    merged AS (
+      INSERT INTO places AS p (%s)
+      SELECT %s
+        FROM latest, jsonb_populate_record(NULL::places, latest.doc) r
+      ON CONFLICT (google_place_id) DO UPDATE
+         SET %s
+       WHERE p.is_on_campus IS NOT TRUE OR p.is_manual_override IS NOT TRUE
+      RETURNING (xmax = 0) AS is_insert
+    )
+    SELECT count(*) FILTER (WHERE is_insert),
+           count(*) FILTER (WHERE NOT is_insert),
+           $2 - count(*)
+      FROM merged
+  $merge$,
+    (SELECT string_agg(quote_ident(c), ', ') FROM unnest(cols) c),
+    (SELECT string_agg('r.' || quote_ident(c), ', ') FROM unnest(cols) c),
+    (SELECT string_agg(format('%1$I = EXCLUDED.%1$I', c), ', ')
+       FROM unnest(cols) c WHERE c <> 'google_place_id')
+  ) USING p_load_id, staged;
+
+  DELETE FROM places_staging WHERE load_id = p_load_id;
+END;
+$$;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
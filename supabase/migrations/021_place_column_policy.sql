@@ -0,0 +1,156 @@
+-- ============================================================================
+-- 021_place_column_policy.sql
+-- Column-level merge policy for seeder writes into places.
+--   google — refreshed from the API on every merge
+--   admin  — kept as-is once a row has is_manual_override = true
+-- Replaces the row-level "skip is_on_campus AND is_manual_override" rule:
+-- overridden rows still get fresh ratings, hours and photos, while their
+-- admin-edited fields survive. Columns not listed default to 'google'.
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS place_column_policy (
+  column_name  TEXT PRIMARY KEY,
+  owner        TEXT NOT NULL CHECK (owner IN ('google', 'admin'))
+);
+
+INSERT INTO place_column_policy (column_name, owner) VALUES
+  -- identity / classification an admin may correct
+  ('name', 'admin'), ('category', 'admin'), ('type', 'admin'), ('sub_type', 'admin'),
+  -- location (a corrected pin moves the cells and distance with it)
+  ('address', 'admin'), ('city', 'admin'), ('lat', 'admin'), ('lng', 'admin'),
+  ('geohash_5', 'admin'), ('geohash_6', 'admin'), ('geohash_7', 'admin'),
+  ('distance_from_campus', 'admin'), ('is_on_campus', 'admin'),
+  -- contact
+  ('phone', 'admin'), ('website', 'admin'),
+  -- provenance flags
+  ('is_static', 'admin'), ('is_manual_override', 'admin'), ('verified', 'admin'),
+  -- curated pricing and attributes
+  ('price_inr', 'admin'), ('price_range_min', 'admin'), ('price_range_max', 'admin'),
+  ('price_display', 'admin'), ('display_price_label', 'admin'),
+  ('is_veg', 'admin'), ('cuisine_tags', 'admin'), ('amenities', 'admin'),
+  ('has_wifi', 'admin'), ('noise_level', 'admin'), ('timing', 'admin'),
+  ('description', 'admin'), ('tags', 'admin'), ('image_url', 'admin'),
+  -- Google signals
+  ('google_place_id', 'google'), ('rating', 'google'), ('rating_count', 'google'),
+  ('business_status', 'google'), ('price_level', 'google'),
+  ('opening_hours_mask', 'google'), ('photo_refs', 'google'),
+  ('primary_photo_url', 'google'), ('google_maps_url', 'google'),
+  ('delivery_available', 'google'), ('takeaway_available', 'google'),
+  ('dine_in_available', 'google'), ('extra', 'google'),
+  ('data_source', 'google'), ('last_fetched_at', 'google'), ('updated_at', 'google')
+ON CONFLICT (column_name) DO NOTHING;
+
+ALTER TABLE place_column_policy ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read place_column_policy" ON place_column_policy;
+CREATE POLICY "Public read place_column_policy" ON place_column_policy
+  FOR SELECT
+  USING (true);
+
+DROP POLICY IF EXISTS "Service role write place_column_policy" ON place_column_policy;
+CREATE POLICY "Service role write place_column_policy" ON place_column_policy
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- ─── Policy-aware set-based merge ───────────────────────────────────────────
+-- Same shape as 020 (staged columns only, last copy of each google_place_id
+-- wins), but on conflict every admin-owned column becomes
+--   CASE WHEN p.is_manual_override THEN p.col ELSE EXCLUDED.col END
+-- Returns how many staged rows were inserted, updated, and how many of the
+-- updates kept admin-owned fields because the row is overridden.
+
+DROP FUNCTION IF EXISTS merge_places_staging(UUID);
+
+CREATE FUNCTION merge_places_staging(p_load_id UUID)
+RETURNS TABLE (inserted BIGINT, updated BIGINT, protected BIGINT)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  cols      TEXT[];
+  set_list  TEXT;
+BEGIN
+  SELECT array_agg(c.column_name::TEXT ORDER BY c.ordinal_position)
+    INTO cols
+    FROM information_schema.columns c
+   WHERE c.table_schema = 'public'
+     AND c.table_name = 'places'
+     AND c.column_name NOT IN ('id', 'created_at')
+     AND c.column_name IN (
+           SELECT DISTINCT k
+             FROM places_staging s, jsonb_object_keys(s.doc) k
+            WHERE s.load_id = p_load_id
+         );
+
+  IF cols IS NULL OR NOT ('google_place_id' = ANY (cols)) THEN
+    RAISE EXCEPTION 'load % has no staged rows with google_place_id', p_load_id;
+  END IF;
+
+  SELECT string_agg(
+           CASE WHEN pol.owner = 'admin'
+                THEN format('%1$I = CASE WHEN p.is_manual_override THEN p.%1$I ELSE EXCLUDED.%1$I END', c)
+                ELSE format('%1$I = EXCLUDED.%1$I', c)
+           END, ', ')
+    INTO set_list
+    FROM unnest(cols) c
+    LEFT JOIN place_column_policy pol ON pol.column_name = c
+   WHERE c <> 'google_place_id';
+
+  RETURN QUERY EXECUTE format($merge$
+    WITH latest AS (
+      SELECT DISTINCT ON (doc->>'google_place_id') doc
+        FROM places_staging
+       WHERE load_id = $1
+         AND doc->>'google_place_id' IS NOT NULL
+       ORDER BY doc->>'google_place_id', seq DESC
+    ),
+    overridden AS (
+      SELECT count(*) AS n
+        FROM latest
+        JOIN places o ON o.google_place_id = latest.doc->>'google_place_id'
+       WHERE o.is_manual_override
+    ),
+    merged AS (
+      INSERT INTO places AS p (%s)
+      SELECT %s
+        FROM latest, jsonb_populate_record(NULL::places, latest.doc) r
+      ON CONFLICT (google_place_id) DO UPDATE
+         SET %s
+      RETURNING (xmax = 0) AS is_insert
+    )
+    SELECT count(*) FILTER (WHERE is_insert),
+           count(*) FILTER (WHERE NOT is_insert),
+           (SELECT n FROM overridden)
+      FROM merged
+  $merge$,
+    (SELECT string_agg(quote_ident(c), ', ') FROM unnest(cols) c),
+    (SELECT string_agg('r.' || quote_ident(c), ', ') FROM unnest(cols) c),
+    set_list
+  ) USING p_load_id;
+
+  DELETE FROM places_staging WHERE load_id = p_load_id;
+END;
+$$;
+
+-- Batch entry point for the REST seeders: sb.rpc("merge_places_batch",
+-- {"p_rows": [...]}) stages one JSON array and merges it in one call.
+CREATE OR REPLACE FUNCTION merge_places_batch(p_rows JSONB)
+RETURNS TABLE (inserted BIGINT, updated BIGINT, protected BIGINT)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_load_id UUID := gen_random_uuid();
+BEGIN
+  INSERT INTO places_staging (load_id, doc)
+  SELECT v_load_id, value FROM jsonb_array_elements(p_rows);
+
+  RETURN QUERY SELECT * FROM merge_places_staging(v_load_id);
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION merge_places_batch(JSONB) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION merge_places_staging(UUID) FROM PUBLIC, anon, authenticated;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
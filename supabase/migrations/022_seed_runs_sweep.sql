@@ -0,0 +1,143 @@
+-- ============================================================================
+-- 022_seed_runs_sweep.sql
+-- Mark-and-sweep for places that closed or stopped appearing in results.
+--   mark:  every seeder run gets a seed_runs row; each place it writes
+--          carries last_seen_run = that run's id.
+--   sweep: sweep_places() archives (or flags) in one UPDATE every place
+--          Google reports CLOSED_PERMANENTLY, or that N complete runs
+--          covering its location did not return — and restores rows that
+--          have since reappeared.
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS seed_runs (
+  id           BIGSERIAL      PRIMARY KEY,
+  data_source  TEXT           NOT NULL,
+  center_lat   NUMERIC(10,7)  NOT NULL,
+  center_lng   NUMERIC(10,7)  NOT NULL,
+  radius_m     INTEGER        NOT NULL,
+  -- Every default type was queried, so absence from this run means something
+  full_sweep   BOOLEAN        NOT NULL DEFAULT false,
+  started_at   TIMESTAMPTZ    NOT NULL DEFAULT now(),
+  finished_at  TIMESTAMPTZ
+);
+
+ALTER TABLE places
+  ADD COLUMN IF NOT EXISTS last_seen_run   BIGINT REFERENCES seed_runs(id) ON DELETE SET NULL,
+  ADD COLUMN IF NOT EXISTS archived_at     TIMESTAMPTZ,
+  ADD COLUMN IF NOT EXISTS archive_reason  TEXT
+    CHECK (archive_reason IN ('closed_permanently', 'not_seen'));
+
+-- List queries only ever read live rows; keep their working set small.
+CREATE INDEX IF NOT EXISTS idx_places_live_category
+  ON places(category) WHERE archived_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_places_last_seen_run
+  ON places(last_seen_run);
+
+-- ── RLS: public read, service-role write (same as places) ───────────────────
+ALTER TABLE seed_runs ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read seed_runs" ON seed_runs;
+CREATE POLICY "Public read seed_runs" ON seed_runs
+  FOR SELECT
+  USING (true);
+
+DROP POLICY IF EXISTS "Service role write seed_runs" ON seed_runs;
+CREATE POLICY "Service role write seed_runs" ON seed_runs
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- ─── Sweep ──────────────────────────────────────────────────────────────────
+-- Desired archive_reason for every seeder-managed row (manual overrides and
+-- on-campus rows are never swept):
+--   'closed_permanently'  business_status says so
+--   'not_seen'            >= p_missed_runs finished full-sweep runs of the
+--                         row's data_source, whose radius covers the row,
+--                         ran after the row was last seen
+--   NULL                  live
+-- Only rows whose current state differs are returned.
+
+CREATE OR REPLACE FUNCTION place_sweep_changes(p_missed_runs INTEGER, p_action TEXT)
+RETURNS TABLE (place_id UUID, reason TEXT)
+LANGUAGE sql STABLE
+AS $$
+  WITH missed AS (
+    SELECT p.id, count(*) AS runs
+      FROM places p
+      JOIN seed_runs r
+        ON r.data_source = p.data_source
+       AND r.full_sweep
+       AND r.finished_at IS NOT NULL
+       AND r.id > COALESCE(p.last_seen_run, 0)
+       -- equirectangular distance is plenty at a few km
+       AND 111320 * sqrt(
+             power(p.lat - r.center_lat, 2) +
+             power((p.lng - r.center_lng) * cos(radians(r.center_lat)), 2)
+           ) <= r.radius_m
+     GROUP BY p.id
+  ),
+  verdict AS (
+    SELECT p.id, p.archived_at, p.archive_reason,
+           CASE
+             WHEN p.business_status = 'CLOSED_PERMANENTLY' THEN 'closed_permanently'
+             WHEN m.runs >= p_missed_runs                  THEN 'not_seen'
+           END AS reason
+      FROM places p
+      LEFT JOIN missed m ON m.id = p.id
+     WHERE NOT p.is_manual_override
+       AND NOT p.is_on_campus
+  )
+  SELECT v.id, v.reason
+    FROM verdict v
+   WHERE v.archive_reason IS DISTINCT FROM v.reason
+      OR (v.reason IS NOT NULL AND (v.archived_at IS NOT NULL) <> (p_action = 'archive'));
+$$;
+
+-- p_action: 'archive' sets archived_at (hidden from lists);
+--           'flag' only sets archive_reason (kept visible, for admin review).
+-- Returns one row per outcome; reason 'restored' = reappeared / reopened.
+CREATE OR REPLACE FUNCTION sweep_places(
+  p_missed_runs  INTEGER DEFAULT 3,
+  p_action       TEXT    DEFAULT 'archive',
+  p_dry_run      BOOLEAN DEFAULT false
+)
+RETURNS TABLE (reason TEXT, place_count BIGINT)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF p_action NOT IN ('archive', 'flag') THEN
+    RAISE EXCEPTION 'p_action must be archive or flag, got %', p_action;
+  END IF;
+
+  IF p_dry_run THEN
+    RETURN QUERY
+      SELECT COALESCE(c.reason, 'restored'), count(*)
+        FROM place_sweep_changes(p_missed_runs, p_action) c
+       GROUP BY 1 ORDER BY 1;
+    RETURN;
+  END IF;
+
+  RETURN QUERY
+    WITH swept AS (
+      UPDATE places p
+         SET archive_reason = c.reason,
+             archived_at = CASE
+               WHEN c.reason IS NULL OR p_action = 'flag' THEN NULL
+               ELSE COALESCE(p.archived_at, now())
+             END
+        FROM place_sweep_changes(p_missed_runs, p_action) c
+       WHERE p.id = c.place_id
+      RETURNING c.reason
+    )
+    SELECT COALESCE(s.reason, 'restored'), count(*)
+      FROM swept s
+     GROUP BY 1 ORDER BY 1;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION sweep_places(INTEGER, TEXT, BOOLEAN) FROM PUBLIC, anon, authenticated;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
@@ -0,0 +1,138 @@
+-- ============================================================================
+-- 023_place_refresh_stats.sql
+-- Inputs for the freshness-priority refresh scheduler
+-- (scripts/refresh_scheduler.py):
+--   place_views          popularity — detail views, bumped by the API server
+--   places.content_hash  hash of the Google signals at the last refresh
+--   places.refresh_count / change_count
+--                        volatility — how often a refresh changed the hash
+-- Views live in their own table so a page view never fires the places
+-- updated_at trigger (incremental jobs key off updated_at).
+-- Also makes merge_places_staging accept partial rows (refreshes send only
+-- the signals they fetched).
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+ALTER TABLE places
+  ADD COLUMN IF NOT EXISTS content_hash   TEXT,
+  ADD COLUMN IF NOT EXISTS refresh_count  INTEGER NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS change_count   INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS place_views (
+  place_id        UUID        PRIMARY KEY REFERENCES places(id) ON DELETE CASCADE,
+  view_count      BIGINT      NOT NULL DEFAULT 0,
+  last_viewed_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- ── RLS: public read, service-role write (same as places) ───────────────────
+ALTER TABLE place_views ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read place_views" ON place_views;
+CREATE POLICY "Public read place_views" ON place_views
+  FOR SELECT
+  USING (true);
+
+DROP POLICY IF EXISTS "Service role write place_views" ON place_views;
+CREATE POLICY "Service role write place_views" ON place_views
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- Called by GET /api/places/:id (fire-and-forget).
+CREATE OR REPLACE FUNCTION record_place_view(p_place_id UUID)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+  INSERT INTO place_views (place_id, view_count, last_viewed_at)
+  VALUES (p_place_id, 1, now())
+  ON CONFLICT (place_id) DO UPDATE
+     SET view_count = place_views.view_count + 1,
+         last_viewed_at = now();
+$$;
+
+-- ─── Partial-row merges ─────────────────────────────────────────────────────
+-- Postgres checks NOT NULL on the proposed row before ON CONFLICT resolves,
+-- so a refresh doc without name/category/lat/… used to fail the insert.
+-- Every column a document does not carry now comes from the existing row
+-- (LEFT JOIN o), which also means a key missing from one document of a
+-- mixed batch leaves that row's column alone instead of nulling it.
+-- Column policy, counts and return shape are unchanged from 021.
+
+CREATE OR REPLACE FUNCTION merge_places_staging(p_load_id UUID)
+RETURNS TABLE (inserted BIGINT, updated BIGINT, protected BIGINT)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  cols      TEXT[];
+  set_list  TEXT;
+BEGIN
+  SELECT array_agg(c.column_name::TEXT ORDER BY c.ordinal_position)
+    INTO cols
+    FROM information_schema.columns c
+   WHERE c.table_schema = 'public'
+     AND c.table_name = 'places'
+     AND c.column_name NOT IN ('id', 'created_at')
+     AND (c.column_name IN (
+            SELECT DISTINCT k
+              FROM places_staging s, jsonb_object_keys(s.doc) k
+             WHERE s.load_id = p_load_id
+          )
+          OR (c.is_nullable = 'NO' AND c.column_default IS NULL));
+
+  IF NOT EXISTS (
+    SELECT 1 FROM places_staging
+     WHERE load_id = p_load_id AND doc ? 'google_place_id'
+  ) THEN
+    RAISE EXCEPTION 'load % has no staged rows with google_place_id', p_load_id;
+  END IF;
+
+  SELECT string_agg(
+           CASE WHEN pol.owner = 'admin'
+                THEN format('%1$I = CASE WHEN p.is_manual_override THEN p.%1$I ELSE EXCLUDED.%1$I END', c)
+                ELSE format('%1$I = EXCLUDED.%1$I', c)
+           END, ', ')
+    INTO set_list
+    FROM unnest(cols) c
+    LEFT JOIN place_column_policy pol ON pol.column_name = c
+   WHERE c <> 'google_place_id';
+
+  RETURN QUERY EXECUTE format($merge$
+    WITH latest AS (
+      SELECT DISTINCT ON (doc->>'google_place_id') doc
+        FROM places_staging
+       WHERE load_id = $1
+         AND doc->>'google_place_id' IS NOT NULL
+       ORDER BY doc->>'google_place_id', seq DESC
+    ),
+    source AS (
+      SELECT %s, o.is_manual_override AS was_overridden
+        FROM latest
+       CROSS JOIN LATERAL jsonb_populate_record(NULL::places, latest.doc) r
+        LEFT JOIN places o ON o.google_place_id = latest.doc->>'google_place_id'
+    ),
+    merged AS (
+      INSERT INTO places AS p (%s)
+      SELECT %s FROM source
+      ON CONFLICT (google_place_id) DO UPDATE
+         SET %s
+      RETURNING (xmax = 0) AS is_insert
+    )
+    SELECT count(*) FILTER (WHERE is_insert),
+           count(*) FILTER (WHERE NOT is_insert),
+           (SELECT count(*) FROM source WHERE was_overridden)
+      FROM merged
+  $merge$,
+    (SELECT string_agg(format(
+              'CASE WHEN latest.doc ? %1$L THEN r.%2$I ELSE o.%2$I END AS %2$I', c, c), ', ')
+       FROM unnest(cols) c),
+    (SELECT string_agg(quote_ident(c), ', ') FROM unnest(cols) c),
+    (SELECT string_agg(quote_ident(c), ', ') FROM unnest(cols) c),
+    set_list
+  ) USING p_load_id;
+
+  DELETE FROM places_staging WHERE load_id = p_load_id;
+END;
+$$;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
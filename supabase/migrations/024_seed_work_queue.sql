@@ -0,0 +1,69 @@
+-- ============================================================================
+-- 024_seed_work_queue.sql
+-- Lease-based work queue for sharded seeding (scripts/seed_worker.py).
+--   seed_work_units   one row per (anchor, tile, types) search of a run;
+--                     workers claim a unit with a time-limited lease, so a
+--                     unit held by a crashed worker is re-claimed after the
+--                     lease expires.
+--   seed_rate_budget  token buckets shared by every worker, so N workers
+--                     together stay within one Places API request budget.
+-- The same schema is created in SQLite for single-machine runs.
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS seed_work_units (
+  id           BIGSERIAL      PRIMARY KEY,
+  unit_key     TEXT           NOT NULL UNIQUE,   -- anchor/tile/types@run
+  run_id       BIGINT         REFERENCES seed_runs(id) ON DELETE SET NULL,
+  anchor       TEXT           NOT NULL,
+  tile         TEXT           NOT NULL,
+  types        TEXT           NOT NULL,          -- comma-separated includedTypes
+  classified   BOOLEAN        NOT NULL DEFAULT false,   -- --batch-types: classify() each place
+  lat          NUMERIC(10,7)  NOT NULL,
+  lng          NUMERIC(10,7)  NOT NULL,
+  radius_m     INTEGER        NOT NULL,
+  status       TEXT           NOT NULL DEFAULT 'pending'
+    CHECK (status IN ('pending', 'leased', 'done', 'failed')),
+  attempts     INTEGER        NOT NULL DEFAULT 0,
+  leased_by    TEXT,
+  lease_until  TIMESTAMPTZ,
+  finished_at  TIMESTAMPTZ,
+  result       JSONB,
+  last_error   TEXT,
+  created_at   TIMESTAMPTZ    NOT NULL DEFAULT now()
+);
+
+-- Claim order: oldest claimable unit first
+CREATE INDEX IF NOT EXISTS idx_seed_work_units_claim
+  ON seed_work_units(id) WHERE status IN ('pending', 'leased');
+
+CREATE INDEX IF NOT EXISTS idx_seed_work_units_run
+  ON seed_work_units(run_id, status);
+
+-- Queues created before units recorded whether they classify
+ALTER TABLE seed_work_units
+  ADD COLUMN IF NOT EXISTS classified BOOLEAN NOT NULL DEFAULT false;
+
+CREATE TABLE IF NOT EXISTS seed_rate_budget (
+  name         TEXT              PRIMARY KEY,
+  tokens       DOUBLE PRECISION  NOT NULL,
+  refilled_at  TIMESTAMPTZ       NOT NULL DEFAULT now()
+);
+
+-- ── RLS: service role only (workers connect directly as the table owner) ────
+ALTER TABLE seed_work_units ENABLE ROW LEVEL SECURITY;
+ALTER TABLE seed_rate_budget ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role write seed_work_units" ON seed_work_units;
+CREATE POLICY "Service role write seed_work_units" ON seed_work_units
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+DROP POLICY IF EXISTS "Service role write seed_rate_budget" ON seed_rate_budget;
+CREATE POLICY "Service role write seed_rate_budget" ON seed_rate_budget
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
@@ -0,0 +1,204 @@
+-- ============================================================================
+-- 025_place_rating_history.sql
+-- Rating / review-count history and a precomputed trend score.
+--   place_rating_samples  append-only (place, time, run, rating, rating_count)
+--                         samples, written when a seed run finishes — only
+--                         for places whose values moved since their last
+--                         sample, so an unchanged place costs nothing.
+--   places.trend_score    review-velocity change, recomputed in one batch
+--                         by compute_trends() (scripts/compute_trends.py);
+--                         "trending" lists are an indexed sort on it.
+-- trend_score is derived, so writing it no longer bumps updated_at (the
+-- incremental jobs key off updated_at).
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS place_rating_samples (
+  place_id      UUID          NOT NULL REFERENCES places(id) ON DELETE CASCADE,
+  sampled_at    TIMESTAMPTZ   NOT NULL DEFAULT now(),
+  run_id        BIGINT        REFERENCES seed_runs(id) ON DELETE SET NULL,
+  rating        NUMERIC(2,1),
+  rating_count  INTEGER,
+  PRIMARY KEY (place_id, sampled_at)
+);
+
+ALTER TABLE places
+  ADD COLUMN IF NOT EXISTS trend_score  DOUBLE PRECISION;
+
+-- "Trending" lists: live rows, optionally one category, highest score first
+CREATE INDEX IF NOT EXISTS idx_places_trending
+  ON places(category, trend_score DESC NULLS LAST) WHERE archived_at IS NULL;
+
+-- ── RLS: public read, service-role write (same as places) ───────────────────
+ALTER TABLE place_rating_samples ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read place_rating_samples" ON place_rating_samples;
+CREATE POLICY "Public read place_rating_samples" ON place_rating_samples
+  FOR SELECT
+  USING (true);
+
+DROP POLICY IF EXISTS "Service role write place_rating_samples" ON place_rating_samples;
+CREATE POLICY "Service role write place_rating_samples" ON place_rating_samples
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- ─── updated_at ignores derived columns ─────────────────────────────────────
+-- Same trigger as 006, except an UPDATE that only changes columns computed
+-- from other tables (trend_score) keeps the row's updated_at.
+
+CREATE OR REPLACE FUNCTION update_places_updated_at()
+RETURNS TRIGGER AS $$
+DECLARE
+  derived CONSTANT TEXT[] := ARRAY['trend_score', 'updated_at'];
+BEGIN
+  IF (to_jsonb(NEW) - derived) = (to_jsonb(OLD) - derived) THEN
+    NEW.updated_at = OLD.updated_at;
+  ELSE
+    NEW.updated_at = now();
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ─── Sampling ───────────────────────────────────────────────────────────────
+-- Called by finish_run() (scripts/seed_runs.py). Samples every place the run
+-- wrote whose (rating, rating_count) differs from its latest sample; the
+-- series is a step function, so skipped samples lose nothing.
+
+CREATE OR REPLACE FUNCTION record_rating_samples(p_run_id BIGINT)
+RETURNS BIGINT
+LANGUAGE sql
+AS $$
+  WITH sampled AS (
+    INSERT INTO place_rating_samples (place_id, run_id, rating, rating_count)
+    SELECT p.id, p_run_id, p.rating, p.rating_count
+      FROM places p
+      LEFT JOIN LATERAL (
+        SELECT s.rating, s.rating_count
+          FROM place_rating_samples s
+         WHERE s.place_id = p.id
+         ORDER BY s.sampled_at DESC
+         LIMIT 1
+      ) last ON true
+     WHERE p.last_seen_run = p_run_id
+       AND p.rating_count IS NOT NULL
+       AND (last.rating, last.rating_count) IS DISTINCT FROM (p.rating, p.rating_count)
+    ON CONFLICT (place_id, sampled_at) DO NOTHING
+    RETURNING 1
+  )
+  SELECT count(*) FROM sampled;
+$$;
+
+-- ─── Trend score ────────────────────────────────────────────────────────────
+-- With c(t) = rating_count of the latest sample at or before t:
+--   v_recent    = (c(now) − c(now − window)) / window          reviews/day
+--   v_baseline  = (c(now − window) − c(now − window − baseline)) / baseline
+--                 (from the first sample when history is shorter)
+--   trend_score = (v_recent − v_baseline) / √(v_baseline + 1)
+--               + 2 · (rating now − rating at now − window)
+-- The √ damps big places whose velocity swings in absolute terms. Places
+-- without a sample older than the window get NULL (not enough history).
+
+CREATE OR REPLACE FUNCTION place_trend_scores(p_window_days INTEGER, p_baseline_days INTEGER)
+RETURNS TABLE (place_id UUID, trend_score DOUBLE PRECISION)
+LANGUAGE sql STABLE
+AS $$
+  WITH bounds AS (
+    SELECT now() - make_interval(days => p_window_days)                   AS t_mid,
+           now() - make_interval(days => p_window_days + p_baseline_days) AS t_old
+  ),
+  series AS (
+    SELECT s.place_id,
+           min(s.sampled_at) AS first_at,
+           (array_agg(s.rating_count ORDER BY s.sampled_at))[1]      AS c_first,
+           (array_agg(s.rating_count ORDER BY s.sampled_at DESC))[1] AS c_now,
+           (array_agg(s.rating       ORDER BY s.sampled_at DESC))[1] AS r_now,
+           (array_agg(s.rating_count ORDER BY s.sampled_at DESC)
+              FILTER (WHERE s.sampled_at <= b.t_mid))[1]             AS c_mid,
+           (array_agg(s.rating       ORDER BY s.sampled_at DESC)
+              FILTER (WHERE s.sampled_at <= b.t_mid))[1]             AS r_mid,
+           (array_agg(s.rating_count ORDER BY s.sampled_at DESC)
+              FILTER (WHERE s.sampled_at <= b.t_old))[1]             AS c_old
+      FROM place_rating_samples s
+     CROSS JOIN bounds b
+     GROUP BY s.place_id
+  ),
+  velocity AS (
+    SELECT s.place_id,
+           (s.c_now - s.c_mid)::FLOAT8 / p_window_days AS v_recent,
+           CASE WHEN s.c_old IS NOT NULL
+                THEN (s.c_mid - s.c_old)::FLOAT8 / p_baseline_days
+                ELSE (s.c_mid - s.c_first)::FLOAT8
+                     / greatest(extract(EPOCH FROM b.t_mid - s.first_at) / 86400, 1)
+           END AS v_baseline,
+           COALESCE(s.r_now - s.r_mid, 0)::FLOAT8 AS rating_delta
+      FROM series s
+     CROSS JOIN bounds b
+     WHERE s.c_mid IS NOT NULL
+  )
+  SELECT v.place_id,
+         round((
+           (v.v_recent - v.v_baseline) / sqrt(greatest(v.v_baseline, 0) + 1)
+           + 2 * v.rating_delta
+         )::NUMERIC, 4)::FLOAT8
+    FROM velocity v;
+$$;
+
+-- Rows whose stored trend_score differs from the computed one (archived
+-- rows and rows without enough history want NULL).
+CREATE OR REPLACE FUNCTION place_trend_changes(p_window_days INTEGER, p_baseline_days INTEGER)
+RETURNS TABLE (place_id UUID, score DOUBLE PRECISION)
+LANGUAGE sql STABLE
+AS $$
+  SELECT p.id, v.score
+    FROM places p
+    LEFT JOIN place_trend_scores(p_window_days, p_baseline_days) t ON t.place_id = p.id
+   CROSS JOIN LATERAL (
+     SELECT CASE WHEN p.archived_at IS NULL THEN t.trend_score END AS score
+   ) v
+   WHERE p.trend_score IS DISTINCT FROM v.score;
+$$;
+
+-- Writes every changed score in one UPDATE. Returns one row per outcome:
+-- 'scored' (new or changed score) / 'cleared' (set to NULL).
+CREATE OR REPLACE FUNCTION compute_trends(
+  p_window_days    INTEGER DEFAULT 14,
+  p_baseline_days  INTEGER DEFAULT 28,
+  p_dry_run        BOOLEAN DEFAULT false
+)
+RETURNS TABLE (outcome TEXT, place_count BIGINT)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF p_window_days < 1 OR p_baseline_days < 1 THEN
+    RAISE EXCEPTION 'window and baseline must be at least one day';
+  END IF;
+
+  IF p_dry_run THEN
+    RETURN QUERY
+      SELECT CASE WHEN c.score IS NULL THEN 'cleared' ELSE 'scored' END, count(*)
+        FROM place_trend_changes(p_window_days, p_baseline_days) c
+       GROUP BY 1 ORDER BY 1;
+    RETURN;
+  END IF;
+
+  RETURN QUERY
+    WITH written AS (
+      UPDATE places p
+         SET trend_score = c.score
+        FROM place_trend_changes(p_window_days, p_baseline_days) c
+       WHERE p.id = c.place_id
+      RETURNING c.score
+    )
+    SELECT CASE WHEN w.score IS NULL THEN 'cleared' ELSE 'scored' END, count(*)
+      FROM written w
+     GROUP BY 1 ORDER BY 1;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION record_rating_samples(BIGINT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION compute_trends(INTEGER, INTEGER, BOOLEAN) FROM PUBLIC, anon, authenticated;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
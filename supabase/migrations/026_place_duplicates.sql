@@ -0,0 +1,240 @@
+-- ============================================================================
+-- 026_place_duplicates.sql
+-- Bulk merge of duplicate listings found by scripts/dedupe_places.py.
+--   places.duplicate_of   the row a merged duplicate was folded into
+--   archive_reason        gains 'duplicate'
+--   merge_duplicate_places(pairs)
+--                         moves reviews, reactions, polls and views to the
+--                         kept row, hands it a google_place_id if it has
+--                         none, recomputes its aggregates and archives the
+--                         duplicates — all in one transaction.
+-- Duplicates are archived, not deleted: clearing archived_at, archive_reason
+-- and duplicate_of restores one (moved user content stays on the kept row).
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+ALTER TABLE places
+  ADD COLUMN IF NOT EXISTS duplicate_of  UUID REFERENCES places(id) ON DELETE SET NULL;
+
+ALTER TABLE places DROP CONSTRAINT IF EXISTS places_archive_reason_check;
+ALTER TABLE places ADD CONSTRAINT places_archive_reason_check
+  CHECK (archive_reason IN ('closed_permanently', 'not_seen', 'duplicate'));
+
+CREATE INDEX IF NOT EXISTS idx_places_duplicate_of
+  ON places(duplicate_of) WHERE duplicate_of IS NOT NULL;
+
+-- ─── Sweep leaves merged duplicates alone ───────────────────────────────────
+-- Same as 022, plus `duplicate_of IS NULL`: otherwise the sweep would see
+-- archive_reason 'duplicate' differ from its verdict and restore the row.
+
+CREATE OR REPLACE FUNCTION place_sweep_changes(p_missed_runs INTEGER, p_action TEXT)
+RETURNS TABLE (place_id UUID, reason TEXT)
+LANGUAGE sql STABLE
+AS $$
+  WITH missed AS (
+    SELECT p.id, count(*) AS runs
+      FROM places p
+      JOIN seed_runs r
+        ON r.data_source = p.data_source
+       AND r.full_sweep
+       AND r.finished_at IS NOT NULL
+       AND r.id > COALESCE(p.last_seen_run, 0)
+       -- equirectangular distance is plenty at a few km
+       AND 111320 * sqrt(
+             power(p.lat - r.center_lat, 2) +
+             power((p.lng - r.center_lng) * cos(radians(r.center_lat)), 2)
+           ) <= r.radius_m
+     GROUP BY p.id
+  ),
+  verdict AS (
+    SELECT p.id, p.archived_at, p.archive_reason,
+           CASE
+             WHEN p.business_status = 'CLOSED_PERMANENTLY' THEN 'closed_permanently'
+             WHEN m.runs >= p_missed_runs                  THEN 'not_seen'
+           END AS reason
+      FROM places p
+      LEFT JOIN missed m ON m.id = p.id
+     WHERE NOT p.is_manual_override
+       AND NOT p.is_on_campus
+       AND p.duplicate_of IS NULL
+  )
+  SELECT v.id, v.reason
+    FROM verdict v
+   WHERE v.archive_reason IS DISTINCT FROM v.reason
+      OR (v.reason IS NOT NULL AND (v.archived_at IS NOT NULL) <> (p_action = 'archive'));
+$$;
+
+-- ─── Merge ──────────────────────────────────────────────────────────────────
+-- p_pairs: [{"keep_id": uuid, "drop_id": uuid}, ...]. User content whose
+-- unique key already exists on the kept row (the same user reviewed both)
+-- stays on the archived duplicate. Returns one row per outcome.
+
+CREATE OR REPLACE FUNCTION merge_duplicate_places(p_pairs JSONB)
+RETURNS TABLE (outcome TEXT, n BIGINT)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  n_ids        BIGINT := 0;
+  n_reviews    BIGINT;
+  n_reactions  BIGINT;
+  n_polls      BIGINT;
+  n_views      BIGINT;
+  n_merged     BIGINT;
+  m            RECORD;
+BEGIN
+  DROP TABLE IF EXISTS merge_pairs;
+  CREATE TEMP TABLE merge_pairs ON COMMIT DROP AS
+    SELECT DISTINCT d.keep_id, d.drop_id
+      FROM jsonb_to_recordset(p_pairs) AS d(keep_id UUID, drop_id UUID)
+      JOIN places k ON k.id = d.keep_id
+      JOIN places x ON x.id = d.drop_id
+     WHERE d.keep_id <> d.drop_id
+       AND x.duplicate_of IS NULL;
+
+  IF EXISTS (SELECT 1 FROM merge_pairs WHERE keep_id IN (SELECT drop_id FROM merge_pairs))
+     OR EXISTS (SELECT drop_id FROM merge_pairs GROUP BY drop_id HAVING count(*) > 1) THEN
+    RAISE EXCEPTION 'merge pairs must form clusters: a kept row is also dropped, or a row is dropped twice';
+  END IF;
+
+  -- google_place_id moves to a kept row that has none (nulled on the
+  -- duplicate first: the column is UNIQUE), so seeders update the survivor
+  FOR m IN
+    SELECT DISTINCT ON (p.keep_id) p.keep_id, p.drop_id, x.google_place_id
+      FROM merge_pairs p
+      JOIN places k ON k.id = p.keep_id AND k.google_place_id IS NULL
+      JOIN places x ON x.id = p.drop_id AND x.google_place_id IS NOT NULL
+     ORDER BY p.keep_id, x.rating_count DESC NULLS LAST
+  LOOP
+    UPDATE places SET google_place_id = NULL WHERE id = m.drop_id;
+    UPDATE places SET google_place_id = m.google_place_id WHERE id = m.keep_id;
+    n_ids := n_ids + 1;
+  END LOOP;
+
+  UPDATE reviews r
+     SET place_id = t.keep_id
+    FROM (
+      SELECT DISTINCT ON (p.keep_id, x.clerk_user_id) x.id, p.keep_id
+        FROM merge_pairs p
+        JOIN reviews x ON x.place_id = p.drop_id
+       WHERE NOT EXISTS (SELECT 1 FROM reviews y
+                          WHERE y.place_id = p.keep_id AND y.clerk_user_id = x.clerk_user_id)
+       ORDER BY p.keep_id, x.clerk_user_id, x.created_at DESC
+    ) t
+   WHERE r.id = t.id;
+  GET DIAGNOSTICS n_reviews = ROW_COUNT;
+
+  UPDATE user_reactions r
+     SET place_id = t.keep_id
+    FROM (
+      SELECT DISTINCT ON (p.keep_id, x.clerk_user_id, x.reaction) x.id, p.keep_id
+        FROM merge_pairs p
+        JOIN user_reactions x ON x.place_id = p.drop_id
+       WHERE NOT EXISTS (SELECT 1 FROM user_reactions y
+                          WHERE y.place_id = p.keep_id AND y.clerk_user_id = x.clerk_user_id
+                            AND y.reaction = x.reaction)
+       ORDER BY p.keep_id, x.clerk_user_id, x.reaction, x.created_at DESC
+    ) t
+   WHERE r.id = t.id;
+  GET DIAGNOSTICS n_reactions = ROW_COUNT;
+
+  UPDATE sentiment_polls r
+     SET place_id = t.keep_id
+    FROM (
+      SELECT DISTINCT ON (p.keep_id, x.clerk_user_id) x.id, p.keep_id
+        FROM merge_pairs p
+        JOIN sentiment_polls x ON x.place_id = p.drop_id
+       WHERE NOT EXISTS (SELECT 1 FROM sentiment_polls y
+                          WHERE y.place_id = p.keep_id AND y.clerk_user_id = x.clerk_user_id)
+       ORDER BY p.keep_id, x.clerk_user_id, x.created_at DESC
+    ) t
+   WHERE r.id = t.id;
+  GET DIAGNOSTICS n_polls = ROW_COUNT;
+
+  INSERT INTO place_views (place_id, view_count, last_viewed_at)
+  SELECT p.keep_id, sum(v.view_count), max(v.last_viewed_at)
+    FROM merge_pairs p
+    JOIN place_views v ON v.place_id = p.drop_id
+   GROUP BY p.keep_id
+  ON CONFLICT (place_id) DO UPDATE
+     SET view_count = place_views.view_count + EXCLUDED.view_count,
+         last_viewed_at = greatest(place_views.last_viewed_at, EXCLUDED.last_viewed_at);
+  DELETE FROM place_views v USING merge_pairs p WHERE v.place_id = p.drop_id;
+  GET DIAGNOSTICS n_views = ROW_COUNT;
+
+  -- Aggregates as the API routes compute them, for both sides of each pair
+  UPDATE places pl
+     SET review_count = a.review_count,
+         avg_review = a.avg_review,
+         like_count = a.like_count,
+         dislike_count = a.dislike_count,
+         bookmark_count = a.bookmark_count,
+         sentiment_love = a.love,
+         sentiment_like = a.liked,
+         sentiment_neutral = a.neutral,
+         sentiment_dislike = a.disliked,
+         sentiment_terrible = a.terrible
+    FROM (
+      SELECT ids.id,
+             rv.cnt AS review_count, rv.avg AS avg_review,
+             rx.likes AS like_count, rx.dislikes AS dislike_count, rx.bookmarks AS bookmark_count,
+             sp.love, sp.liked, sp.neutral, sp.disliked, sp.terrible
+        FROM (SELECT keep_id AS id FROM merge_pairs UNION SELECT drop_id FROM merge_pairs) ids
+       CROSS JOIN LATERAL (
+         SELECT count(*) AS cnt, COALESCE(round(avg(rating), 1), 0) AS avg
+           FROM reviews WHERE place_id = ids.id AND status = 'active'
+       ) rv
+       CROSS JOIN LATERAL (
+         SELECT count(*) FILTER (WHERE reaction = 'like')     AS likes,
+                count(*) FILTER (WHERE reaction = 'dislike')  AS dislikes,
+                count(*) FILTER (WHERE reaction = 'bookmark') AS bookmarks
+           FROM user_reactions WHERE place_id = ids.id
+       ) rx
+       CROSS JOIN LATERAL (
+         SELECT count(*) FILTER (WHERE sentiment = 'love')     AS love,
+                count(*) FILTER (WHERE sentiment = 'like')     AS liked,
+                count(*) FILTER (WHERE sentiment = 'neutral')  AS neutral,
+                count(*) FILTER (WHERE sentiment = 'dislike')  AS disliked,
+                count(*) FILTER (WHERE sentiment = 'terrible') AS terrible
+           FROM sentiment_polls WHERE place_id = ids.id
+       ) sp
+    ) a
+   WHERE pl.id = a.id;
+
+  -- Contact details the kept row lacks come from a duplicate
+  UPDATE places k
+     SET phone = COALESCE(k.phone, x.phone),
+         website = COALESCE(k.website, x.website)
+    FROM (
+      SELECT p.keep_id,
+             (array_agg(d.phone)   FILTER (WHERE d.phone IS NOT NULL))[1]   AS phone,
+             (array_agg(d.website) FILTER (WHERE d.website IS NOT NULL))[1] AS website
+        FROM merge_pairs p
+        JOIN places d ON d.id = p.drop_id
+       GROUP BY p.keep_id
+    ) x
+   WHERE k.id = x.keep_id
+     AND ((k.phone IS NULL AND x.phone IS NOT NULL) OR (k.website IS NULL AND x.website IS NOT NULL));
+
+  UPDATE places d
+     SET duplicate_of = p.keep_id,
+         archive_reason = 'duplicate',
+         archived_at = COALESCE(d.archived_at, now())
+    FROM merge_pairs p
+   WHERE d.id = p.drop_id;
+  GET DIAGNOSTICS n_merged = ROW_COUNT;
+
+  RETURN QUERY VALUES
+    ('merged', n_merged),
+    ('place_ids_moved', n_ids),
+    ('reviews_moved', n_reviews),
+    ('reactions_moved', n_reactions),
+    ('polls_moved', n_polls),
+    ('views_merged', n_views);
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION merge_duplicate_places(JSONB) FROM PUBLIC, anon, authenticated;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
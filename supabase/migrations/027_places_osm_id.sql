@@ -0,0 +1,21 @@
+-- ============================================================================
+-- 027_places_osm_id.sql
+-- OpenStreetMap identity for places (scripts/seed_osm.py).
+--   places.osm_id   'node/123' / 'way/456' — set on Google rows an OSM feature
+--                   matched, and the conflict key for rows the extract added
+--                   (data_source 'osm_extract').
+-- OSM-only rows never appear in a Google seed run, so the sweep's missed-run
+-- rule (joined on data_source) leaves them alone.
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+ALTER TABLE places
+  ADD COLUMN IF NOT EXISTS osm_id  TEXT;
+
+-- Non-partial so PostgREST upserts can use it (on_conflict=osm_id);
+-- NULLs never conflict.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_places_osm_id ON places(osm_id);
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
@@ -0,0 +1,144 @@
+-- ============================================================================
+-- 028_place_rank.sql
+-- Precomputed popularity rank.
+--   places.rank_score     Bayesian-smoothed rating (plus an optional distance
+--                         term), recomputed for every place in one batch by
+--                         compute_ranks() (scripts/compute_ranks.py)
+--   places.category_rank  1-based position within the place's category
+-- GET /api/places sorts on rank_score by default, so a 5.0 with 3 reviews
+-- no longer outranks a 4.6 with 4,000 and top-N is an index scan.
+-- Both columns are derived: writing them does not bump updated_at.
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+ALTER TABLE places
+  ADD COLUMN IF NOT EXISTS rank_score     DOUBLE PRECISION,
+  ADD COLUMN IF NOT EXISTS category_rank  INTEGER;
+
+-- Ranked lists: live rows, optionally one category, best first
+CREATE INDEX IF NOT EXISTS idx_places_rank
+  ON places(category, rank_score DESC NULLS LAST) WHERE archived_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_places_rank_all
+  ON places(rank_score DESC NULLS LAST) WHERE archived_at IS NULL;
+
+-- ─── updated_at ignores derived columns ─────────────────────────────────────
+-- Same trigger as 025, with rank_score and category_rank added.
+
+CREATE OR REPLACE FUNCTION update_places_updated_at()
+RETURNS TRIGGER AS $$
+DECLARE
+  derived CONSTANT TEXT[] := ARRAY['trend_score', 'rank_score', 'category_rank', 'updated_at'];
+BEGIN
+  IF (to_jsonb(NEW) - derived) = (to_jsonb(OLD) - derived) THEN
+    NEW.updated_at = OLD.updated_at;
+  ELSE
+    NEW.updated_at = now();
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ─── Rank score ─────────────────────────────────────────────────────────────
+-- Per category, over live rows, with v = rating_count (0 when unrated) and
+-- R = rating:
+--   C           mean rating of the category's rated places
+--   m           p_prior_count, or the category's median rating_count
+--   bayes       (v·R + m·C) / (v + m)     — few reviews pull toward C
+--   rank_score  bayes − p_distance_weight · ln(1 + km from campus)
+-- An unrated place scores C (less the distance term). On-campus rows count
+-- as distance 0 (their pins may be unset).
+
+CREATE OR REPLACE FUNCTION place_rank_scores(p_prior_count DOUBLE PRECISION, p_distance_weight DOUBLE PRECISION)
+RETURNS TABLE (place_id UUID, rank_score DOUBLE PRECISION, category_rank INTEGER)
+LANGUAGE sql STABLE
+AS $$
+  WITH live AS (
+    SELECT p.id, p.category, p.rating::FLOAT8 AS r,
+           CASE WHEN p.rating IS NULL THEN 0 ELSE COALESCE(p.rating_count, 0) END::FLOAT8 AS v,
+           CASE WHEN p.is_on_campus OR p.lat IS NULL THEN 0
+                -- equirectangular distance from campus (seed_common.CAMPUS_LAT/LNG)
+                ELSE 111.32 * sqrt(
+                       power(p.lat - 12.9345, 2) +
+                       power((p.lng - 77.6069) * cos(radians(12.9345)), 2))
+           END AS km
+      FROM places p
+     WHERE p.archived_at IS NULL
+  ),
+  prior AS (
+    SELECT l.category,
+           COALESCE(avg(l.r) FILTER (WHERE l.v > 0), 0) AS c,
+           greatest(COALESCE(
+             p_prior_count,
+             percentile_cont(0.5) WITHIN GROUP (ORDER BY l.v) FILTER (WHERE l.v > 0)
+           ), 1) AS m
+      FROM live l
+     GROUP BY l.category
+  ),
+  scored AS (
+    SELECT l.id, l.category, l.v,
+           round((
+             (l.v * COALESCE(l.r, 0) + p.m * p.c) / (l.v + p.m)
+             - p_distance_weight * ln(1 + l.km)
+           )::NUMERIC, 4)::FLOAT8 AS score
+      FROM live l
+      JOIN prior p ON p.category = l.category
+  )
+  SELECT s.id, s.score,
+         row_number() OVER (PARTITION BY s.category ORDER BY s.score DESC, s.v DESC, s.id)::INTEGER
+    FROM scored s;
+$$;
+
+-- Rows whose stored rank differs from the computed one (archived rows want NULL)
+CREATE OR REPLACE FUNCTION place_rank_changes(p_prior_count DOUBLE PRECISION, p_distance_weight DOUBLE PRECISION)
+RETURNS TABLE (place_id UUID, score DOUBLE PRECISION, pos INTEGER)
+LANGUAGE sql STABLE
+AS $$
+  SELECT p.id, r.rank_score, r.category_rank
+    FROM places p
+    LEFT JOIN place_rank_scores(p_prior_count, p_distance_weight) r ON r.place_id = p.id
+   WHERE (p.rank_score, p.category_rank) IS DISTINCT FROM (r.rank_score, r.category_rank);
+$$;
+
+-- Writes every changed rank in one UPDATE. Returns one row per outcome:
+-- 'ranked' (new or changed score / position) / 'cleared' (set to NULL).
+CREATE OR REPLACE FUNCTION compute_ranks(
+  p_prior_count      DOUBLE PRECISION DEFAULT NULL,
+  p_distance_weight  DOUBLE PRECISION DEFAULT 0,
+  p_dry_run          BOOLEAN DEFAULT false
+)
+RETURNS TABLE (outcome TEXT, place_count BIGINT)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF p_prior_count IS NOT NULL AND p_prior_count <= 0 OR p_distance_weight < 0 THEN
+    RAISE EXCEPTION 'prior count must be positive and distance weight non-negative';
+  END IF;
+
+  IF p_dry_run THEN
+    RETURN QUERY
+      SELECT CASE WHEN c.score IS NULL THEN 'cleared' ELSE 'ranked' END, count(*)
+        FROM place_rank_changes(p_prior_count, p_distance_weight) c
+       GROUP BY 1 ORDER BY 1;
+    RETURN;
+  END IF;
+
+  RETURN QUERY
+    WITH written AS (
+      UPDATE places p
+         SET rank_score = c.score,
+             category_rank = c.pos
+        FROM place_rank_changes(p_prior_count, p_distance_weight) c
+       WHERE p.id = c.place_id
+      RETURNING c.score
+    )
+    SELECT CASE WHEN w.score IS NULL THEN 'cleared' ELSE 'ranked' END, count(*)
+      FROM written w
+     GROUP BY 1 ORDER BY 1;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION compute_ranks(DOUBLE PRECISION, DOUBLE PRECISION, BOOLEAN) FROM PUBLIC, anon, authenticated;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
@@ -0,0 +1,42 @@
+-- ============================================================================
+-- 029_place_facets.sql
+-- Precomputed filter-bar facets, written by scripts/build_facets.py.
+--   place_facets  one row per (category, anchor): counts per sub_type, type,
+--                 cuisine tag, veg / non-veg, price band and amenity, plus
+--                 rating and price histograms, as JSONB.
+--                 anchor 'all' covers the whole category; other anchors a
+--                 named circle (center + radius_m), e.g. 'campus'.
+-- `fingerprint` (row count + newest updated_at of the category, and the
+-- anchor definitions) lets the builder skip categories that have not changed.
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS place_facets (
+  category      TEXT              NOT NULL,
+  anchor        TEXT              NOT NULL,
+  center_lat    DOUBLE PRECISION,
+  center_lng    DOUBLE PRECISION,
+  radius_m      INTEGER,
+  place_count   INTEGER           NOT NULL DEFAULT 0,
+  facets        JSONB             NOT NULL DEFAULT '{}'::jsonb,
+  fingerprint   JSONB,
+  computed_at   TIMESTAMPTZ       NOT NULL DEFAULT now(),
+  PRIMARY KEY (category, anchor)
+);
+
+-- ── RLS: public read, service-role write (same as places) ───────────────────
+ALTER TABLE place_facets ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read place_facets" ON place_facets;
+CREATE POLICY "Public read place_facets" ON place_facets
+  FOR SELECT
+  USING (true);
+
+DROP POLICY IF EXISTS "Service role write place_facets" ON place_facets;
+CREATE POLICY "Service role write place_facets" ON place_facets
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
@@ -0,0 +1,40 @@
+-- ============================================================================
+-- 030_places_walk_minutes.sql
+-- Walking time from the nearest campus gate over the pedestrian network,
+-- written by scripts/compute_walk_times.py (one multi-source shortest-path
+-- search per run over a local OSM extract).
+--   places.walk_minutes   whole minutes; 0 on campus; NULL when the place
+--                         is not near the walkable network
+-- Unlike distance_from_campus (straight line), this accounts for roads that
+-- cannot be crossed and walls with no way through. walk_minutes is derived,
+-- so (like trend_score and rank_score) writing it leaves updated_at alone.
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+ALTER TABLE places
+  ADD COLUMN IF NOT EXISTS walk_minutes  SMALLINT CHECK (walk_minutes >= 0);
+
+-- "Nearest on foot" lists: live rows, optionally one category
+CREATE INDEX IF NOT EXISTS idx_places_walk
+  ON places(category, walk_minutes ASC NULLS LAST) WHERE archived_at IS NULL;
+
+-- ─── updated_at ignores derived columns ─────────────────────────────────────
+-- Same trigger as 028, with walk_minutes added.
+
+CREATE OR REPLACE FUNCTION update_places_updated_at()
+RETURNS TRIGGER AS $$
+DECLARE
+  derived CONSTANT TEXT[] := ARRAY['trend_score', 'rank_score', 'category_rank', 'walk_minutes', 'updated_at'];
+BEGIN
+  IF (to_jsonb(NEW) - derived) = (to_jsonb(OLD) - derived) THEN
+    NEW.updated_at = OLD.updated_at;
+  ELSE
+    NEW.updated_at = now();
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
@@ -0,0 +1,176 @@
+-- ============================================================================
+-- 031_place_changes.sql
+-- Change feed of places rows for precise cache invalidation.
+--   place_changes      one row per INSERT / UPDATE / DELETE of a place,
+--                      with the columns that changed, written by a trigger
+--                      (so every writer is covered: seeders, remap, sweep,
+--                      dedupe, admin). UPDATEs that only touch run or
+--                      refresh bookkeeping (last_seen_run,
+--                      last_fetched_at, updated_at, refresh_count,
+--                      change_count, content_hash) are not logged.
+--   place_change_summary(from, to)
+--                      the changes in a time window, one row per place
+--                      (op + union of changed columns) — what
+--                      scripts/change_feed.py writes as NDJSON.
+--   place_change_notifications
+--                      optional published batches (counts, ids,
+--                      categories) that caches poll to invalidate
+--                      /places, /places/:id and category bundles.
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS place_changes (
+  id               BIGSERIAL    PRIMARY KEY,
+  place_id         UUID         NOT NULL,    -- no FK: deletions are logged too
+  category         TEXT,
+  op               TEXT         NOT NULL
+                   CHECK (op IN ('inserted', 'updated', 'archived', 'restored', 'deleted')),
+  changed_columns  TEXT[],
+  changed_at       TIMESTAMPTZ  NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_place_changes_changed_at ON place_changes(changed_at);
+
+CREATE TABLE IF NOT EXISTS place_change_notifications (
+  id            BIGSERIAL    PRIMARY KEY,
+  run_id        BIGINT       REFERENCES seed_runs(id) ON DELETE SET NULL,
+  window_from   TIMESTAMPTZ  NOT NULL,
+  window_to     TIMESTAMPTZ  NOT NULL,
+  counts        JSONB        NOT NULL DEFAULT '{}'::jsonb,   -- op → places
+  place_ids     UUID[]       NOT NULL DEFAULT '{}',
+  categories    TEXT[]       NOT NULL DEFAULT '{}',
+  created_at    TIMESTAMPTZ  NOT NULL DEFAULT now()
+);
+
+-- ── RLS: public read, service-role write (same as places) ───────────────────
+ALTER TABLE place_changes ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read place_changes" ON place_changes;
+CREATE POLICY "Public read place_changes" ON place_changes
+  FOR SELECT
+  USING (true);
+
+DROP POLICY IF EXISTS "Service role write place_changes" ON place_changes;
+CREATE POLICY "Service role write place_changes" ON place_changes
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+ALTER TABLE place_change_notifications ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read place_change_notifications" ON place_change_notifications;
+CREATE POLICY "Public read place_change_notifications" ON place_change_notifications
+  FOR SELECT
+  USING (true);
+
+DROP POLICY IF EXISTS "Service role write place_change_notifications" ON place_change_notifications;
+CREATE POLICY "Service role write place_change_notifications" ON place_change_notifications
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- ─── Trigger ────────────────────────────────────────────────────────────────
+
+CREATE OR REPLACE FUNCTION log_place_change()
+RETURNS TRIGGER AS $$
+DECLARE
+  bookkeeping CONSTANT TEXT[] := ARRAY['updated_at', 'last_seen_run', 'last_fetched_at',
+                                       'refresh_count', 'change_count', 'content_hash'];
+  old_row     JSONB;
+  cols        TEXT[];
+  change      TEXT;
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO place_changes (place_id, category, op) VALUES (NEW.id, NEW.category, 'inserted');
+    RETURN NEW;
+  ELSIF TG_OP = 'DELETE' THEN
+    INSERT INTO place_changes (place_id, category, op) VALUES (OLD.id, OLD.category, 'deleted');
+    RETURN OLD;
+  END IF;
+
+  old_row := to_jsonb(OLD);
+  SELECT array_agg(n.key ORDER BY n.key)
+    INTO cols
+    FROM jsonb_each(to_jsonb(NEW)) n
+   WHERE n.value IS DISTINCT FROM old_row -> n.key
+     AND n.key <> ALL (bookkeeping);
+  IF cols IS NULL THEN
+    RETURN NEW;
+  END IF;
+
+  change := CASE
+    WHEN OLD.archived_at IS NULL AND NEW.archived_at IS NOT NULL THEN 'archived'
+    WHEN OLD.archived_at IS NOT NULL AND NEW.archived_at IS NULL THEN 'restored'
+    ELSE 'updated'
+  END;
+  INSERT INTO place_changes (place_id, category, op, changed_columns)
+  VALUES (NEW.id, NEW.category, change, cols);
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_places_change_log ON places;
+CREATE TRIGGER trg_places_change_log
+  AFTER INSERT OR UPDATE OR DELETE ON places
+  FOR EACH ROW
+  EXECUTE FUNCTION log_place_change();
+
+-- ─── Summary ────────────────────────────────────────────────────────────────
+-- Changes with changed_at in [p_from, p_to), one row per place. The op
+-- reported is the one that matters to a cache:
+--   deleted > inserted > the latest of archived / restored > updated
+-- and changed_columns is the union over the window (NULL for inserts and
+-- deletes). `category` lists the old and new category when it moved.
+
+CREATE OR REPLACE FUNCTION place_change_summary(p_from TIMESTAMPTZ, p_to TIMESTAMPTZ DEFAULT now())
+RETURNS TABLE (
+  place_id         UUID,
+  op               TEXT,
+  categories       TEXT[],
+  changed_columns  TEXT[],
+  last_changed_at  TIMESTAMPTZ
+)
+LANGUAGE sql STABLE
+AS $$
+  WITH w AS (
+    SELECT c.* FROM place_changes c
+     WHERE c.changed_at >= p_from AND c.changed_at < p_to
+  ),
+  cols AS (
+    SELECT w.place_id, array_agg(DISTINCT col ORDER BY col) AS cols
+      FROM w CROSS JOIN LATERAL unnest(w.changed_columns) AS col
+     GROUP BY w.place_id
+  )
+  SELECT w.place_id,
+         CASE
+           WHEN bool_or(w.op = 'deleted')  THEN 'deleted'
+           WHEN bool_or(w.op = 'inserted') THEN 'inserted'
+           ELSE COALESCE(
+             (array_agg(w.op ORDER BY w.id DESC) FILTER (WHERE w.op IN ('archived', 'restored')))[1],
+             'updated')
+         END,
+         array_agg(DISTINCT w.category) FILTER (WHERE w.category IS NOT NULL),
+         CASE WHEN bool_or(w.op IN ('inserted', 'deleted')) THEN NULL ELSE k.cols END,
+         max(w.changed_at)
+    FROM w
+    LEFT JOIN cols k ON k.place_id = w.place_id
+   GROUP BY w.place_id, k.cols;
+$$;
+
+-- ─── Retention ──────────────────────────────────────────────────────────────
+
+CREATE OR REPLACE FUNCTION prune_place_changes(p_keep_days INTEGER DEFAULT 30)
+RETURNS BIGINT
+LANGUAGE sql
+AS $$
+  WITH gone AS (
+    DELETE FROM place_changes
+     WHERE changed_at < now() - make_interval(days => p_keep_days)
+    RETURNING 1
+  )
+  SELECT count(*) FROM gone;
+$$;
+
+REVOKE EXECUTE ON FUNCTION prune_place_changes(INTEGER) FROM PUBLIC, anon, authenticated;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
@@ -0,0 +1,36 @@
+-- ============================================================================
+-- 032_updated_at_ignores_bookkeeping.sql
+-- Every seeder run rewrites last_fetched_at and last_seen_run on each place
+-- it sees, and every ID refresh (refresh_scheduler.py, refresh_existing.py)
+-- writes refresh_count / change_count / content_hash even when nothing
+-- changed, so updated_at moved for unchanged places and invalidated every
+-- fingerprint and watermark keyed on it (export_snapshots.py,
+-- build_facets.py, build_nearby.py). Like the bookkeeping columns that
+-- log_place_change() (031) ignores, these no longer bump updated_at.
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+-- ─── updated_at ignores derived and bookkeeping columns ────────────────────
+-- Same trigger as 030, with the run and refresh bookkeeping columns added.
+
+CREATE OR REPLACE FUNCTION update_places_updated_at()
+RETURNS TRIGGER AS $$
+DECLARE
+  ignored CONSTANT TEXT[] := ARRAY[
+    'trend_score', 'rank_score', 'category_rank', 'walk_minutes',   -- derived
+    'updated_at', 'last_fetched_at', 'last_seen_run',               -- bookkeeping
+    'refresh_count', 'change_count', 'content_hash'
+  ];
+BEGIN
+  IF (to_jsonb(NEW) - ignored) = (to_jsonb(OLD) - ignored) THEN
+    NEW.updated_at = OLD.updated_at;
+  ELSE
+    NEW.updated_at = now();
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
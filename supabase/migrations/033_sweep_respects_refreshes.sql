@@ -0,0 +1,56 @@
+-- ============================================================================
+-- 033_sweep_respects_refreshes.sql
+-- A place only counted as seen when a (top-20 per type) seeder run stamped
+-- its last_seen_run, so one that dropped out of the top 20 was archived as
+-- 'not_seen' even while refresh_existing.py / refresh_scheduler.py /
+-- prewarm_details.py kept confirming it by ID (last_fetched_at). A missed
+-- run now only counts if it started after the row was last fetched; rows
+-- confirmed by ID are archived on business_status alone.
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+-- ─── Sweep ──────────────────────────────────────────────────────────────────
+-- Same as 026, plus `r.started_at > last_fetched_at` on missed runs.
+
+CREATE OR REPLACE FUNCTION place_sweep_changes(p_missed_runs INTEGER, p_action TEXT)
+RETURNS TABLE (place_id UUID, reason TEXT)
+LANGUAGE sql STABLE
+AS $$
+  WITH missed AS (
+    SELECT p.id, count(*) AS runs
+      FROM places p
+      JOIN seed_runs r
+        ON r.data_source = p.data_source
+       AND r.full_sweep
+       AND r.finished_at IS NOT NULL
+       AND r.id > COALESCE(p.last_seen_run, 0)
+       -- fetched by ID since the run started: alive, whatever its rank
+       AND r.started_at > COALESCE(p.last_fetched_at, '-infinity'::timestamptz)
+       -- equirectangular distance is plenty at a few km
+       AND 111320 * sqrt(
+             power(p.lat - r.center_lat, 2) +
+             power((p.lng - r.center_lng) * cos(radians(r.center_lat)), 2)
+           ) <= r.radius_m
+     GROUP BY p.id
+  ),
+  verdict AS (
+    SELECT p.id, p.archived_at, p.archive_reason,
+           CASE
+             WHEN p.business_status = 'CLOSED_PERMANENTLY' THEN 'closed_permanently'
+             WHEN m.runs >= p_missed_runs                  THEN 'not_seen'
+           END AS reason
+      FROM places p
+      LEFT JOIN missed m ON m.id = p.id
+     WHERE NOT p.is_manual_override
+       AND NOT p.is_on_campus
+       AND p.duplicate_of IS NULL
+  )
+  SELECT v.id, v.reason
+    FROM verdict v
+   WHERE v.archive_reason IS DISTINCT FROM v.reason
+      OR (v.reason IS NOT NULL AND (v.archived_at IS NOT NULL) <> (p_action = 'archive'));
+$$;
+
+-- ============================================================================
+-- DONE
+-- ============================================================================
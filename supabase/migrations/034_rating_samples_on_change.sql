@@ -0,0 +1,50 @@
+-- ============================================================================
+-- 034_rating_samples_on_change.sql
+-- place_rating_samples were only written when a seed run finished, for the
+-- places it stamped. Ratings moved by the ID refreshers
+-- (refresh_scheduler.py, prewarm_details.py, --refresh-existing), which
+-- open no seed run, were never sampled, so trend_score missed most of the
+-- changes between sweeps. A trigger now samples every write that changes
+-- rating or rating_count, whoever makes it. record_rating_samples()
+-- (finish_run) stays, for places without a sample of their current values.
+-- Idempotent (safe to re-run).
+-- ============================================================================
+
+-- ─── Trigger ────────────────────────────────────────────────────────────────
+-- run_id is the run whose write this is (it stamped last_seen_run), else NULL.
+-- Several writes in one transaction share sampled_at: the last one wins.
+
+CREATE OR REPLACE FUNCTION sample_place_rating()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF NEW.rating_count IS NULL THEN
+    RETURN NEW;
+  END IF;
+  IF TG_OP = 'UPDATE'
+     AND (NEW.rating, NEW.rating_count) IS NOT DISTINCT FROM (OLD.rating, OLD.rating_count) THEN
+    RETURN NEW;
+  END IF;
+
+  INSERT INTO place_rating_samples (place_id, run_id, rating, rating_count)
+  VALUES (
+    NEW.id,
+    CASE WHEN TG_OP = 'INSERT' OR NEW.last_seen_run IS DISTINCT FROM OLD.last_seen_run
+         THEN NEW.last_seen_run END,
+    NEW.rating,
+    NEW.rating_count
+  )
+  ON CONFLICT (place_id, sampled_at) DO UPDATE
+    SET run_id = EXCLUDED.run_id, rating = EXCLUDED.rating, rating_count = EXCLUDED.rating_count;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_places_rating_sample ON places;
+CREATE TRIGGER trg_places_rating_sample
+  AFTER INSERT OR UPDATE OF rating, rating_count ON places
+  FOR EACH ROW
+  EXECUTE FUNCTION sample_place_rating();
+
+-- ============================================================================
+-- DONE
+-- ============================================================================